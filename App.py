@@ -4,8 +4,8 @@ from pathlib import Path
 from tkinter import Tk, filedialog
 
 import streamlit as st
-from natsort import natsorted
 
+from chunk_manifest import ChunkManifest
 from logger import logger
 from models.workflow import AssetConfig, ServiceConfig, StepConfig, WorkflowConfig
 from orchestrator import Orchestrator
@@ -103,9 +103,14 @@ with st.container(border=True):
 
             if target_dir:
                 st.session_state.target_dir = target_dir
-            if chunk_paths:
-                chunk_names = [Path(p).name for p in chunk_paths if Path(p).name]
-                st.session_state.files = natsorted(chunk_names)
+            # 切片清单按切分顺序列出文件及识别文本，无需扫描目录或解析文件名
+            manifest = ChunkManifest.for_path(split_info["manifest"]) if split_info.get("manifest") else None
+            if manifest is not None:
+                st.session_state.files = manifest.names()
+                st.session_state.file_texts = {entry.file: entry.text or "" for entry in manifest.entries}
+            elif chunk_paths:
+                st.session_state.files = [Path(p).name for p in chunk_paths if Path(p).name]
+                st.session_state.file_texts = {}
             else:
                 st.session_state.files = []
             if transcripts:
@@ -122,9 +127,11 @@ with st.container(border=True):
         st.session_state.files = []
 
     if st.session_state.files:
+        file_texts = st.session_state.get("file_texts", {})
         start_file_name = st.selectbox(
             "选择起始播放的文件",
             options=st.session_state.files,
+            format_func=lambda name: f"{name}  {file_texts.get(name, '')}".strip(),
             key="file_idx",
         )
         st.session_state.start_file_name = start_file_name
@@ -2,11 +2,12 @@
 import streamlit as st
 import os
 import re
+import threading
 import requests
 from urllib.parse import urlparse
 from pathlib import Path
 from ocr_model import SmartDocumentOCR, ArticleProcessor
-from speaker_model import speak_text
+from speaker_model import speak_text, voice_pool
 from ai_tools import deepseek_revise
 from tkinter import Tk, filedialog
 
@@ -56,13 +57,23 @@ def text_2_audio(text_path, voice_type):
         text=revised_text,
         language = "简体中文", role_id = voice_type,
         save_file=audio_path,
-        play_audio_flag=True
+        play_audio_flag=True,
+        stream=True,  # 边合成边播放，第一段合成完即可听到
     )
     return audio_path, revised_text
 
 
+@st.cache_resource
+def warm_up_voices():
+    # 后台预加载全部音色，切换“标准女声/标准男声”时无需重新加载模型
+    worker = threading.Thread(target=voice_pool.warm_up, name="voice-warmup", daemon=True)
+    worker.start()
+    return worker
+
+
 # 应用主界面
 st.title("智能图文转换工具")
+warm_up_voices()
 
 with st.container(border=True):
     # 语音合成模块
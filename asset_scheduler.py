@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+from typing import Any, Callable, Dict, Generic, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class AssetScheduler(Generic[T]):
+    """
+    Priority queue of assets for loop playback.
+
+    Items are ordered by ``priority(item)`` (smallest first) and then by their
+    original position, so ties keep the config order. ``push`` re-inserts an item
+    with a freshly computed key in O(log n); superseded heap entries are skipped
+    lazily on ``pop``, so re-prioritising never rescans the library.
+    """
+
+    def __init__(
+        self,
+        items: Iterable[T],
+        priority: Callable[[T], Tuple[Any, ...]],
+        *,
+        key: Callable[[T], Hashable] = lambda item: getattr(item, "id"),
+    ) -> None:
+        self._priority = priority
+        self._key = key
+        self._heap: List[Tuple[Tuple[Any, ...], int, int, Hashable]] = []
+        self._items: Dict[Hashable, T] = {}
+        self._position: Dict[Hashable, int] = {}
+        self._version: Dict[Hashable, int] = {}
+        self._counter = itertools.count()
+        for position, item in enumerate(items):
+            self._position.setdefault(self._key(item), position)
+            self.push(item)
+
+    def __len__(self) -> int:
+        return len(self._version)
+
+    def __bool__(self) -> bool:
+        return bool(self._version)
+
+    def __contains__(self, item: T) -> bool:
+        return self._key(item) in self._version
+
+    def push(self, item: T) -> None:
+        """Insert ``item`` (or update its priority if already queued)."""
+        item_key = self._key(item)
+        position = self._position.setdefault(item_key, len(self._position))
+        version = next(self._counter)
+        self._items[item_key] = item
+        self._version[item_key] = version
+        heapq.heappush(self._heap, (tuple(self._priority(item)), position, version, item_key))
+
+    def pop(self) -> Optional[T]:
+        """Remove and return the item with the smallest priority, or None if empty."""
+        while self._heap:
+            _, _, version, item_key = heapq.heappop(self._heap)
+            if self._version.get(item_key) != version:
+                continue
+            del self._version[item_key]
+            return self._items.pop(item_key)
+        return None
+
+
+__all__ = ["AssetScheduler"]
@@ -1,9 +1,6 @@
-import librosa
 import numpy as np
 import soundfile as sf
-from scipy.io import wavfile
 import sys
-import sounddevice as sd
 from logger import logger
 from retrying import retry
 
@@ -14,6 +11,7 @@ def format_folder_name(folder_name):
         replace(":", "").replace(">", "").replace("|", "").replace("\"", "")
     return folder_name
 def resample_audio(audio_path, sr=16000):
+    import librosa
     y, sr = librosa.load(audio_path, sr=sr)
     sf.write(audio_path, y, sr)
 
@@ -34,6 +32,10 @@ def play_audio(audio_file, fs_multi=1.0, gain=1.5, gain_db=None):
     gain (float, 可选): 增益倍数，默认1.0。
     gain_db (float, 可选): 增益 dB 值，默认None。
     """
+    # librosa / scipy / sounddevice 较重，只在真正处理音频时导入
+    import sounddevice as sd
+    from scipy.io import wavfile
+
     try:
         sps, audio = wavfile.read(audio_file)
         if np.issubdtype(audio.dtype, np.integer):
@@ -53,6 +55,7 @@ def play_audio(audio_file, fs_multi=1.0, gain=1.5, gain_db=None):
 
 @retry(stop_max_attempt_number=3, wait_fixed=1000)
 def write_audio(audio_file, audio):
+    from scipy.io import wavfile
     wavfile.write(audio_file, audio[0], audio[1])
 
 
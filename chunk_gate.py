@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from silence_split import FULL_SCALE
+
+FRAME_MS = 10
+# 能量/过零率门限；改动会改变切片的分流结果，gate_signature 把它们带进转写缓存的键
+SILENCE_DBFS = -60.0
+RANGE_DB = 35.0
+MAX_ZCR = 0.3
+
+
+@dataclass
+class GateDecision:
+    """
+    Pre-Whisper verdict for one chunk.
+
+    ``route`` is ``"drop"`` (no speech, skip Whisper), ``"short"`` (cheap
+    batched decode) or ``"full"`` (regular ``transcribe``).
+    """
+
+    route: str
+    reason: str
+    duration_ms: int
+    speech_ms: int
+    rms_dbfs: Optional[float]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def frame_levels(samples: np.ndarray, sample_rate: int, frame_ms: int = FRAME_MS) -> tuple[np.ndarray, np.ndarray]:
+    """Per-frame level in dBFS and zero-crossing rate (crossings per sample)."""
+    frame_len = max(1, sample_rate * frame_ms // 1000)
+    n_frames = samples.shape[0] // frame_len
+    if n_frames == 0:
+        return np.empty(0), np.empty(0)
+    frames = samples[: n_frames * frame_len].astype(np.float64).reshape(n_frames, frame_len)
+    rms = np.sqrt(np.mean(np.square(frames), axis=1))
+    with np.errstate(divide="ignore"):
+        levels = 20 * np.log10(rms / FULL_SCALE)
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / float(frame_len)
+    return levels, zcr
+
+
+def energy_speech_frames(
+    samples: np.ndarray,
+    sample_rate: int,
+    *,
+    silence_dbfs: float = SILENCE_DBFS,
+    range_db: float = RANGE_DB,
+    max_zcr: float = MAX_ZCR,
+) -> np.ndarray:
+    """
+    Mark 10 ms frames that look like voiced speech.
+
+    A frame counts when it is within ``range_db`` of the loudest frame, above
+    ``silence_dbfs`` and has a low zero-crossing rate. Splitter chunks are
+    loudness-normalised, so absolute level alone cannot tell noise from speech;
+    broadband hiss and clicks cross zero far more often than voiced sounds.
+    """
+    levels, zcr = frame_levels(samples, sample_rate)
+    if levels.size == 0:
+        return np.zeros(0, dtype=bool)
+    floor = max(silence_dbfs, float(np.max(levels)) - range_db)
+    return (levels > floor) & (zcr <= max_zcr)
+
+
+def webrtc_speech_frames(samples: np.ndarray, sample_rate: int, aggressiveness: int = 2) -> np.ndarray:
+    """Speech flags from ``webrtcvad`` (optional dependency), one per 10 ms frame."""
+    import webrtcvad
+
+    if sample_rate not in (8000, 16000, 32000, 48000):
+        raise ValueError(f"webrtcvad does not support {sample_rate} Hz audio")
+    vad = webrtcvad.Vad(aggressiveness)
+    frame_len = sample_rate * FRAME_MS // 1000
+    pcm = samples.astype(np.int16)
+    n_frames = pcm.shape[0] // frame_len
+    return np.array(
+        [vad.is_speech(pcm[i * frame_len : (i + 1) * frame_len].tobytes(), sample_rate) for i in range(n_frames)],
+        dtype=bool,
+    )
+
+
+def classify(
+    samples: np.ndarray,
+    sample_rate: int,
+    *,
+    vad: str = "energy",
+    min_speech_ms: int = 60,
+    short_ms: int = 1000,
+    silence_dbfs: float = SILENCE_DBFS,
+) -> GateDecision:
+    """Decide whether a chunk needs Whisper at all, and which decode path."""
+    duration_ms = int(samples.shape[0] * 1000 // sample_rate) if sample_rate else 0
+    if samples.size:
+        rms = float(np.sqrt(np.mean(np.square(samples, dtype=np.float64))))
+    else:
+        rms = 0.0
+    rms_dbfs = round(20 * float(np.log10(rms / FULL_SCALE)), 1) if rms > 0 else None
+    if rms_dbfs is None or rms_dbfs < silence_dbfs:
+        return GateDecision("drop", "silent", duration_ms, 0, rms_dbfs)
+
+    if vad == "webrtc":
+        flags = webrtc_speech_frames(samples, sample_rate)
+    else:
+        flags = energy_speech_frames(samples, sample_rate, silence_dbfs=silence_dbfs)
+    speech_ms = int(np.count_nonzero(flags)) * FRAME_MS
+    if speech_ms < min_speech_ms:
+        return GateDecision("drop", "no speech", duration_ms, speech_ms, rms_dbfs)
+    if duration_ms <= short_ms:
+        return GateDecision("short", "short chunk", duration_ms, speech_ms, rms_dbfs)
+    return GateDecision("full", "speech", duration_ms, speech_ms, rms_dbfs)
+
+
+def gate_signature(vad: str, min_speech_ms: int, short_ms: int, silence_dbfs: float = SILENCE_DBFS) -> str:
+    """Every setting that decides a chunk's route, for keying transcripts produced by the gate."""
+    return f"{vad}|{int(min_speech_ms)}|{int(short_ms)}|{float(silence_dbfs)}|{RANGE_DB}|{MAX_ZCR}"
+
+
+def classify_file(path: Path | str, **options: Any) -> GateDecision:
+    import soundfile as sf
+
+    samples, sample_rate = sf.read(str(path), dtype="int16", always_2d=True)
+    mono = samples.mean(axis=1) if samples.shape[1] > 1 else samples[:, 0]
+    return classify(mono, sample_rate, **options)
+
+
+__all__ = [
+    "GateDecision",
+    "classify",
+    "classify_file",
+    "energy_speech_frames",
+    "frame_levels",
+    "gate_signature",
+    "webrtc_speech_frames",
+]
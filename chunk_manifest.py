@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from logger import logger
+
+# 旧版本的切片文件名：切分时为 chunk0003.wav，识别后被重命名为 0003_识别文本.wav
+_CHUNK_NAME = re.compile(r"^chunk(\d+)\.wav$", re.IGNORECASE)
+_LABELED_NAME = re.compile(r"^(\d{4})_.+\.wav$", re.IGNORECASE)
+
+
+def chunk_name(index: int) -> str:
+    return f"chunk{index:04d}.wav"
+
+
+def canonical_chunk_name(name: str) -> str:
+    """
+    Map a legacy ``0003_text.wav`` name to ``chunk0003.wav``, the same rename
+    ``ChunkManifest.migrate`` records as an alias; other names are returned as is.
+    Lets old checkpoints resolve before a (streamed) split has written its manifest.
+    """
+    name = Path(name).name
+    match = _LABELED_NAME.match(name)
+    return chunk_name(int(match.group(1))) if match else name
+
+
+@dataclass
+class ChunkEntry:
+    """One chunk of a split asset; ``file`` is relative to the manifest directory."""
+
+    index: int
+    file: str
+    start_ms: Optional[int] = None
+    end_ms: Optional[int] = None
+    duration_ms: Optional[int] = None
+    sha1: Optional[str] = None  # 与 TranscriptCache.audio_digest 相同的 PCM 摘要
+    text: Optional[str] = None
+    gate: Optional[Dict[str, Any]] = None
+    aliases: List[str] = field(default_factory=list)  # 迁移前的文件名，用于匹配旧的断点记录
+
+
+class ChunkManifest:
+    """
+    Per-asset index of split chunks, stored as ``chunks.json`` next to them.
+
+    The splitter writes it once with offsets, durations and PCM hashes; STT
+    fills in the texts in a single rewrite. Chunk files keep their
+    ``chunk{idx:04d}.wav`` names, so reuse detection, resume and the file
+    picker read this index instead of globbing or parsing filenames.
+    """
+
+    FILE_NAME = "chunks.json"
+    VERSION = 1
+
+    def __init__(self, directory: Path | str, entries: Optional[Iterable[ChunkEntry]] = None, **meta: Any) -> None:
+        self.directory = Path(directory)
+        self.entries: List[ChunkEntry] = list(entries or [])
+        self.meta: Dict[str, Any] = dict(meta)
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self.directory / self.FILE_NAME
+
+    # ---------------------------------------------------------------- loading
+    @classmethod
+    def load(cls, directory: Path | str) -> Optional["ChunkManifest"]:
+        path = Path(directory) / cls.FILE_NAME
+        if not path.exists():
+            return None
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable chunk manifest %s: %s", path, exc)
+            return None
+        if raw.get("version") != cls.VERSION:
+            return None
+        entries = [ChunkEntry(**entry) for entry in raw.get("chunks") or []]
+        return cls(directory, entries, **(raw.get("meta") or {}))
+
+    @classmethod
+    def for_path(cls, manifest_path: Path | str) -> Optional["ChunkManifest"]:
+        return cls.load(Path(manifest_path).parent)
+
+    @classmethod
+    def migrate(cls, directory: Path | str) -> Optional["ChunkManifest"]:
+        """
+        Build a manifest for a chunk directory written before manifests existed.
+
+        Renamed ``0003_text.wav`` files get their ``chunk0003.wav`` name back
+        (the old name is kept as an alias); texts are left empty so STT fills
+        them in, normally straight from the transcript cache.
+        """
+        directory = Path(directory)
+        found: Dict[int, ChunkEntry] = {}
+        for path in sorted(directory.glob("*.wav")):
+            match = _CHUNK_NAME.match(path.name) or _LABELED_NAME.match(path.name)
+            if not match:
+                continue
+            index = int(match.group(1))
+            entry = found.setdefault(index, ChunkEntry(index=index, file=chunk_name(index)))
+            if path.name == entry.file:
+                continue
+            target = directory / entry.file
+            if not target.exists():
+                try:
+                    os.replace(path, target)
+                except OSError as exc:  # pragma: no cover
+                    logger.warning("Failed to restore chunk name %s -> %s: %s", path, target, exc)
+                    continue
+            entry.aliases.append(path.name)
+        if not found:
+            return None
+        manifest = cls(directory, [found[index] for index in sorted(found)], migrated=True)
+        manifest.entries = [entry for entry in manifest.entries if (directory / entry.file).exists()]
+        manifest.save()
+        logger.info("Migrated %d legacy chunks in %s to %s", len(manifest.entries), directory, cls.FILE_NAME)
+        return manifest
+
+    # ----------------------------------------------------------------- access
+    def paths(self) -> List[str]:
+        return [str(self.directory / entry.file) for entry in self.entries]
+
+    def names(self) -> List[str]:
+        return [entry.file for entry in self.entries]
+
+    def complete(self) -> bool:
+        """True when every listed chunk file is still on disk."""
+        return bool(self.entries) and all((self.directory / entry.file).exists() for entry in self.entries)
+
+    def entry(self, name: str) -> Optional[ChunkEntry]:
+        """Look up a chunk by file name or by a pre-migration alias."""
+        name = Path(name).name
+        for entry in self.entries:
+            if entry.file == name or name in entry.aliases:
+                return entry
+        return None
+
+    def ranges(self) -> Optional[List[List[int]]]:
+        if not self.entries or any(entry.start_ms is None or entry.end_ms is None for entry in self.entries):
+            return None
+        return [[int(entry.start_ms), int(entry.end_ms)] for entry in self.entries]
+
+    def digests(self) -> Dict[str, str]:
+        return {str(self.directory / entry.file): entry.sha1 for entry in self.entries if entry.sha1}
+
+    def transcripts(self) -> Optional[List[Dict[str, Any]]]:
+        """Transcript items for every chunk, or None if any chunk is untranscribed."""
+        if not self.entries or any(entry.text is None for entry in self.entries):
+            return None
+        items: List[Dict[str, Any]] = []
+        for entry in self.entries:
+            item: Dict[str, Any] = {"file": str(self.directory / entry.file), "text": entry.text}
+            if entry.gate is not None:
+                item["gate"] = entry.gate
+            items.append(item)
+        return items
+
+    def set_transcripts(self, transcripts: Iterable[Dict[str, Any]]) -> None:
+        with self._lock:
+            for item in transcripts:
+                entry = self.entry(str(item.get("file", "")))
+                if entry is None:
+                    continue
+                entry.text = item.get("text", "")
+                if item.get("gate") is not None:
+                    entry.gate = item["gate"]
+
+    def save(self) -> None:
+        """Atomically replace ``chunks.json``."""
+        with self._lock:
+            payload = {
+                "version": self.VERSION,
+                "meta": self.meta,
+                "chunks": [asdict(entry) for entry in self.entries],
+            }
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=1), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+
+
+__all__ = ["ChunkEntry", "ChunkManifest", "canonical_chunk_name", "chunk_name"]
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import pickle
+import threading
+from pathlib import Path
+from stat import S_IWGRP, S_IWOTH
+from typing import Any, Dict, List, Optional, Tuple
+
+from logger import logger
+from models.taskmeta import TaskMeta
+from models.workflow import AssetConfig, ServiceConfig, StepConfig, WorkflowConfig
+
+CACHE_VERSION = 2
+# ProgressStore 回写到素材上的字段：不参与缓存键，配置兼作进度文件时每次写进度不会使缓存失效
+PROGRESS_FIELDS = (
+    "completed",
+    "status",
+    "create_time",
+    "update_time",
+    "play_count",
+    "progress_played",
+    "progress_total",
+    "last_item",
+)
+_PROGRESS_TYPES = {"completed": bool, "play_count": int, "progress_played": int, "progress_total": int}
+
+
+def _default_cache_dir() -> Path:
+    # 缓存会被 pickle 反序列化，必须放在当前用户私有的目录（而非共享的临时目录）；可用 WORKFLOW_CACHE_DIR 覆盖
+    override = os.environ.get("WORKFLOW_CACHE_DIR")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "workflow_config_cache"
+
+
+DEFAULT_CACHE_DIR = _default_cache_dir()
+
+# 进程内缓存：resolved path -> 与磁盘上相同的条目（mtime_ns、size、digest、payload、progress、header）
+_memory: Dict[Path, Dict[str, Any]] = {}
+_memory_lock = threading.Lock()
+_schema: Optional[str] = None
+
+
+def load_workflow_config(
+    path: Path | str,
+    *,
+    cache_dir: Path | str | None = None,
+    use_cache: bool = True,
+) -> WorkflowConfig:
+    """
+    Load and validate a workflow config, reusing a pickled copy when unchanged.
+
+    The cache key is a SHA-1 of the config without the per-asset progress
+    fields (``PROGRESS_FIELDS``), so a config that doubles as its progress
+    file still hits after every flush; the file's current progress values are
+    laid over the cached copy without validation. When the file's ``mtime_ns``
+    and size match the entry, it is not even read. Either way pydantic
+    validation (and ``AssetConfig.apply_lang_defaults`` for every asset) is
+    skipped. Each call returns an independent copy.
+    """
+    if not use_cache:
+        return _validate(Path(path).read_bytes())
+    return load_workflow_document(path, cache_dir=cache_dir)[0]
+
+
+def load_workflow_document(
+    path: Path | str,
+    *,
+    cache_dir: Path | str | None = None,
+) -> Tuple[WorkflowConfig, Dict[str, Any]]:
+    """
+    Cached ``load_workflow_config`` that also returns the file's raw top-level
+    fields other than ``assets``, so ProgressStore can rewrite the file
+    without parsing it a second time.
+    """
+    resolved = Path(path).resolve()
+    stat = resolved.stat()
+    with _memory_lock:
+        entry = _memory.get(resolved)
+    if not _matches(entry, stat):
+        cache_file = Path(cache_dir or DEFAULT_CACHE_DIR) / (hashlib.sha1(str(resolved).encode("utf-8")).hexdigest() + ".pkl")
+        entry = _read_entry(cache_file)
+        if not _matches(entry, stat):
+            entry = _build_entry(resolved, stat, entry)
+            _write_entry(cache_file, entry)
+        with _memory_lock:
+            _memory[resolved] = entry
+    return _restore(entry["payload"], entry["progress"]), copy.deepcopy(entry["header"])
+
+
+def clear_memory_cache() -> None:
+    with _memory_lock:
+        _memory.clear()
+
+
+def _validate(raw: bytes) -> WorkflowConfig:
+    text = raw.decode("utf-8")
+    if hasattr(WorkflowConfig, "model_validate_json"):
+        return WorkflowConfig.model_validate_json(text)  # type: ignore[attr-defined]
+    return WorkflowConfig.parse_raw(text)
+
+
+def _validate_data(data: Any) -> WorkflowConfig:
+    if hasattr(WorkflowConfig, "model_validate"):
+        return WorkflowConfig.model_validate(data)  # type: ignore[attr-defined]
+    return WorkflowConfig.parse_obj(data)
+
+
+def _split_progress(data: Any) -> Tuple[Any, List[Dict[str, Any]]]:
+    """Split raw config data into its structural part and each asset's progress fields."""
+    if not isinstance(data, dict) or not isinstance(data.get("assets"), list):
+        return data, []
+    structural = dict(data)
+    structural["assets"] = []
+    progress: List[Dict[str, Any]] = []
+    for item in data["assets"]:
+        if isinstance(item, dict):
+            structural["assets"].append(
+                {key: value for key, value in item.items() if key not in PROGRESS_FIELDS and key != "progress"}
+            )
+            values = {key: item[key] for key in PROGRESS_FIELDS if key in item}
+            legacy = item.get("progress")
+            if isinstance(legacy, dict):
+                # 旧格式 {"progress": {"played": n, "total": m}}，与 TaskMeta.from_raw 的换算一致
+                values.setdefault("progress_played", legacy.get("played", 0) or 0)
+                values.setdefault("progress_total", legacy.get("total", 0) or 0)
+            progress.append(values)
+        else:
+            structural["assets"].append(item)
+            progress.append({})
+    return structural, progress
+
+
+def _well_typed(progress: List[Dict[str, Any]]) -> bool:
+    """True if every progress value already has the model's type, so it can be assigned unvalidated."""
+    for values in progress:
+        for key, value in values.items():
+            expected = _PROGRESS_TYPES.get(key, str)
+            if value is None and expected is str:
+                continue
+            if type(value) is not expected:
+                return False
+    return True
+
+
+def _progress_defaults() -> Dict[str, Any]:
+    fields = getattr(TaskMeta, "model_fields", None) or getattr(TaskMeta, "__fields__", {})
+    return {name: fields[name].default for name in PROGRESS_FIELDS}
+
+
+def _restore(payload: bytes, progress: Optional[List[Dict[str, Any]]]) -> WorkflowConfig:
+    config = pickle.loads(payload)
+    if progress is not None:
+        defaults = _progress_defaults()
+        for asset, values in zip(config.assets, progress):
+            asset._assign(**dict(defaults, **values))
+    return config
+
+
+def _schema_fingerprint() -> str:
+    """Field layout of the config models, so a model change invalidates old pickles."""
+    global _schema
+    if _schema is None:
+        parts = []
+        for model in (WorkflowConfig, ServiceConfig, StepConfig, AssetConfig, TaskMeta):
+            fields = getattr(model, "model_fields", None) or getattr(model, "__fields__", {})
+            parts.append(model.__name__ + ":" + ",".join(sorted(fields)))
+        _schema = "|".join(parts)
+    return _schema
+
+
+def _digest(raw: bytes) -> str:
+    digest = hashlib.sha1()
+    digest.update(f"{CACHE_VERSION}|{_schema_fingerprint()}|".encode("utf-8"))
+    digest.update(raw)
+    return digest.hexdigest()
+
+
+def _matches(entry: Optional[Dict[str, Any]], stat: os.stat_result) -> bool:
+    return bool(entry) and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size
+
+
+def _build_entry(resolved: Path, stat: os.stat_result, previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Parse the file and reuse ``previous``'s validated payload if only progress fields changed."""
+    data = json.loads(resolved.read_bytes().decode("utf-8"))
+    structural, progress = _split_progress(data)
+    digest = _digest(json.dumps(structural, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    if not _well_typed(progress):
+        # 手工改坏的进度值交给 pydantic 校验/转换，缓存里的副本即为最终结果
+        payload = pickle.dumps(_validate_data(data), protocol=pickle.HIGHEST_PROTOCOL)
+        progress = None
+    elif previous and previous["digest"] == digest:
+        payload = previous["payload"]
+    else:
+        payload = pickle.dumps(_validate_data(data), protocol=pickle.HIGHEST_PROTOCOL)
+    header = {key: value for key, value in data.items() if key != "assets"} if isinstance(data, dict) else {}
+    return {
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "digest": digest,
+        "payload": payload,
+        "progress": progress,
+        "header": header,
+    }
+
+
+def _is_private(path: Path) -> bool:
+    """True if ``path`` is owned by the current user and not writable by group or others."""
+    if not hasattr(os, "getuid"):  # Windows：缓存位于用户目录下，由其 ACL 保护
+        return True
+    try:
+        info = path.stat()
+    except OSError:
+        return False
+    return info.st_uid == os.getuid() and not info.st_mode & (S_IWGRP | S_IWOTH)
+
+
+def _read_entry(cache_file: Path) -> Optional[dict]:
+    if not cache_file.exists():
+        return None
+    if not (_is_private(cache_file.parent) and _is_private(cache_file)):
+        # 他人可写的缓存可能被替换成恶意 pickle，宁可重新校验
+        logger.warning("Ignoring config cache %s: not private to the current user", cache_file)
+        return None
+    try:
+        with cache_file.open("rb") as handle:
+            entry = pickle.load(handle)
+    except Exception as exc:  # pragma: no cover
+        logger.warning("Ignoring unreadable config cache %s: %s", cache_file, exc)
+        return None
+    if not isinstance(entry, dict) or entry.get("version") != CACHE_VERSION or entry.get("schema") != _schema_fingerprint():
+        return None
+    return entry
+
+
+def _write_entry(cache_file: Path, entry: dict) -> None:
+    entry = dict(entry, version=CACHE_VERSION, schema=_schema_fingerprint())
+    try:
+        cache_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if not _is_private(cache_file.parent):
+            logger.warning("Not writing config cache to %s: directory is not private to the current user", cache_file.parent)
+            return
+        tmp_path = cache_file.with_name(cache_file.name + f".{os.getpid()}.tmp")
+        with tmp_path.open("wb") as handle:
+            pickle.dump(entry, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_file)
+    except OSError as exc:  # pragma: no cover
+        logger.warning("Failed to write config cache %s: %s", cache_file, exc)
+
+
+__all__ = ["PROGRESS_FIELDS", "load_workflow_config", "load_workflow_document", "clear_memory_cache"]
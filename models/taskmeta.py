@@ -52,12 +52,24 @@ class TaskMeta(BaseModel):
 
     @classmethod
     def from_raw(cls, raw: dict[str, Any]) -> "TaskMeta":
+        return cls(**cls._normalize_raw(raw))
+
+    @classmethod
+    def from_trusted(cls, raw: dict[str, Any]) -> "TaskMeta":
+        """Build from data dumped by an already validated model, skipping validation."""
+        raw = cls._normalize_raw(raw)
+        if hasattr(cls, "model_construct"):
+            return cls.model_construct(**raw)  # type: ignore[attr-defined]
+        return cls.construct(**raw)  # type: ignore[attr-defined]
+
+    @staticmethod
+    def _normalize_raw(raw: dict[str, Any]) -> dict[str, Any]:
         raw = dict(raw)
         progress = raw.pop("progress", None)
         if progress:
             raw.setdefault("progress_played", int(progress.get("played", 0) or 0))
             raw.setdefault("progress_total", int(progress.get("total", 0) or 0))
-        return cls(**raw)
+        return raw
 
     @classmethod
     def many_from_assets(cls, assets: Iterable["TaskMeta"]) -> dict[str, "TaskMeta"]:
@@ -78,17 +90,32 @@ class TaskMeta(BaseModel):
         play_cfg.setdefault("skip_first", False)
 
     # ---------------------------------------------------------------- operations
+    # 以下方法在播放热路径上频繁调用，写入的值类型已确定，
+    # 通过 _assign 绕过 validate_assignment 的逐字段校验
+    def _assign(self, **values: Any) -> None:
+        self.__dict__.update(values)
+        fields_set = getattr(self, "__pydantic_fields_set__", None)
+        if fields_set is None:
+            fields_set = getattr(self, "__fields_set__", None)
+        if fields_set is not None:
+            fields_set.update(values)
+
     def ensure_created(self, timestamp: str) -> None:
         if not self.create_time:
-            self.create_time = timestamp
+            self._assign(create_time=timestamp)
 
-    def mark_started(self, timestamp: str) -> None:
+    def mark_started(self, timestamp: str, restart: bool = False) -> None:
         self.ensure_created(timestamp)
-        self.update_time = timestamp
-        self.status = "in_progress"
-        self.completed = False
-        self.progress_played = int(self.progress_played or 0)
-        self.progress_total = int(self.progress_total or 0)
+        if restart:
+            # 从头重新播放：清掉上一轮的位置，否则 progress_played 只增不减，之后的断点无法计算
+            self._assign(progress_played=0, last_item=None)
+        self._assign(
+            update_time=timestamp,
+            status="in_progress",
+            completed=False,
+            progress_played=int(self.progress_played or 0),
+            progress_total=int(self.progress_total or 0),
+        )
 
     def update_progress(
         self,
@@ -100,24 +127,21 @@ class TaskMeta(BaseModel):
     ) -> None:
         self.mark_started(timestamp)
         if last_item is not None:
-            self.last_item = last_item
+            self._assign(last_item=str(last_item))
         if total is not None:
-            self.progress_total = max(int(total), self.progress_total)
+            self._assign(progress_total=max(int(total), self.progress_total))
         if played is not None:
-            self.progress_played = max(int(played), self.progress_played)
+            self._assign(progress_played=max(int(played), self.progress_played))
 
     def mark_completed(self, timestamp: str) -> None:
         self.mark_started(timestamp)
         total = int(self.progress_total or 0)
         played = int(self.progress_played or 0)
         if total and played >= total:
-            self.play_count = int(self.play_count) + 1
-            self.completed = True
-            self.status = "completed"
+            self._assign(play_count=int(self.play_count) + 1, completed=True, status="completed")
         else:
-            self.completed = False
-            self.status = "in_progress"
-        self.update_time = timestamp
+            self._assign(completed=False, status="in_progress")
+        self._assign(update_time=timestamp)
 
     # ---------------------------------------------------------------- utilities
     def should_skip(self) -> bool:
@@ -129,12 +153,15 @@ class TaskMeta(BaseModel):
             setattr(self, field, getattr(other, field))
 
     def merge_structural(self, other: "TaskMeta") -> None:
+        # other 是已校验的模型，字段类型一致，无需逐字段校验
+        values = {}
         for field in self.STRUCT_FIELDS:
             value = getattr(other, field, None)
             if value is not None:
-                setattr(self, field, value)
+                values[field] = dict(value) if isinstance(value, dict) else value
         if other.create_time and not self.create_time:
-            self.create_time = other.create_time
+            values["create_time"] = other.create_time
         if other.update_time:
             # Keep the latest timestamp
-            self.update_time = other.update_time
+            values["update_time"] = other.update_time
+        self._assign(**values)
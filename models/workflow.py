@@ -25,6 +25,12 @@ class StepConfig(BaseModel):
     type: str
     service: str
     params: Dict[str, Any] = Field(default_factory=dict)
+    # 可选：声明读取/产出的 artifacts 键，用于构建步骤依赖图；都为空时按顺序执行
+    inputs: List[str] = Field(default_factory=list)
+    outputs: List[str] = Field(default_factory=list)
+
+    def declares_io(self) -> bool:
+        return bool(self.inputs or self.outputs)
 
     def merged_params(self, overrides: Mapping[str, Any] | None = None) -> Dict[str, Any]:
         """Merge step-level parameters with asset overrides."""
@@ -64,6 +70,13 @@ class WorkflowConfig(BaseModel):
     title: Optional[str] = None
     max_session_seconds: Optional[int] = None
     flag_loop_assets: bool = False  # 播放完一轮后是否自动循环
+    prepare_workers: int = 1  # >1 时多个素材的切分/识别并发预处理，播放仍逐个进行
+    step_workers: int = 4  # 步骤声明了 inputs/outputs 时，单个素材内可并行的步骤数
+    progress_journal: bool = False  # 进度以追加日志记录增量，定期压缩回 JSON，而非每次整体重写
+    progress_compact_every: int = 200  # 日志累计多少条记录后压缩一次
+    checkpoint_every_segments: int = 5  # 播放中每 N 个片段写一次断点
+    checkpoint_every_seconds: float = 30.0  # 或距上次写断点超过 T 秒
+    warm_up_services: bool = False  # Orchestrator 创建时在后台预热各服务（如提前加载 Whisper 模型），需要识别的配置再开启
     services: List[ServiceConfig] = Field(default_factory=list)
     steps: List[StepConfig] = Field(default_factory=list)
     assets: List[AssetConfig] = Field(default_factory=list)
@@ -1,50 +1,221 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, Iterator, Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Set
 import time
+from logger import logger
 from models.workflow import AssetConfig, StepConfig, WorkflowConfig
 from services.base import StepContext
 from services.registry import ServiceRegistry
+from step_graph import StepGraph
+
+# 不依赖播放设备、可以跨素材并发执行的预处理步骤类型
+PREPARE_STEP_TYPES = frozenset({"split", "transcribe"})
 
 
 class Orchestrator:
     """Execute workflow steps for each asset using the declared services."""
 
-    def __init__(self, workflow: WorkflowConfig, registry: Optional[ServiceRegistry] = None) -> None:
+    def __init__(
+        self,
+        workflow: WorkflowConfig,
+        registry: Optional[ServiceRegistry] = None,
+        *,
+        warm_up: Optional[bool] = None,
+    ) -> None:
         self.workflow = workflow
         self.session_limit = workflow.max_session_seconds or 30*60
         self.registry = registry or ServiceRegistry()
         self._services: Dict[str, Any] = {}
+        self._prepare_pool: Optional[ThreadPoolExecutor] = None
+        self._services_lock = threading.Lock()
+        self._warm_up_thread: Optional[threading.Thread] = None
+        if warm_up if warm_up is not None else getattr(workflow, "warm_up_services", False):
+            self.start_warm_up()
 
     def run_all(
         self,
         assets: Optional[Iterable[AssetConfig]] = None,
         *,
         extra_context: Optional[Dict[str, Any]] = None,
+        workers: int = 1,
     ) -> Iterator[Dict[str, Any]]:
+        """
+        Run every asset in order.
+
+        With ``workers > 1`` the preprocessing steps (split/transcribe) of all
+        assets are prefetched on a thread pool, while the remaining steps —
+        playback in particular — still run one asset at a time on the caller's
+        thread.
+        """
         t1 = time.time()
-        iterable = assets or self.workflow.assets
-        for asset in iterable:
-            t2 = time.time()
-            if t2 - t1 > self.session_limit*0.95:
-                raise TimeoutError(f"Asset {asset.id} stop after {t2 - t1} seconds")
-            yield self.run_asset(asset, extra_context=extra_context)
+        iterable = list(assets or self.workflow.assets)
+        prepared: Optional[PrefetchWindow] = None
+        if workers > 1:
+            prepared = self.prefetch(iterable, workers=workers, extra_context=extra_context)
+        try:
+            for asset in iterable:
+                t2 = time.time()
+                if t2 - t1 > self.session_limit*0.95:
+                    raise TimeoutError(f"Asset {asset.id} stop after {t2 - t1} seconds")
+                future = prepared.pop(asset.id) if prepared is not None else None
+                yield self.run_asset(asset, extra_context=extra_context, prepared=future)
+        finally:
+            if prepared is not None:
+                self.shutdown()
 
     def run_asset(
         self,
         asset: AssetConfig,
         *,
         extra_context: Optional[Dict[str, Any]] = None,
+        prepared: Optional[Future | Mapping[str, Any]] = None,
     ) -> Dict[str, Any]:
+        """
+        Run all steps for ``asset``.
+
+        ``prepared`` may carry the artifacts produced by ``prepare_asset`` (or a
+        future from ``prefetch``); the preprocessing steps are then skipped and
+        execution continues from those artifacts.
+
+        When steps declare ``inputs``/``outputs`` they are scheduled as a
+        dependency graph and independent steps run in parallel (up to
+        ``workflow.step_workers``); otherwise steps run in list order.
+        """
         artifacts: Dict[str, Any] = {}
         step_results: list[Dict[str, Any]] = []
         extras = dict[str, Any](extra_context or {})
-        for step in self.workflow.steps:
-            result = self._run_step(step, asset, artifacts, extras)
-            step_results.append({"id": step.id, "result": result})
+        steps: List[StepConfig] = list(self.workflow.steps)
+        if prepared is not None:
+            if isinstance(prepared, Future):
+                prepared = prepared.result()
+            artifacts.update(prepared)
+            steps = steps[len(self.prepare_steps()):]
+        graph = StepGraph(steps)
+        step_workers = int(getattr(self.workflow, "step_workers", 1) or 1)
+        if graph.declared and step_workers > 1:
+            step_results = self._run_graph(graph, asset, artifacts, extras, workers=step_workers)
+        else:
+            for step in steps:
+                result = self._run_step(step, asset, artifacts, extras)
+                step_results.append({"id": step.id, "result": result})
         return {"asset": asset, "artifacts": artifacts}
 
+    # ------------------------------------------------------------ preprocessing
+    def prepare_steps(self) -> List[StepConfig]:
+        """Leading steps of the workflow that can run ahead of playback."""
+        steps: List[StepConfig] = []
+        for step in self.workflow.steps:
+            if step.type not in PREPARE_STEP_TYPES:
+                break
+            steps.append(step)
+        return steps
+
+    def prepare_asset(
+        self,
+        asset: AssetConfig,
+        *,
+        extra_context: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Run only the preprocessing steps for ``asset`` and return its artifacts."""
+        artifacts: Dict[str, Any] = {}
+        extras = dict[str, Any](extra_context or {})
+        for step in self.prepare_steps():
+            self._run_step(step, asset, artifacts, extras)
+        return artifacts
+
+    def prefetch(
+        self,
+        assets: Iterable[AssetConfig],
+        *,
+        workers: int,
+        extra_context: Optional[Dict[str, Any]] = None,
+        lookahead: Optional[int] = None,
+    ) -> "PrefetchWindow":
+        """
+        Prepare upcoming assets on a shared thread pool, a few at a time.
+
+        Only ``lookahead`` (default ``workers``) assets are in flight beyond the
+        one being played: ``pop(asset_id)`` on the returned window hands over the
+        future holding that asset's artifacts — pass it to
+        ``run_asset(prepared=...)`` — and submits the next asset in line.
+        """
+        if self._prepare_pool is None:
+            self._prepare_pool = ThreadPoolExecutor(
+                max_workers=max(1, int(workers)), thread_name_prefix="asset-prepare"
+            )
+        return PrefetchWindow(
+            self,
+            assets if self.prepare_steps() else [],
+            lookahead=max(1, int(lookahead or workers)),
+            extra_context=extra_context,
+        )
+
+    def _submit_prepare(self, asset: AssetConfig, extra_context: Optional[Dict[str, Any]]) -> Future:
+        return self._prepare_pool.submit(self.prepare_asset, asset, extra_context=extra_context)
+
+    def shutdown(self) -> None:
+        """Cancel pending preprocessing work and release the pool."""
+        if self._prepare_pool is not None:
+            self._prepare_pool.shutdown(wait=True, cancel_futures=True)
+            self._prepare_pool = None
+
+    # ------------------------------------------------------------------ warm-up
+    def start_warm_up(self) -> threading.Thread:
+        """
+        Call ``warm_up()`` on every service used by a step, on a daemon thread.
+
+        Services opt in by implementing ``warm_up`` (e.g. the STT service loads
+        its Whisper model), so the first asset does not stall on model loading.
+        Failures are logged and never abort the run.
+        """
+        if self._warm_up_thread is None:
+            self._warm_up_thread = threading.Thread(target=self._warm_up_services, name="service-warm-up", daemon=True)
+            self._warm_up_thread.start()
+        return self._warm_up_thread
+
+    def _warm_up_services(self) -> None:
+        names = list(dict.fromkeys(step.service for step in self.workflow.steps))
+        for name in names:
+            try:
+                service = self._get_service(name)
+                warm_up = getattr(service, "warm_up", None)
+                if callable(warm_up):
+                    t1 = time.time()
+                    warm_up()
+                    logger.info("Warmed up service %s in %.2fs", name, time.time() - t1)
+            except Exception as exc:  # pragma: no cover
+                logger.warning("Warm-up of service %s failed: %s", name, exc)
+
     # --------------------------------------------------------------------- utils
+    def _run_graph(
+        self,
+        graph: StepGraph,
+        asset: AssetConfig,
+        artifacts: Dict[str, Any],
+        extras: Dict[str, Any],
+        *,
+        workers: int,
+    ) -> list[Dict[str, Any]]:
+        """Run steps as soon as their declared inputs have been produced."""
+        results: Dict[str, Any] = {}
+        done: Set[str] = set()
+        started: Set[str] = set()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="step") as pool:
+            running: Dict[Future, str] = {}
+            while len(done) < len(graph.steps):
+                for step in graph.ready(done, started):
+                    started.add(step.id)
+                    running[pool.submit(self._run_step, step, asset, artifacts, extras)] = step.id
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    step_id = running.pop(future)
+                    results[step_id] = future.result()
+                    done.add(step_id)
+        return [{"id": step.id, "result": results[step.id]} for step in graph.steps]
+
     def _run_step(
         self,
         step: StepConfig,
@@ -74,9 +245,51 @@ class Orchestrator:
         return service.run(context)
 
     def _get_service(self, name: str) -> Any:
-        if name not in self._services:
-            service_config = self.workflow.service_map().get(name)
-            if not service_config:
-                raise KeyError(f"Service '{name}' not found in workflow configuration.")
-            self._services[name] = self.registry.get(service_config)
-        return self._services[name]
+        with self._services_lock:
+            if name not in self._services:
+                service_config = self.workflow.service_map().get(name)
+                if not service_config:
+                    raise KeyError(f"Service '{name}' not found in workflow configuration.")
+                self._services[name] = self.registry.get(service_config)
+            return self._services[name]
+
+
+class PrefetchWindow:
+    """
+    Futures for the assets ``Orchestrator.prefetch`` is preparing ahead of playback.
+
+    Assets are submitted in the given order, keeping at most ``lookahead`` of
+    them queued or running; each ``pop`` tops the window up again. An asset
+    popped before it was submitted (e.g. loop mode picked it out of order) is
+    dropped from the queue and prepared inline by ``run_asset``.
+    """
+
+    def __init__(
+        self,
+        orchestrator: Orchestrator,
+        assets: Iterable[AssetConfig],
+        *,
+        lookahead: int,
+        extra_context: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self._orchestrator = orchestrator
+        self._lookahead = lookahead
+        self._extra_context = extra_context
+        self._pending: "OrderedDict[str, AssetConfig]" = OrderedDict((asset.id, asset) for asset in assets)
+        self._futures: Dict[str, Future] = {}
+        self._fill()
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+    def pop(self, asset_id: str) -> Optional[Future]:
+        """Hand over the future for ``asset_id`` (None if it was never submitted) and submit the next asset."""
+        future = self._futures.pop(asset_id, None)
+        self._pending.pop(asset_id, None)
+        self._fill()
+        return future
+
+    def _fill(self) -> None:
+        while self._pending and len(self._futures) < self._lookahead:
+            _, asset = self._pending.popitem(last=False)
+            self._futures[asset.id] = self._orchestrator._submit_prepare(asset, self._extra_context)
@@ -1,16 +1,28 @@
 from __future__ import annotations
 
 import json
+import os
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Iterable, Optional
+from typing import Dict, Iterable, Optional, Set, Tuple
 
+from logger import logger
+
+from config_cache import load_workflow_document
 from models.taskmeta import TaskMeta
 from models.workflow import AssetConfig, WorkflowConfig
 
 
 class ProgressStore:
-    """Persist and restore playback progress for workflow assets."""
+    """Persist and restore playback progress for workflow assets.
+
+    By default every ``flush`` atomically rewrites the whole JSON file. In
+    journal mode a flush only appends the changed asset records to
+    ``<path>.journal``; the journal is replayed on load and folded back into
+    the JSON file by ``compact`` every ``compact_every`` entries.
+    """
+
+    JOURNAL_SUFFIX = ".journal"
 
     def __init__(
         self,
@@ -18,20 +30,31 @@ class ProgressStore:
         *,
         workflow_id: str,
         assets: Optional[Iterable[AssetConfig]] = None,
+        journal: bool = False,
+        compact_every: int = 200,
+        autoload: bool = True,
     ) -> None:
         """Initialise the store, loading existing data and optionally attaching assets.
         path: The path to the progress file.
         workflow_id: The ID of the workflow.
         assets: Optional iterable of assets to attach.
+        journal: Append per-asset deltas instead of rewriting the file on flush.
+        compact_every: Journal entries after which the journal is compacted.
+        autoload: Read ``path`` now (``from_config_path`` passes its already loaded config).
         """
         self.path = Path(path)
+        self.journal_path = self.path.with_name(self.path.name + self.JOURNAL_SUFFIX)
         self.workflow_id = workflow_id
+        self.journal = journal
+        self.compact_every = max(1, int(compact_every))
         self._data: Dict[str, object] = {}
         self._records: Dict[str, TaskMeta] = {}
         self._record_ids: list[str] = []
         self._dirty: bool = False
+        self._dirty_ids: Set[str] = set()
+        self._journal_entries: int = 0
 
-        if self.path.exists():
+        if autoload and self.path.exists():
             self._load()
 
         self._data.setdefault("id", workflow_id)
@@ -46,41 +69,42 @@ class ProgressStore:
         config_path: Path | str,
         *,
         workflow_id: str | None = None,
+        journal: bool = False,
+        compact_every: int = 200,
     ) -> "ProgressStore":
         """Construct a store from a workflow config file, eager-loading its assets."""
         path = Path(config_path)
-        raw = path.read_text(encoding="utf-8")
-        if hasattr(WorkflowConfig, "model_validate_json"):
-            config = WorkflowConfig.model_validate_json(raw)  # type: ignore[attr-defined]
-        else:
-            config = WorkflowConfig.parse_raw(raw)
-        store = cls(path, workflow_id=workflow_id or config.id, assets=config.assets)
-        if hasattr(config, "model_dump"):
-            store._data = config.model_dump(mode="python")  # type: ignore[attr-defined]
-        else:
-            store._data = config.dict()
-        store._sync_records_from_data()
+        config, header = load_workflow_document(path)
+        store = cls(
+            path,
+            workflow_id=workflow_id or config.id,
+            journal=journal,
+            compact_every=compact_every,
+            autoload=False,
+        )
+        store._load((config, header))
         return store
 
     # ---------------------------------------------------------------- operations
     def attach_assets(self, assets: Iterable[AssetConfig]) -> None:
         """Merge the provided assets into the tracked record set."""
         for asset in assets:
-            record = TaskMeta.from_raw(asset.to_dict())
-            record.apply_lang_defaults()
-            existing = self._records.get(record.id)
+            existing = self._records.get(asset.id)
             if existing:
-                existing.merge_structural(record)
-            else:
-                self._records[record.id] = record
-                self._record_ids.append(record.id)
-                self._dirty = True
+                existing.merge_structural(asset)
+                continue
+            # AssetConfig 已经过校验，直接构造记录
+            record = TaskMeta.from_trusted(asset.to_dict())
+            record.apply_lang_defaults()
+            self._records[record.id] = record
+            self._record_ids.append(record.id)
+            self._touch(record.id)
 
-    def mark_started(self, asset: AssetConfig) -> None:
-        """Mark an asset as started and ensure a record exists."""
+    def mark_started(self, asset: AssetConfig, *, restart: bool = False) -> None:
+        """Mark an asset as started and ensure a record exists; ``restart`` resets the playback position."""
         record = self._ensure_record(asset)
-        record.mark_started(self._now())
-        self._dirty = True
+        record.mark_started(self._now(), restart=restart)
+        self._touch(asset.id)
 
     def update_checkpoint(
         self,
@@ -98,13 +122,13 @@ class ProgressStore:
             played=progress_played,
             total=progress_total,
         )
-        self._dirty = True
+        self._touch(asset.id)
 
     def mark_completed(self, asset: AssetConfig) -> None:
         """Mark the asset as fully processed/played."""
         record = self._ensure_record(asset)
         record.mark_completed(self._now())
-        self._dirty = True
+        self._touch(asset.id)
 
     def is_completed(self, asset_id: str) -> bool:
         """Return True if the stored record is marked completed."""
@@ -119,7 +143,15 @@ class ProgressStore:
         """Write in-memory records back to the backing JSON file if dirty."""
         if not self._dirty and self.path.exists():
             return
+        if self.journal and self.path.exists():
+            self._append_journal()
+            if self._journal_entries >= self.compact_every:
+                self.compact()
+            return
+        self.compact()
 
+    def compact(self) -> None:
+        """Atomically rewrite the full JSON file and drop the folded-in journal."""
         self.path.parent.mkdir(parents=True, exist_ok=True)
         data = dict(self._data)
         assets = []
@@ -132,30 +164,99 @@ class ProgressStore:
                 assets.append(record.to_dict())
         data["assets"] = assets
 
-        self.path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        # 先写临时文件再 rename，写到一半崩溃也不会截断兼作进度文件的配置
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            handle.write(json.dumps(data, ensure_ascii=False, indent=2))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, self.path)
+        if self.journal_path.exists():
+            self.journal_path.unlink()
+        self._journal_entries = 0
+        self._dirty_ids.clear()
         self._dirty = False
 
+    def close(self) -> None:
+        """Persist pending changes and fold any journal back into the JSON file."""
+        if self._dirty or self.journal_path.exists():
+            self.compact()
+
     # ---------------------------------------------------------------- utilities
+    def _touch(self, asset_id: str) -> None:
+        self._dirty_ids.add(asset_id)
+        self._dirty = True
+
+    def _append_journal(self) -> None:
+        """Append the current state of every changed record as one JSON line each."""
+        lines = []
+        for asset_id in self._record_ids:
+            if asset_id in self._dirty_ids and asset_id in self._records:
+                lines.append(json.dumps({"id": asset_id, "record": self._records[asset_id].to_dict()}, ensure_ascii=False))
+        if lines:
+            with self.journal_path.open("a", encoding="utf-8") as handle:
+                handle.write("\n".join(lines) + "\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+            self._journal_entries += len(lines)
+        self._dirty_ids.clear()
+        self._dirty = False
+
+    def _replay_journal(self) -> None:
+        """Apply journaled record states on top of the loaded JSON data."""
+        if not self.journal_path.exists():
+            return
+        count = 0
+        for line in self.journal_path.read_text(encoding="utf-8").splitlines():
+            try:
+                entry = json.loads(line)
+                record = TaskMeta.from_raw(entry["record"])
+            except (ValueError, KeyError, TypeError):
+                # 崩溃时最后一行可能只写了一半，忽略即可
+                logger.warning("Skipping unreadable progress journal line in %s", self.journal_path)
+                continue
+            if record.id not in self._records:
+                self._record_ids.append(record.id)
+            self._records[record.id] = record
+            count += 1
+        self._journal_entries = count
+
     def _ensure_record(self, asset: AssetConfig) -> TaskMeta:
         """Fetch or create the TaskMeta record corresponding to an asset."""
+        # 每个片段的断点都会经过这里：已有记录直接返回，结构字段由 attach_assets 负责合并
         record = self._records.get(asset.id)
         if not record:
-            record = TaskMeta.from_raw(asset.to_dict())
+            record = TaskMeta.from_trusted(asset.to_dict())
             self._records[asset.id] = record
             self._record_ids.append(asset.id)
-        else:
-            record.merge_structural(TaskMeta.from_raw(asset.to_dict()))
         return record
 
     def _now(self) -> str:
         """Return the current UTC timestamp as an ISO string."""
         return datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
 
-    def _load(self) -> None:
-        """Load persisted data from disk into memory."""
-        raw = json.loads(self.path.read_text(encoding="utf-8"))
-        self._data = raw
-        self._sync_records_from_data()
+    def _load(self, document: Optional[Tuple[WorkflowConfig, Dict[str, object]]] = None) -> None:
+        """
+        Load persisted data from disk into memory.
+
+        Records come from the validated config cache when the file parses as a
+        workflow config, so an unchanged (or progress-only changed) file skips
+        per-asset validation; anything else is validated record by record.
+        """
+        if document is None:
+            try:
+                document = load_workflow_document(self.path)
+            except ValueError as exc:
+                logger.info("Progress file %s is not a workflow config (%s); validating records.", self.path, exc)
+        if document is not None:
+            config, self._data = document
+            # 缓存每次返回独立副本，素材对象可直接作为记录；写回时 assets 由记录重新生成
+            self._records = {asset.id: asset for asset in config.assets}
+            self._record_ids = list(self._records)
+        else:
+            self._data = json.loads(self.path.read_text(encoding="utf-8"))
+            self._sync_records_from_data()
+        self._replay_journal()
 
     def _sync_records_from_data(self) -> None:
         """Rebuild the in-memory TaskMeta map from the serialized data."""
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# 仅在对应服务真正运行时才应被导入的重量级依赖
+HEAVY_MODULES = (
+    "torch",
+    "whisper",
+    "VITStuning",
+    "gradio",
+    "librosa",
+    "scipy",
+    "sounddevice",
+    "ollama",
+)
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - t0
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy": heavy, "modules": len(sys.modules)}}))
+"""
+
+
+def measure(modules: List[str], runs: int) -> Dict[str, object]:
+    """Import ``modules`` in ``runs`` fresh interpreters and summarise the cold-start cost."""
+    code = PROBE.format(modules=list(modules), heavy=list(HEAVY_MODULES))
+    samples: List[float] = []
+    wall: List[float] = []
+    last: Dict[str, object] = {}
+    for _ in range(max(1, runs)):
+        started = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+        wall.append(time.perf_counter() - started)
+        if proc.returncode != 0:
+            raise SystemExit(f"Import failed:\n{proc.stderr.strip()}")
+        last = json.loads(proc.stdout.strip().splitlines()[-1])
+        samples.append(float(last["seconds"]))
+    return {
+        "modules": modules,
+        "import_median_s": statistics.median(samples),
+        "process_median_s": statistics.median(wall),
+        "heavy_loaded": last.get("heavy", []),
+        "sys_modules": last.get("modules"),
+    }
+
+
+def top_imports(modules: List[str], limit: int) -> List[Tuple[int, str]]:
+    """Return the slowest imports (cumulative microseconds) reported by ``-X importtime``."""
+    code = "; ".join(f"import {name}" for name in modules)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, capture_output=True, text=True)
+    rows: List[Tuple[int, str]] = []
+    for line in proc.stderr.splitlines():
+        # 格式：import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:"):
+            continue
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        rows.append((int(parts[1]), parts[2].strip()))
+    rows.sort(reverse=True)
+    return rows[:limit]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure cold import time of the workflow runner and default services.")
+    parser.add_argument(
+        "--module",
+        action="append",
+        dest="modules",
+        help="Module to import (repeatable). Defaults to workflow_runner and services.defaults.",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement.")
+    parser.add_argument("--top", type=int, default=10, help="Show the N slowest imports from -X importtime.")
+    parser.add_argument("--max-seconds", type=float, default=None, help="Exit non-zero if the median import exceeds this.")
+    parser.add_argument("--forbid-heavy", action="store_true", help="Exit non-zero if any heavy backend gets imported.")
+    args = parser.parse_args()
+
+    modules = args.modules or ["workflow_runner", "services.defaults"]
+    result = measure(modules, args.runs)
+    print(
+        f"import {', '.join(modules)}: median {result['import_median_s'] * 1000:.1f} ms "
+        f"(process {result['process_median_s'] * 1000:.1f} ms, {result['sys_modules']} modules, {args.runs} runs)"
+    )
+    heavy = result["heavy_loaded"]
+    print(f"heavy backends loaded: {', '.join(heavy) if heavy else 'none'}")
+    if args.top:
+        for cumulative, name in top_imports(modules, args.top):
+            print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    failed = False
+    if args.max_seconds is not None and result["import_median_s"] > args.max_seconds:
+        print(f"FAIL: median import {result['import_median_s']:.3f}s exceeds {args.max_seconds:.3f}s")
+        failed = True
+    if args.forbid_heavy and heavy:
+        print("FAIL: heavy backends imported at startup")
+        failed = True
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from speech2text_model import STT_BACKENDS, speech_to_text, whisper_pool
+
+
+def collect_chunks(directories: Sequence[str], limit: int) -> List[Path]:
+    """Chunk wavs in split-output order; ``limit`` caps the files taken per directory."""
+    files: List[Path] = []
+    for directory in directories:
+        found = sorted(Path(directory).glob("*.wav"))
+        files.extend(found[:limit] if limit > 0 else found)
+    return files
+
+
+def audio_seconds(path: Path) -> float:
+    import soundfile as sf
+
+    info = sf.info(str(path))
+    return info.frames / float(info.samplerate)
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level Levenshtein distance divided by the reference length."""
+    ref = reference.lower().split()
+    hyp = hypothesis.lower().split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, start=1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, start=1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word))
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def run_backend(backend: str, model_size: str, device: str | None, files: List[Path]) -> Dict[str, object]:
+    t1 = time.perf_counter()
+    whisper_pool.get(model_size, device, backend)
+    load_seconds = time.perf_counter() - t1
+
+    texts: List[str] = []
+    t1 = time.perf_counter()
+    for path in files:
+        texts.append(speech_to_text(str(path), model_size=model_size, device=device, backend=backend))
+    decode_seconds = time.perf_counter() - t1
+    # 逐个后端测量，测完即释放，避免多个模型同时常驻影响结果
+    whisper_pool.clear()
+    return {"backend": backend, "load_s": load_seconds, "decode_s": decode_seconds, "texts": texts}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare STT backends on split chunk directories (accuracy and real-time factor).")
+    parser.add_argument("chunks", nargs="+", help="Directories of chunk wavs produced by the split step.")
+    parser.add_argument(
+        "--backend",
+        action="append",
+        dest="backends",
+        choices=sorted(STT_BACKENDS),
+        help="Backend to measure (repeatable). Defaults to all.",
+    )
+    parser.add_argument("--model-size", default="small")
+    parser.add_argument("--device", default=None)
+    parser.add_argument("--reference", default="whisper", choices=sorted(STT_BACKENDS), help="Backend whose output is the WER reference.")
+    parser.add_argument("--reference-size", default=None, help="Model size for the reference run (defaults to --model-size).")
+    parser.add_argument("--limit", type=int, default=0, help="Use at most N chunks per directory.")
+    parser.add_argument("--json", dest="json_path", default=None, help="Also write per-chunk results to this file.")
+    args = parser.parse_args()
+
+    files = collect_chunks(args.chunks, args.limit)
+    if not files:
+        raise SystemExit("No .wav chunks found.")
+    total_audio = sum(audio_seconds(path) for path in files)
+    print(f"{len(files)} chunks, {total_audio:.1f}s of audio, model {args.model_size}")
+
+    reference_size = args.reference_size or args.model_size
+    reference = run_backend(args.reference, reference_size, args.device, files)
+    results = [
+        reference if backend == args.reference and reference_size == args.model_size
+        else run_backend(backend, args.model_size, args.device, files)
+        for backend in (args.backends or list(STT_BACKENDS))
+    ]
+
+    print(f"{'backend':<16}{'load s':>8}{'decode s':>10}{'RTF':>8}{'WER':>8}")
+    for result in results:
+        wers = [word_error_rate(ref, hyp) for ref, hyp in zip(reference["texts"], result["texts"])]
+        result["rtf"] = result["decode_s"] / total_audio if total_audio else 0.0
+        result["wer"] = sum(wers) / len(wers)
+        print(f"{result['backend']:<16}{result['load_s']:>8.2f}{result['decode_s']:>10.2f}{result['rtf']:>8.3f}{result['wer']:>8.3f}")
+    print(f"WER is measured against {args.reference} ({reference_size}); RTF = decode seconds / audio seconds.")
+
+    if args.json_path:
+        payload = {
+            "model_size": args.model_size,
+            "reference": {"backend": args.reference, "model_size": reference_size},
+            "audio_seconds": total_audio,
+            "files": [str(path) for path in files],
+            "reference_texts": reference["texts"],
+            "results": results,
+        }
+        Path(args.json_path).write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -146,6 +146,8 @@ def build_config(
         "steps": steps,
         "assets": assets,
         "updated_at": timestamp,
+        # 含识别步骤，启动时在后台提前加载 Whisper 模型
+        "warm_up_services": True,
     }
     if max_session_seconds is not None:
         config["max_session_seconds"] = max_session_seconds
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
-import re
-import os
+import queue
+import shutil
+import tempfile
+import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from logger import logger
 from services.base import BaseService, ServiceError, StepContext
+from services.streaming import ArtifactStream
+from silence_split import PcmBuffer, decode_pcm, normalize_to_dbfs, split_ranges
+import numpy as np
 import soundfile as sf
 
 try:
@@ -17,11 +24,25 @@ try:
 except:
     raise ServiceError("pydub is required for audio splitting.")
 
-# Optional STT/translation/TTS backends
-from speech2text_model import speech_to_text
+# Optional STT/translation/TTS backends.
+# 这些模块导入时不加载 whisper/torch/VITS/librosa 等重量级依赖，首次调用对应服务时才导入
+from speech2text_model import (
+    DEFAULT_PROMPT,
+    clean_text,
+    get_backend,
+    speech_to_text,
+    speech_to_text_batch,
+    speech_to_text_segments,
+    whisper_pool,
+)
 from translate_model import traslate_text
 from speaker_model import speak_text
-from audio_utils import play_audio, resample_audio
+from audio_utils import play_audio
+from transcript_cache import TranscriptCache
+from chunk_manifest import ChunkEntry, ChunkManifest, canonical_chunk_name, chunk_name
+from chunk_gate import classify_file, gate_signature
+from transcript_align import texts_for_ranges
+from translation_cache import TranslationCache, shared_cache as shared_translation_cache
 
 
 def create_splitter(**options: Any) -> "SplitterService":
@@ -45,6 +66,9 @@ class SplitterService(BaseService):
     normalize: bool = True
     enabled: bool = True
     force_rebuild: bool = False
+    engine: str = "numpy"  # "numpy"：向量化静音检测；"pydub"：原 split_on_silence
+    workers: int = 4  # 并发写出切片的线程数，1 表示串行
+    stream: bool = False  # 流式模式：切片写出一个就发布一个，后续识别/播放无需等待全部完成
 
     def run(self, context: StepContext) -> Dict[str, Any]:
         params = self._merge_params(context.settings)
@@ -60,68 +84,289 @@ class SplitterService(BaseService):
         target_dir = self._resolve_target_dir(source_path, params)
         target_dir.mkdir(parents=True, exist_ok=True)
 
-        reuse_existing = (
-            not params.get("force_rebuild", self.force_rebuild)
-            and any(target_dir.glob("chunk*.wav"))
-        )
-        if reuse_existing:
-            chunk_paths = sorted(str(path) for path in target_dir.glob("chunk*.wav"))
-            transcripts = context.artifacts.get("transcripts", [])
+        manifest = None
+        if not params.get("force_rebuild", self.force_rebuild):
+            # 没有清单的旧目录先迁移（恢复被重命名的切片），之后只读清单，不再扫描目录
+            manifest = ChunkManifest.load(target_dir) or ChunkManifest.migrate(target_dir)
+        if manifest is not None and manifest.complete():
+            chunk_paths = manifest.paths()
+            # STT 已把文本写回清单时直接带出，后续 STT 步骤据此跳过识别
+            transcripts = context.artifacts.get("transcripts") or manifest.transcripts() or []
             result = {
                 "target_dir": str(target_dir),
                 "chunks": chunk_paths,
                 "transcripts": transcripts,
                 "reused": True,
+                "manifest": str(manifest.path),
             }
+            ranges = manifest.ranges()
+            if ranges is not None:
+                result["ranges"] = ranges
             context.artifacts.update(
                 {"split": result, "chunks": chunk_paths, "transcripts": transcripts}
             )
             return result
 
-        audio = self._load_audio(source_path)
-        silence_threshold = audio.dBFS - int(params.get("silence_thresh", self.silence_thresh))
+        engine = str(params.get("engine") or self.engine).lower()
+        silence_offset = int(params.get("silence_thresh", self.silence_thresh))
         min_silence = int(params.get("min_silence_len", self.min_silence_len))
         keep_silence = int(params.get("keep_silence", self.keep_silence))
+        sample_rate = int(params.get("sample_rate") or 0) or None
+        ranges: Optional[List[Tuple[int, int]]] = None
 
-        logger.info(
-            "Splitting audio '%s' -> %s (min_silence=%sms, silence_thresh=%sdB, keep=%sms)",
-            source_path,
-            target_dir,
-            min_silence,
-            silence_threshold,
-            keep_silence,
-        )
+        if engine == "pydub":
+            if params.get("stream"):
+                logger.info("Streaming split requires the numpy engine; exporting all chunks first.")
+            audio = self._load_audio(source_path)
+            if sample_rate:
+                # 切分前整体转为单声道目标采样率，切片只需导出一次
+                audio = audio.set_channels(1).set_frame_rate(sample_rate)
+            silence_threshold = audio.dBFS - silence_offset
+            self._log_split(source_path, target_dir, min_silence, silence_threshold, keep_silence)
+            segments = split_on_silence(
+                audio,
+                min_silence_len=min_silence,
+                silence_thresh=silence_threshold,
+                keep_silence=keep_silence,
+            )
+            if not segments:
+                segments = [audio]
+            writers = [self._segment_writer(segment, params) for segment in segments]
+            chunk_paths, failures, _, infos = self._export_chunks(writers, target_dir, params)
+        else:
+            # 单遍流式解码（同时重采样到 sample_rate）+ 向量化静音检测，
+            # PCM 落盘后以 memmap 切片，每个切片直接从数组写出一次
+            buffer = decode_pcm(source_path, sample_rate)
+            streaming = False
+            try:
+                silence_threshold = buffer.dbfs - silence_offset
+                self._log_split(source_path, target_dir, min_silence, silence_threshold, keep_silence)
+                ranges = split_ranges(
+                    buffer.frame_energy,
+                    buffer.frame_samples,
+                    min_silence_len=min_silence,
+                    silence_thresh=silence_threshold,
+                    keep_silence=keep_silence,
+                )
+                if not ranges:
+                    ranges = [(0, buffer.duration_ms)]
+                writers = [self._pcm_writer(buffer, start, end, params) for start, end in ranges]
+                if params.get("stream"):
+                    streaming = True
+                    return self._start_stream(context, buffer, ranges, writers, target_dir, params)
+                chunk_paths, failures, written, infos = self._export_chunks(writers, target_dir, params)
+                ranges = [ranges[idx] for idx in written]
+            finally:
+                if not streaming:
+                    buffer.close()
 
-        segments = split_on_silence(
-            audio,
-            min_silence_len=min_silence,
-            silence_thresh=silence_threshold,
-            keep_silence=keep_silence,
-        )
+        if not chunk_paths:
+            raise ServiceError(f"No chunks could be written for {source_path}: {failures}")
+
+        result = {
+            "target_dir": str(target_dir),
+            "chunks": chunk_paths,
+            "reused": False,
+            "engine": engine,
+            "failed": failures,
+        }
+        if ranges is not None:
+            result["ranges"] = [[start, end] for start, end in ranges]
+        result["manifest"] = self._write_manifest(target_dir, chunk_paths, ranges, infos, source_path, engine)
+        context.artifacts.update({"split": result, "chunks": chunk_paths})
+        return result
+
+    @staticmethod
+    def _write_manifest(
+        target_dir: Path,
+        chunk_paths: List[str],
+        ranges: Optional[List[Tuple[int, int]]],
+        infos: List[Dict[str, Any]],
+        source_path: Path,
+        engine: str,
+    ) -> str:
+        entries = []
+        for position, (path, info) in enumerate(zip(chunk_paths, infos)):
+            start_ms, end_ms = ranges[position] if ranges is not None else (None, None)
+            entries.append(
+                ChunkEntry(
+                    index=position,
+                    file=Path(path).name,
+                    start_ms=start_ms,
+                    end_ms=end_ms,
+                    duration_ms=info.get("duration_ms"),
+                    sha1=info.get("sha1"),
+                )
+            )
+        manifest = ChunkManifest(target_dir, entries, source=str(source_path), engine=engine)
+        manifest.save()
+        return str(manifest.path)
+
+    def _export_chunks(
+        self,
+        writers: List[Callable[[Path], Dict[str, Any]]],
+        target_dir: Path,
+        params: Dict[str, Any],
+        on_chunk: Optional[Callable[[int, str], None]] = None,
+    ) -> Tuple[List[str], List[Dict[str, Any]], List[int], List[Dict[str, Any]]]:
+        """
+        Write ``chunk{idx:04d}.wav`` files with a bounded thread pool.
 
-        if not segments:
-            segments = [audio]
+        Names are fixed by position so the output is deterministic regardless of
+        completion order, and results are collected in index order so
+        ``on_chunk(idx, path)`` sees chunks in sequence. A failing chunk is
+        logged and reported instead of aborting the asset.
 
+        Returns:
+            (paths of the written chunks, failure records, indices of the written
+            chunks, info dict returned by each writer); the paths, indices and
+            infos line up with each other, all in index order
+        """
+        workers = max(1, int(params.get("workers") or 1))
         chunk_paths: List[str] = []
-        for idx, segment in enumerate(segments):
-            chunk = self._prepare_segment(segment, params)
-            chunk_path = target_dir / f"chunk{idx:04d}.wav"
-            chunk.export(chunk_path, format="wav")
-            if params.get("sample_rate"):
-                try:
-                    resample_audio(str(chunk_path), sr=int(params["sample_rate"]))
-                except Exception as exc:  # pragma: no cover
-                    logger.warning("Failed to resample chunk %s: %s", chunk_path, exc)
+        failures: List[Dict[str, Any]] = []
+        written: List[int] = []
+        infos: List[Dict[str, Any]] = []
+
+        def _collect(idx: int, future: Future) -> None:
+            chunk_path = target_dir / chunk_name(idx)
+            try:
+                info = future.result()
+            except Exception as exc:
+                logger.warning("Failed to write chunk %s: %s", chunk_path, exc)
+                failures.append({"index": idx, "file": str(chunk_path), "error": str(exc)})
+                return
             chunk_paths.append(str(chunk_path))
+            written.append(idx)
+            infos.append(info or {})
+            if on_chunk:
+                on_chunk(idx, str(chunk_path))
 
-        result = {
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chunk-writer") as pool:
+            window: Deque[Tuple[int, Future]] = deque()
+            for idx, writer in enumerate(writers):
+                window.append((idx, pool.submit(writer, target_dir / chunk_name(idx))))
+                # 限制在途任务数量，避免一次性把所有切片的数据都排进队列
+                if len(window) >= workers * 2:
+                    _collect(*window.popleft())
+            while window:
+                _collect(*window.popleft())
+
+        return chunk_paths, failures, written, infos
+
+    def _start_stream(
+        self,
+        context: StepContext,
+        buffer: PcmBuffer,
+        ranges: List[Tuple[int, int]],
+        writers: List[Callable[[Path], Dict[str, Any]]],
+        target_dir: Path,
+        params: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Write chunks on a background thread and publish them through
+        ``artifacts["chunk_stream"]`` as soon as each one is on disk.
+
+        The split result (including ``manifest``) is filled in once the last
+        chunk is written; the PCM buffer is released by the producer thread.
+
+        Only chunk writing is streamed: the whole source is still decoded and
+        scanned before the first chunk is published, because the silence
+        threshold is relative to the loudness of the entire file, so no boundary
+        is final until the scan is done. Playback started from the stream cannot
+        map a ``start_file`` through the manifest yet; legacy names are resolved
+        with ``canonical_chunk_name`` instead.
+        """
+        stream: ArtifactStream[str] = ArtifactStream(expected=len(ranges))
+        result: Dict[str, Any] = {
             "target_dir": str(target_dir),
-            "chunks": chunk_paths,
+            "chunks": [],
             "reused": False,
+            "engine": "numpy",
+            "failed": [],
+            "streaming": True,
         }
-        context.artifacts.update({"split": result, "chunks": chunk_paths})
+
+        def _produce() -> None:
+            try:
+                chunk_paths, failures, written, infos = self._export_chunks(
+                    writers, target_dir, params, on_chunk=lambda _idx, path: stream.append(path)
+                )
+                written_ranges = [ranges[idx] for idx in written]
+                result.update(
+                    chunks=chunk_paths,
+                    failed=failures,
+                    ranges=[list(item) for item in written_ranges],
+                    manifest=self._write_manifest(
+                        target_dir, chunk_paths, written_ranges, infos, context.asset.resolved_path(), "numpy"
+                    ),
+                )
+                context.artifacts["chunks"] = chunk_paths
+                stream.close()
+            except BaseException as exc:  # pragma: no cover
+                logger.warning("Streaming split failed for %s: %s", context.asset.id, exc)
+                stream.fail(exc)
+            finally:
+                buffer.close()
+
+        threading.Thread(target=_produce, name=f"split-stream-{context.asset.id}", daemon=True).start()
+        context.artifacts.update({"split": result, "chunk_stream": stream})
         return result
 
+    def _segment_writer(self, segment: AudioSegment, params: Dict[str, Any]) -> Callable[[Path], Dict[str, Any]]:
+        def _write(chunk_path: Path) -> Dict[str, Any]:
+            prepared = self._prepare_segment(segment, params)
+            prepared.export(chunk_path, format="wav")
+            if prepared.sample_width == 2:
+                # 16 位 PCM 与写出的 wav 完全一致，直接对内存中的样本取摘要，不必再读一遍文件
+                samples = np.frombuffer(prepared.raw_data, dtype=np.int16).reshape(-1, prepared.channels)
+                digest = TranscriptCache.samples_digest(samples, prepared.frame_rate)
+            else:
+                digest = TranscriptCache.audio_digest(chunk_path)
+            return {"duration_ms": len(segment), "sha1": digest}
+
+        return _write
+
+    @staticmethod
+    def _pcm_writer(
+        buffer: PcmBuffer,
+        start_ms: int,
+        end_ms: int,
+        params: Dict[str, Any],
+    ) -> Callable[[Path], Dict[str, Any]]:
+        normalize = params.get("normalize", True)
+        target_dbfs = float(params.get("target_dbfs", -25.0))
+
+        def _write(chunk_path: Path) -> Dict[str, Any]:
+            samples = buffer.sample_range(start_ms, end_ms)
+            if normalize:
+                samples = normalize_to_dbfs(samples, target_dbfs)
+            sf.write(str(chunk_path), samples, buffer.sample_rate, subtype="PCM_16")
+            # 写出时顺带计算 PCM 摘要，识别阶段查转写缓存不必再读一遍文件
+            return {
+                "duration_ms": int(samples.shape[0] * 1000 // buffer.sample_rate),
+                "sha1": TranscriptCache.samples_digest(samples, buffer.sample_rate),
+            }
+
+        return _write
+
+    @staticmethod
+    def _log_split(
+        source_path: Path,
+        target_dir: Path,
+        min_silence: int,
+        silence_threshold: float,
+        keep_silence: int,
+    ) -> None:
+        logger.info(
+            "Splitting audio '%s' -> %s (min_silence=%sms, silence_thresh=%sdB, keep=%sms)",
+            source_path,
+            target_dir,
+            min_silence,
+            silence_threshold,
+            keep_silence,
+        )
+
     def _merge_params(self, overrides: Dict[str, Any]) -> Dict[str, Any]:
         params = {
             "min_silence_len": self.min_silence_len,
@@ -131,6 +376,9 @@ class SplitterService(BaseService):
             "normalize": self.normalize,
             "enabled": self.enabled,
             "force_rebuild": self.force_rebuild,
+            "engine": self.engine,
+            "workers": self.workers,
+            "stream": self.stream,
         }
         params.update({k: v for k, v in overrides.items() if v is not None})
         return params
@@ -160,15 +408,41 @@ class SplitterService(BaseService):
 class STTService(BaseService):
     model_size: str = "tiny"
     device: Optional[str] = None
+    backend: str = "whisper"  # "whisper"（fp32/fp16）、"whisper-int8"（CPU 动态量化）、"faster-whisper"
     force_transcribe: bool = False
+    batch_size: int = 0  # >1 时启用批量识别：多个切片合并为一次 Whisper 前向
+    initial_prompt: Optional[str] = DEFAULT_PROMPT
+    use_cache: bool = True  # 按切片音频哈希持久化识别结果
+    cache_dir: Optional[str] = None
+    vad: str = "energy"  # 识别前对切片预分类："energy"、"webrtc"（需安装 webrtcvad）或 "off"
+    vad_min_speech_ms: int = 60  # 有效语音不足该时长的切片视为噪声，不调用 Whisper
+    short_chunk_ms: int = 1000  # 不超过该时长的切片合并为一批快速解码
+    short_model_size: Optional[str] = None  # 短切片使用的模型，默认与 model_size 相同
+    mode: str = "chunks"  # "chunks"：逐个切片识别；"source"：整段源音频识别一次，按时间戳分配到切片
+    word_timestamps: bool = False  # source 模式下使用词级时间戳对齐切片边界
 
     def run(self, context: StepContext) -> Dict[str, Any]:
         params = {
             "model_size": self.model_size,
             "device": self.device,
+            "backend": self.backend,
             "force_transcribe": self.force_transcribe,
+            "batch_size": self.batch_size,
+            "initial_prompt": self.initial_prompt,
+            "use_cache": self.use_cache,
+            "cache_dir": self.cache_dir,
+            "vad": self.vad,
+            "vad_min_speech_ms": self.vad_min_speech_ms,
+            "short_chunk_ms": self.short_chunk_ms,
+            "short_model_size": self.short_model_size,
+            "mode": self.mode,
+            "word_timestamps": self.word_timestamps,
         }
         params.update({k: v for k, v in context.settings.items() if v is not None})
+        try:
+            get_backend(str(params["backend"]))
+        except ValueError as exc:
+            raise ServiceError(str(exc)) from exc
 
         existing = context.artifacts.get("transcripts")
         if existing and not params.get("force_transcribe"):
@@ -176,57 +450,410 @@ class STTService(BaseService):
             context.ensure_step_store()["transcripts"] = existing
             return {"transcripts": existing}
 
+        chunk_stream = context.artifacts.get("chunk_stream")
+        if isinstance(chunk_stream, ArtifactStream):
+            if params.get("mode") == "source":
+                logger.info("Source-mode transcription needs the finished split; transcribing streamed chunks instead.")
+            return self._start_stream(context, chunk_stream, params)
+
         chunk_list = list(context.artifacts.get("chunks") or [])
         has_chunks = bool(chunk_list)
-        targets: Iterable[str] = chunk_list if has_chunks else [str(context.asset.resolved_path())]
+        targets: List[str] = chunk_list if has_chunks else [str(context.asset.resolved_path())]
+        cache = self._open_cache(context, targets, params)
+        manifest = self._open_manifest(context) if has_chunks else None
+        digests = manifest.digests() if manifest is not None else {}
+        ranges = (context.artifacts.get("split") or {}).get("ranges")
+        if params.get("mode") == "source" and has_chunks:
+            if ranges and len(ranges) == len(chunk_list):
+                texts, decisions = self._transcribe_source(context, targets, ranges, params, cache, digests)
+            else:
+                # pydub 引擎或迁移来的旧切片没有切片边界，只能逐个切片识别
+                logger.info("No split ranges for %s; falling back to per-chunk transcription.", context.asset.id)
+                texts, decisions = self._transcribe_cached(targets, params, cache, gate=True, digests=digests)
+        else:
+            # 只对切片做预分类；整段源音频直接交给 Whisper
+            texts, decisions = self._transcribe_cached(targets, params, cache, gate=has_chunks, digests=digests)
 
-        transcripts: List[Dict[str, Any]] = []
-        for idx, path in enumerate(list(targets)):
-            text = ""
+        transcripts = [
+            self._transcript_item(path, text, decision) for path, text, decision in zip(targets, texts, decisions)
+        ]
+        context.artifacts["transcripts"] = transcripts
+        context.ensure_step_store()["transcripts"] = transcripts
+        self._save_manifest(manifest, transcripts)
+        return {"transcripts": transcripts}
+
+    def warm_up(self) -> None:
+        """Load the configured Whisper model ahead of the first chunk."""
+        whisper_pool.warm_up([self.model_size], self.device, backend=self.backend, background=False)
+        logger.info("Whisper pool after warm-up: %s", whisper_pool.metrics())
+
+    def _transcribe_source(
+        self,
+        context: StepContext,
+        targets: List[str],
+        ranges: List[List[int]],
+        params: Dict[str, Any],
+        cache: Optional[TranscriptCache],
+        digests: Optional[Dict[str, str]] = None,
+    ) -> Tuple[List[str], List[Optional[Dict[str, Any]]]]:
+        """
+        Decode the whole source once and split the text along ``ranges``.
+
+        Chunk texts are cached under a source-mode key, so a rerun with every
+        chunk cached skips Whisper entirely. The raw timestamped segments are
+        kept in ``artifacts["source_segments"]`` for later split refinement.
+        """
+        label = self._cache_label(params) + "|source"
+        prompt = params.get("initial_prompt", self.initial_prompt)
+        keys: List[Optional[str]] = [None] * len(targets)
+        if cache is not None:
+            for idx, path in enumerate(targets):
+                try:
+                    keys[idx] = cache.make_key(self._chunk_digest(cache, path, digests), label, prompt)
+                except Exception as exc:  # pragma: no cover
+                    logger.warning("Failed to hash %s for transcript cache: %s", path, exc)
+            cached = [cache.get(key) if key is not None else None for key in keys]
+            if not params.get("force_transcribe") and all(text is not None for text in cached):
+                logger.info("Transcript cache %s: %s", cache.path, cache.stats())
+                return [text or "" for text in cached], [{"route": "cached"} for _ in targets]
+
+        segments = speech_to_text_segments(
+            str(context.asset.resolved_path()),
+            model_size=params.get("model_size", self.model_size),
+            device=params.get("device", self.device),
+            initial_prompt=prompt,
+            backend=params.get("backend", self.backend),
+            word_timestamps=bool(params.get("word_timestamps", self.word_timestamps)),
+        )
+        texts = [clean_text(text) for text in texts_for_ranges(segments, ranges)]
+        context.artifacts["source_segments"] = segments
+        context.ensure_step_store()["source_segments"] = segments
+
+        if cache is not None:
+            for key, text in zip(keys, texts):
+                if key is not None:
+                    cache.put(key, text)
+            try:
+                cache.save()
+            except OSError as exc:  # pragma: no cover
+                logger.warning("Failed to persist transcript cache %s: %s", cache.path, exc)
+        return texts, [{"route": "source"} for _ in targets]
+
+    def _start_stream(
+        self,
+        context: StepContext,
+        chunk_stream: ArtifactStream,
+        params: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Transcribe chunks on a background thread as the splitter publishes them.
+
+        Items ``{"file", "text", "gate"}`` are pushed to ``artifacts["transcript_stream"]``
+        in chunk order; the usual ``transcripts``/``chunks`` artifacts are filled
+        in once the input stream is exhausted.
+        """
+        output: ArtifactStream[Dict[str, Any]] = ArtifactStream(expected=chunk_stream.expected)
+        target_dir = (context.artifacts.get("split") or {}).get("target_dir")
+
+        def _consume() -> None:
+            transcripts: List[Dict[str, Any]] = []
+            cache = None
+            try:
+                for path in chunk_stream:
+                    if cache is None:
+                        cache = self._open_cache(context, [target_dir or path], params)
+                    texts, decisions = self._transcribe_cached([path], params, cache, persist=False, gate=True)
+                    item = self._transcript_item(path, texts[0], decisions[0])
+                    transcripts.append(item)
+                    output.append(item)
+                if cache is not None:
+                    cache.save()
+                context.artifacts["transcripts"] = transcripts
+                context.ensure_step_store()["transcripts"] = transcripts
+                # 切分线程在关闭 chunk_stream 之前已写好清单
+                self._save_manifest(self._open_manifest(context), transcripts)
+                output.close()
+            except BaseException as exc:  # pragma: no cover
+                logger.warning("Streaming transcription failed for %s: %s", context.asset.id, exc)
+                output.fail(exc)
+
+        threading.Thread(target=_consume, name=f"stt-stream-{context.asset.id}", daemon=True).start()
+        context.artifacts["transcript_stream"] = output
+        return {"streaming": True}
+
+    @staticmethod
+    def _open_manifest(context: StepContext) -> Optional[ChunkManifest]:
+        manifest_path = (context.artifacts.get("split") or {}).get("manifest")
+        return ChunkManifest.for_path(manifest_path) if manifest_path else None
+
+    @staticmethod
+    def _save_manifest(manifest: Optional[ChunkManifest], transcripts: List[Dict[str, Any]]) -> None:
+        """Record texts in the chunk manifest with a single atomic rewrite."""
+        if manifest is None:
+            return
+        manifest.set_transcripts(transcripts)
+        try:
+            manifest.save()
+        except OSError as exc:  # pragma: no cover
+            logger.warning("Failed to update chunk manifest %s: %s", manifest.path, exc)
+
+    def _open_cache(
+        self, context: StepContext, targets: List[str], params: Dict[str, Any]
+    ) -> Optional[TranscriptCache]:
+        if not params.get("use_cache", True) or not targets:
+            return None
+        cache_dir = params.get("cache_dir") or (context.artifacts.get("split") or {}).get("target_dir")
+        if not cache_dir:
+            cache_dir = str(Path(targets[0]).parent)
+        return TranscriptCache.for_directory(cache_dir)
+
+    def _transcribe_cached(
+        self,
+        targets: List[str],
+        params: Dict[str, Any],
+        cache: Optional[TranscriptCache],
+        persist: bool = True,
+        gate: bool = False,
+        digests: Optional[Dict[str, str]] = None,
+    ) -> Tuple[List[str], List[Optional[Dict[str, Any]]]]:
+        """
+        Serve transcripts from the cache and only run Whisper for the misses.
+
+        Returns the texts plus the gate decision of each target; cache hits are
+        reported with route ``"cached"`` since they never reach the classifier.
+        Full decodes are cached under the model/prompt key; a dropped chunk's
+        empty text and a short decode depend on the gate, so they are cached
+        under a second key that adds the gate settings (``_gate_label``).
+        """
+        if cache is None:
+            return self._transcribe(targets, params, gate=gate)
+
+        model_size = self._cache_label(params)
+        gate_label = self._gate_label(params, model_size) if gate else None
+        prompt = params.get("initial_prompt", self.initial_prompt)
+        force = bool(params.get("force_transcribe"))
+        texts: List[Optional[str]] = [None] * len(targets)
+        keys: List[Optional[str]] = [None] * len(targets)
+        gate_keys: List[Optional[str]] = [None] * len(targets)
+        for idx, path in enumerate(targets):
+            try:
+                digest = self._chunk_digest(cache, path, digests)
+            except Exception as exc:  # pragma: no cover
+                logger.warning("Failed to hash %s for transcript cache: %s", path, exc)
+                continue
+            keys[idx] = cache.make_key(digest, model_size, prompt)
+            if gate_label is not None:
+                gate_keys[idx] = cache.make_key(digest, gate_label, prompt)
+            if not force:
+                texts[idx] = cache.get(keys[idx])
+                if texts[idx] is None and gate_keys[idx] is not None:
+                    texts[idx] = cache.get(gate_keys[idx])
+
+        decisions: List[Optional[Dict[str, Any]]] = [{"route": "cached"} if text is not None else None for text in texts]
+        missing = [idx for idx, text in enumerate(texts) if text is None]
+        if missing:
+            fresh, fresh_decisions = self._transcribe([targets[idx] for idx in missing], params, gate=gate)
+            for idx, text, decision in zip(missing, fresh, fresh_decisions):
+                texts[idx] = text
+                decisions[idx] = decision
+                # 门控丢弃与短切片快速解码的结果取决于门控设置，存到带设置的键下
+                key = keys[idx] if decision is None or decision.get("route") == "full" else gate_keys[idx]
+                if key is not None:
+                    cache.put(key, text)
+            if persist:
+                try:
+                    cache.save()
+                except OSError as exc:  # pragma: no cover
+                    logger.warning("Failed to persist transcript cache %s: %s", cache.path, exc)
+        logger.info("Transcript cache %s: %s", cache.path, cache.stats())
+        return [text or "" for text in texts], decisions
+
+    @staticmethod
+    def _chunk_digest(cache: TranscriptCache, path: str, digests: Optional[Dict[str, str]]) -> str:
+        """PCM digest recorded in the chunk manifest at split time, else hash the file."""
+        return (digests or {}).get(path) or cache.audio_digest(path)
+
+    def _cache_label(self, params: Dict[str, Any]) -> str:
+        model_size = str(params.get("model_size", self.model_size))
+        backend = str(params.get("backend", self.backend))
+        if backend != "whisper":
+            # 不同后端的识别结果可能不同，分开缓存；默认后端沿用原有的键
+            return f"{backend}:{model_size}"
+        return model_size
+
+    def _gate_label(self, params: Dict[str, Any], model_size: str) -> Optional[str]:
+        """Cache label for drop/short results: model plus every setting that picks the route."""
+        vad = str(params.get("vad", self.vad))
+        if vad == "off":
+            return None
+        signature = gate_signature(
+            vad,
+            int(params.get("vad_min_speech_ms", self.vad_min_speech_ms)),
+            int(params.get("short_chunk_ms", self.short_chunk_ms)),
+        )
+        short_model_size = params.get("short_model_size") or params.get("model_size", self.model_size)
+        return f"{model_size}|gate={signature}|short={short_model_size}"
+
+    def _transcribe(
+        self, targets: List[str], params: Dict[str, Any], gate: bool = False
+    ) -> Tuple[List[str], List[Optional[Dict[str, Any]]]]:
+        """
+        Classify chunks before Whisper: noise/empty chunks are dropped with an
+        empty transcript, short ones are decoded together in one batched pass
+        (no timestamps, no temperature fallback) and the rest go through the
+        regular decode.
+        """
+        decisions: List[Optional[Dict[str, Any]]] = [None] * len(targets)
+        if gate and params.get("vad", self.vad) != "off":
+            decisions = self._classify(targets, params)
+        texts = [""] * len(targets)
+        short = [idx for idx, decision in enumerate(decisions) if decision and decision["route"] == "short"]
+        full = [idx for idx, decision in enumerate(decisions) if not decision or decision["route"] == "full"]
+        if short:
+            for idx, text in zip(short, self._decode_short([targets[idx] for idx in short], params)):
+                texts[idx] = text
+        if full:
+            for idx, text in zip(full, self._decode([targets[idx] for idx in full], params)):
+                texts[idx] = text
+        if gate:
+            logger.info(
+                "STT gate: %d dropped, %d short, %d full",
+                len(targets) - len(short) - len(full),
+                len(short),
+                len(full),
+            )
+        return texts, decisions
+
+    def _classify(self, targets: List[str], params: Dict[str, Any]) -> List[Optional[Dict[str, Any]]]:
+        decisions: List[Optional[Dict[str, Any]]] = []
+        for path in targets:
             try:
-                text = speech_to_text(
+                decision = classify_file(
                     path,
-                    model_size=params.get("model_size", self.model_size),
-                    device=params.get("device", self.device),
+                    vad=str(params.get("vad", self.vad)),
+                    min_speech_ms=int(params.get("vad_min_speech_ms", self.vad_min_speech_ms)),
+                    short_ms=int(params.get("short_chunk_ms", self.short_chunk_ms)),
                 )
+                decisions.append(decision.as_dict())
             except Exception as exc:  # pragma: no cover
-                logger.warning("Transcription failed for %s: %s", path, exc)
-            new_path = path
-            if has_chunks:
-                new_path = str(self._rename_chunk(Path(path), text, idx))
-                chunk_list[idx] = new_path
-                # 将文件重命名为新文件名
-                try:
-                    os.rename(path, new_path)
-                except OSError:
-                    logger.warning("Failed to rename chunk %s to %s", path, new_path)
-            transcripts.append({"file": new_path, "text": text})
+                logger.warning("Chunk gate failed for %s, using full decode: %s", path, exc)
+                decisions.append(None)
+        return decisions
 
-        context.artifacts["transcripts"] = transcripts
-        if has_chunks:
-            context.artifacts["chunks"] = chunk_list
-        context.ensure_step_store()["transcripts"] = transcripts
-        return {"transcripts": transcripts}
+    def _decode_short(self, targets: List[str], params: Dict[str, Any]) -> List[str]:
+        model_size = params.get("short_model_size") or params.get("model_size", self.model_size)
+        batch_size = int(params.get("batch_size") or 0)
+        try:
+            return speech_to_text_batch(
+                targets,
+                model_size=model_size,
+                device=params.get("device", self.device),
+                batch_size=batch_size if batch_size > 1 else 16,
+                initial_prompt=params.get("initial_prompt", self.initial_prompt),
+                backend=params.get("backend", self.backend),
+            )
+        except Exception as exc:  # pragma: no cover
+            logger.warning("Short-chunk decode failed, falling back to full decode: %s", exc)
+            return self._decode(targets, params)
 
     @staticmethod
-    def _rename_chunk(path: Path, text: str, index: int) -> Path:
-        snippet = (text or "").strip()
-        if not snippet:
-            return path
-        truncated = snippet[:50]
-        sanitized = re.sub(r"[\\/:*?\"<>|]", "", truncated)
-        sanitized = re.sub(r"\s+", "_", sanitized).strip("_")
-        if not sanitized:
-            return path
-        new_name = f"{index:04d}_{sanitized}.wav"
-        new_path = path.with_name(new_name)
+    def _transcript_item(path: str, text: str, decision: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        item: Dict[str, Any] = {"file": path, "text": text}
+        if decision is not None:
+            item["gate"] = decision
+        return item
+
+    def _decode(self, targets: List[str], params: Dict[str, Any]) -> List[str]:
+        model_size = params.get("model_size", self.model_size)
+        device = params.get("device", self.device)
+        backend = params.get("backend", self.backend)
+        prompt = params.get("initial_prompt", self.initial_prompt)
+        batch_size = int(params.get("batch_size") or 0)
+        if batch_size > 1 and len(targets) > 1:
+            try:
+                return speech_to_text_batch(
+                    targets,
+                    model_size=model_size,
+                    device=device,
+                    batch_size=batch_size,
+                    initial_prompt=prompt,
+                    backend=backend,
+                )
+            except Exception as exc:  # pragma: no cover
+                logger.warning("Batched transcription failed, falling back to per-chunk: %s", exc)
+
+        texts: List[str] = []
+        for path in targets:
+            text = ""
+            try:
+                text = speech_to_text(path, model_size=model_size, device=device, initial_prompt=prompt, backend=backend)
+            except Exception as exc:  # pragma: no cover
+                logger.warning("Transcription failed for %s: %s", path, exc)
+            texts.append(text)
+        return texts
+
+
+class _SegmentPrefetcher:
+    """
+    Bounded lookahead over playback segments.
+
+    A daemon worker walks the segment source and runs ``prepare`` (translation
+    plus speech synthesis) for each item, keeping at most ``depth`` prepared
+    items ahead of the consumer. Iterating blocks only when the worker has not
+    finished the next item yet.
+    """
+
+    _DONE = object()
+
+    def __init__(
+        self,
+        segments: Iterable[Tuple[int, str, str]],
+        prepare: Callable[[int, str, str], Tuple[Optional[str], Optional[str]]],
+        depth: int,
+    ) -> None:
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, depth))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(segments, prepare), name="playback-prefetch", daemon=True
+        )
+        self._thread.start()
+
+    def _run(
+        self,
+        segments: Iterable[Tuple[int, str, str]],
+        prepare: Callable[[int, str, str], Tuple[Optional[str], Optional[str]]],
+    ) -> None:
         try:
-            if new_path.exists():
-                return new_path
-            path.rename(new_path)
-            return new_path
-        except OSError:
-            return path
+            for position, (offset, path, text) in enumerate(segments):
+                if self._stop.is_set():
+                    return
+                if not self._put((offset, path, text, prepare(position, path, text))):
+                    return
+        except BaseException as exc:  # pragma: no cover
+            self._put(exc)
+            return
+        self._put(self._DONE)
+
+    def _put(self, item: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __iter__(self) -> Iterator[Tuple[int, str, str, Tuple[Optional[str], Optional[str]]]]:
+        while True:
+            item = self._queue.get()
+            if item is self._DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    def close(self) -> None:
+        self._stop.set()
 
 
 @dataclass
@@ -238,28 +865,18 @@ class PlaybackService(BaseService):
     play_audio_flag: bool = True
     skip_first: bool = False
     fs_multi: float = 1.0
+    prefetch: int = 0  # >0 时后台提前翻译并合成后续 N 个片段的中文语音
+    translation_cache: Optional[str] = None  # 译文缓存文件，默认放在切片目录的上一级
 
     def run(self, context: StepContext) -> Dict[str, Any]:
         params = self._merge_params(context.settings)
-        chunk_paths = list(context.artifacts.get("chunks") or [])
-        if not chunk_paths:
-            chunk_paths = [str(context.asset.resolved_path())]
-
-        start_file = params.get("start_file")
-        start_idx = 0
-        if start_file:
-            for idx, path in enumerate(chunk_paths):
-                if Path(path).name == Path(start_file).name:
-                    start_idx = idx
-                    break
+        segments, remaining_segments = self._segment_source(context, params.get("start_file"))
 
         callback = context.get_callback("on_progress")
-        transcripts = context.artifacts.get("transcripts") or []
-        transcript_map = {Path(item["file"]).name: item.get("text", "") for item in transcripts if isinstance(item, dict)}
 
         played_segments = 0
+        start_index: Optional[int] = None
         playback_seconds = 0.0
-        total_segments = len(chunk_paths[start_idx:])
         last_played = None
         translations: List[Dict[str, Any]] = []
         session_limit = context.settings.get("max_session_seconds")
@@ -269,75 +886,162 @@ class PlaybackService(BaseService):
         except (TypeError, ValueError):
             limit_seconds = None
 
-        for offset, path in enumerate(chunk_paths[start_idx:], start=start_idx):
-            if limit_seconds is not None and playback_seconds >= limit_seconds:
-                logger.info(
-                    "Reached playback time limit %.2fs for asset %s; stopping session.",
-                    limit_seconds,
-                    context.asset.id,
-                )
-                break
-            if params.get("skip_first") and offset == start_idx:
-                logger.info("Skipping first segment per configuration.")
-                continue
+        cache = self._open_translation_cache(context, params)
+        prefetch = max(0, int(params.get("prefetch") or 0))
+        speech_dir = Path(tempfile.mkdtemp(prefix="playback_tts_")) if prefetch else None
 
-            repeats = params.get("repeats", 1)
-            threshold = params.get("initial_threshold")
-            initial_repeats = params.get("initial_repeats")
-            params["fs_multi"] = 0.8*self.fs_multi if context.asset.lang == "en" else self.fs_multi
-            if (
-                threshold is not None
-                and initial_repeats is not None
-                and (offset - start_idx) < int(threshold)
-            ):
-                repeats = int(initial_repeats)
-
-            file_name = Path(path).name
-            words_len = len(file_name.split("_"))-1
-            transcript_text = transcript_map.get(file_name, "")
-
-            if callback:
-                callback(file_name, offset)
-
-            segment_seconds = self._segment_duration_seconds(path)
-            translation_text = None
-                    
-            logger.info("Translation result for %s: %s", path, translation_text)
-            # 针对英文文本，如果只有单词的话取消重复播放
-            if (context.asset.lang or "").lower().startswith("en") and words_len == 1:
-                repeat_count = 1
-            else:
-                repeat_count = repeats
-                if params.get("translate") and transcript_text:
-                    translation_text = self._translate(transcript_text)
-                    if translation_text:
-                        translations.append({"file": path, "translation": translation_text})
-
-            for idx in range(repeat_count):
-                self._play(path, params)
-                playback_seconds += segment_seconds
-                if translation_text and idx == 0 and repeat_count>1:
-                    try:
+        def _prepare(position: int, path: str, text: str) -> Tuple[Optional[str], Optional[str]]:
+            return self._prepare_translation(context, params, position, path, text, speech_dir, cache)
+
+        source: Iterable[Tuple[int, str, str, Optional[Tuple[Optional[str], Optional[str]]]]]
+        if prefetch:
+            # 后台线程提前翻译并合成后面 N 个片段，当前片段播放时不再等待 Ollama/VITS
+            source = _SegmentPrefetcher(segments, _prepare, depth=prefetch)
+        else:
+            source = ((offset, path, text, None) for offset, path, text in segments)
+
+        try:
+            for position, (offset, path, transcript_text, prepared) in enumerate(source):
+                if start_index is None:
+                    start_index = offset
+                if limit_seconds is not None and playback_seconds >= limit_seconds:
+                    logger.info(
+                        "Reached playback time limit %.2fs for asset %s; stopping session.",
+                        limit_seconds,
+                        context.asset.id,
+                    )
+                    break
+                if params.get("skip_first") and position == 0:
+                    logger.info("Skipping first segment per configuration.")
+                    continue
+
+                params["fs_multi"] = 0.8*self.fs_multi if context.asset.lang == "en" else self.fs_multi
+                repeat_count, words_len = self._repeat_plan(context, params, position, transcript_text)
+                file_name = Path(path).name
+
+                if callback:
+                    callback(file_name, offset)
+
+                segment_seconds = self._segment_duration_seconds(path)
+                if prepared is None:
+                    prepared = _prepare(position, path, transcript_text)
+                translation_text, speech_path = prepared
+                logger.info("Translation result for %s: %s", path, translation_text)
+                if translation_text:
+                    translations.append({"file": path, "translation": translation_text})
+
+                for idx in range(repeat_count):
+                    self._play(path, params)
+                    playback_seconds += segment_seconds
+                    if translation_text and idx == 0 and repeat_count>1:
                         time.sleep(1.5)
-                        speak_text(translation_text, play_audio_flag=self.play_audio_flag)
-                    except Exception as exc:  # pragma: no cover
-                        logger.warning("Speak translation failed: %s", exc)
-                time.sleep(0.6+words_len*0.25)
+                        self._speak_translation(translation_text, speech_path)
+                    time.sleep(0.6+words_len*0.25)
 
-            played_segments += 1
-            last_played = path
+                played_segments += 1
+                last_played = path
+        finally:
+            if isinstance(source, _SegmentPrefetcher):
+                source.close()
+            if speech_dir is not None:
+                shutil.rmtree(speech_dir, ignore_errors=True)
 
         playback_result = {
             "last_played": last_played,
-            "segments_total": total_segments,
+            "segments_total": remaining_segments(),
             "segments_played": played_segments,
+            "start_index": start_index or 0,
             "translations": translations,
             "seconds_played": playback_seconds,
             "seconds_limit": limit_seconds,
         }
+        if cache is not None:
+            playback_result["translation_cache"] = cache.stats()
+            logger.info("Translation cache for asset %s: %s", context.asset.id, playback_result["translation_cache"])
         context.artifacts["playback"] = playback_result
         return playback_result
 
+    def _segment_source(
+        self,
+        context: StepContext,
+        start_file: Optional[str],
+    ) -> Tuple[Iterable[Tuple[int, str, str]], Callable[[], int]]:
+        """
+        Resolve what to play as ``(index, chunk path, transcript text)`` items.
+
+        Prefers ``transcript_stream``/``chunk_stream`` artifacts published by the
+        streaming split/STT steps, so playback can begin on the first chunk while
+        later ones are still being produced; otherwise uses the ``chunks`` list.
+
+        Returns:
+            (items from ``start_file`` onwards, callable giving the number of segments from that point)
+        """
+        manifest_path = (context.artifacts.get("split") or {}).get("manifest")
+        manifest = ChunkManifest.for_path(manifest_path) if manifest_path else None
+        if start_file:
+            # 旧断点记录里的文件名可能是迁移前的 0003_文本.wav，经清单映射回现在的切片名；
+            # 流式切分时清单要到最后一个切片写完才生成，此时按旧命名规则直接换算
+            entry = manifest.entry(start_file) if manifest is not None else None
+            start_file = entry.file if entry is not None else canonical_chunk_name(start_file)
+
+        stream = context.artifacts.get("transcript_stream") or context.artifacts.get("chunk_stream")
+        if isinstance(stream, ArtifactStream):
+            return self._stream_source(stream, start_file)
+
+        chunk_paths = list(context.artifacts.get("chunks") or [])
+        if not chunk_paths:
+            chunk_paths = [str(context.asset.resolved_path())]
+
+        start_idx = 0
+        if start_file:
+            for idx, path in enumerate(chunk_paths):
+                if Path(path).name == Path(start_file).name:
+                    start_idx = idx
+                    break
+
+        transcripts = context.artifacts.get("transcripts") or []
+        transcript_map = {Path(item["file"]).name: item.get("text", "") for item in transcripts if isinstance(item, dict)}
+        if not transcript_map and manifest is not None:
+            # 工作流中没有识别步骤时，沿用清单里上次识别的文本
+            transcript_map = {entry.file: entry.text or "" for entry in manifest.entries}
+        items = [
+            (idx, path, transcript_map.get(Path(path).name, ""))
+            for idx, path in enumerate(chunk_paths)
+        ][start_idx:]
+        return items, lambda: len(items)
+
+    @staticmethod
+    def _stream_source(
+        stream: ArtifactStream,
+        start_file: Optional[str],
+    ) -> Tuple[Iterator[Tuple[int, str, str]], Callable[[], int]]:
+        state = {"start": 0}
+
+        def _iter() -> Iterator[Tuple[int, str, str]]:
+            seen: List[Tuple[int, str, str]] = []
+            matched = not start_file
+            for idx, item in enumerate(stream):
+                if isinstance(item, dict):
+                    entry = (idx, str(item["file"]), item.get("text", ""))
+                else:
+                    entry = (idx, str(item), "")
+                if not matched:
+                    seen.append(entry)
+                    if Path(entry[1]).name != Path(str(start_file)).name:
+                        continue
+                    matched = True
+                    state["start"] = idx
+                yield entry
+            if not matched:
+                logger.warning("start_file %s not found in streamed chunks; playing from the beginning.", start_file)
+                yield from seen
+
+        def _remaining() -> int:
+            total = stream.expected if stream.expected is not None else len(stream.items())
+            return max(total - state["start"], 0)
+
+        return _iter(), _remaining
+
     def _merge_params(self, overrides: Dict[str, Any]) -> Dict[str, Any]:
         params = {
             "repeats": self.repeats,
@@ -346,6 +1050,8 @@ class PlaybackService(BaseService):
             "translate": self.translate,
             "skip_first": self.skip_first,
             "fs_multi": self.fs_multi,
+            "prefetch": self.prefetch,
+            "translation_cache": self.translation_cache,
         }
         params.update({k: v for k, v in overrides.items() if v is not None})
         return params
@@ -356,11 +1062,107 @@ class PlaybackService(BaseService):
         except Exception as exc:  # pragma: no cover
             logger.warning("Playback failed for %s: %s", path, exc)
 
-    def _translate(self, text: str) -> Optional[str]:
+    def _repeat_plan(
+        self,
+        context: StepContext,
+        params: Dict[str, Any],
+        position: int,
+        text: str,
+    ) -> Tuple[int, int]:
+        """Return (repeat count, word count) for the segment at ``position`` in this session."""
+        words_len = len((text or "").split())
+        # 针对英文文本，如果只有单词的话取消重复播放
+        if (context.asset.lang or "").lower().startswith("en") and words_len == 1:
+            return 1, words_len
+        repeats = params.get("repeats", 1)
+        threshold = params.get("initial_threshold")
+        initial_repeats = params.get("initial_repeats")
+        if (
+            threshold is not None
+            and initial_repeats is not None
+            and position < int(threshold)
+        ):
+            repeats = int(initial_repeats)
+        return repeats, words_len
+
+    def _prepare_translation(
+        self,
+        context: StepContext,
+        params: Dict[str, Any],
+        position: int,
+        path: str,
+        text: str,
+        speech_dir: Optional[Path],
+        cache: Optional[TranslationCache] = None,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Translate a segment and, when ``speech_dir`` is given, pre-render the
+        spoken translation into it.
+
+        Returns:
+            (translation text or None, rendered wav path or None)
+        """
+        if params.get("skip_first") and position == 0:
+            return None, None
+        if not params.get("translate") or not text:
+            return None, None
+        repeat_count, words_len = self._repeat_plan(context, params, position, text)
+        if (context.asset.lang or "").lower().startswith("en") and words_len == 1:
+            return None, None
+        try:
+            translation_text = self._translate(text, cache)
+        except Exception as exc:  # pragma: no cover
+            logger.warning("Translation failed for %s: %s", path, exc)
+            return None, None
+        if not translation_text or speech_dir is None or repeat_count <= 1:
+            return translation_text, None
+        speech_path = speech_dir / f"{position:05d}.wav"
+        try:
+            speak_text(translation_text, save_file=str(speech_path), play_audio_flag=False)
+        except Exception as exc:  # pragma: no cover
+            logger.warning("Pre-rendering translation speech failed for %s: %s", path, exc)
+            return translation_text, None
+        return translation_text, str(speech_path)
+
+    def _speak_translation(self, translation_text: str, speech_path: Optional[str]) -> None:
+        try:
+            if speech_path:
+                if self.play_audio_flag:
+                    play_audio(speech_path, fs_multi=1.1, gain=1.5)
+            else:
+                speak_text(translation_text, play_audio_flag=self.play_audio_flag)
+        except Exception as exc:  # pragma: no cover
+            logger.warning("Speak translation failed: %s", exc)
+
+    @staticmethod
+    def _open_translation_cache(context: StepContext, params: Dict[str, Any]) -> Optional[TranslationCache]:
+        """
+        Resolve the shared translation cache for this session.
+
+        An explicit ``translation_cache`` path wins; otherwise the cache file sits
+        beside the chunk directory, so every asset under the same root shares it.
+        """
+        if not params.get("translate"):
+            return None
+        cache_path = params.get("translation_cache")
+        if not cache_path:
+            split_result = context.artifacts.get("split") or {}
+            target_dir = split_result.get("target_dir") if isinstance(split_result, dict) else None
+            chunks = context.artifacts.get("chunks") or []
+            if target_dir:
+                base_dir = Path(target_dir).parent
+            elif chunks:
+                base_dir = Path(chunks[0]).parent.parent
+            else:
+                base_dir = context.asset.resolved_path().parent
+            cache_path = base_dir / TranslationCache.FILE_NAME
+        return shared_translation_cache(cache_path)
+
+    def _translate(self, text: str, cache: Optional[TranslationCache] = None) -> Optional[str]:
         if not traslate_text:
             return None
         try:
-            return traslate_text(text)
+            return traslate_text(text, cache=cache)
         except Exception as exc:  # pragma: no cover
             raise Exception("Translation failed: %s", exc)
             return None
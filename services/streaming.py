@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import threading
+from typing import Generic, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class ArtifactStream(Generic[T]):
+    """
+    Append-only, thread-safe sequence that consumers can iterate while it grows.
+
+    A producer step (e.g. the splitter) appends items from a background thread
+    and finally calls ``close()`` — or ``fail()`` with the exception that stopped
+    it. Iterating blocks until the next item arrives, so a downstream step can
+    start on item 0 while later items are still being produced.
+    """
+
+    def __init__(self, expected: Optional[int] = None) -> None:
+        self.expected = expected
+        self._items: List[T] = []
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._cond = threading.Condition()
+
+    # ---------------------------------------------------------------- producer
+    def append(self, item: T) -> None:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Cannot append to a closed stream.")
+            self._items.append(item)
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def fail(self, error: BaseException) -> None:
+        with self._cond:
+            self._error = error
+            self._closed = True
+            self._cond.notify_all()
+
+    # ---------------------------------------------------------------- consumer
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def items(self) -> List[T]:
+        """Snapshot of the items produced so far."""
+        with self._cond:
+            return list(self._items)
+
+    def __iter__(self) -> Iterator[T]:
+        idx = 0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: idx < len(self._items) or self._closed)
+                if idx < len(self._items):
+                    item = self._items[idx]
+                elif self._error is not None:
+                    raise self._error
+                else:
+                    return
+            yield item
+            idx += 1
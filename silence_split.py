@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from logger import logger
+
+FULL_SCALE = 32768.0  # int16 的最大幅度，与 pydub 的 max_possible_amplitude 一致
+
+Range = Tuple[int, int]
+
+
+@dataclass
+class PcmBuffer:
+    """
+    Mono int16 PCM decoded from an audio source plus its per-millisecond energy.
+
+    ``samples`` is a read-only ``np.memmap`` over a spool file, so an hour-long
+    book never sits fully in RAM; ``frame_energy``/``frame_samples`` hold the
+    sum of squares and sample count of every 1 ms frame.
+    """
+
+    samples: np.ndarray
+    sample_rate: int
+    frame_energy: np.ndarray
+    frame_samples: np.ndarray
+    spool_path: Optional[Path] = None
+
+    @property
+    def duration_ms(self) -> int:
+        return int(self.frame_energy.shape[0])
+
+    @property
+    def dbfs(self) -> float:
+        return energy_dbfs(self.frame_energy, self.frame_samples)
+
+    def sample_range(self, start_ms: int, end_ms: int) -> np.ndarray:
+        start = (max(start_ms, 0) * self.sample_rate) // 1000
+        end = (min(end_ms, self.duration_ms) * self.sample_rate) // 1000
+        return self.samples[start:end]
+
+    def close(self) -> None:
+        """Release the memory map and delete the spool file."""
+        self.samples = np.empty(0, dtype=np.int16)
+        if self.spool_path is not None:
+            try:
+                self.spool_path.unlink()
+            except OSError:  # pragma: no cover
+                logger.warning("Failed to remove PCM spool file %s", self.spool_path)
+            self.spool_path = None
+
+    def __enter__(self) -> "PcmBuffer":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+# ---------------------------------------------------------------- decoding
+def decode_pcm(
+    source_path: Path | str,
+    sample_rate: Optional[int] = None,
+    *,
+    spool_dir: Optional[Path | str] = None,
+    block_seconds: int = 30,
+) -> PcmBuffer:
+    """
+    Decode ``source_path`` to mono int16 PCM in a single streamed ffmpeg pass.
+
+    Audio is read from ffmpeg's stdout in blocks of ``block_seconds``; each block
+    is appended to a spool file and reduced to 1 ms frame energies, so peak memory
+    is one block regardless of source length. The spool file is then memory-mapped
+    for slicing. ``sample_rate=None`` keeps the source rate.
+    """
+    rate = int(sample_rate or _probe_sample_rate(source_path))
+    cmd = [
+        "ffmpeg", "-nostdin", "-v", "error",
+        "-i", str(source_path),
+        "-f", "s16le", "-acodec", "pcm_s16le", "-ac", "1", "-ar", str(rate),
+        "pipe:1",
+    ]
+
+    block_bytes = rate * max(int(block_seconds), 1) * 2
+    spool = tempfile.NamedTemporaryFile(prefix="pcm_", suffix=".raw", dir=spool_dir, delete=False)
+    spool_path = Path(spool.name)
+    energies: List[np.ndarray] = []
+    counts: List[np.ndarray] = []
+    total_samples = 0
+    try:
+        with spool, subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE) as proc:
+            assert proc.stdout is not None
+            while True:
+                data = proc.stdout.read(block_bytes)
+                if not data:
+                    break
+                data = data[: len(data) - len(data) % 2]
+                block = np.frombuffer(data, dtype=np.int16)
+                spool.write(data)
+                energy, count = frame_energies(block, rate)
+                energies.append(energy)
+                counts.append(count)
+                total_samples += block.shape[0]
+            stderr = proc.stderr.read() if proc.stderr else b""
+            if proc.wait() != 0:
+                raise RuntimeError(
+                    f"ffmpeg failed to decode {source_path}: {stderr.decode(errors='ignore').strip()}"
+                )
+    except BaseException:
+        spool_path.unlink(missing_ok=True)
+        raise
+
+    if total_samples:
+        samples: np.ndarray = np.memmap(spool_path, dtype=np.int16, mode="r", shape=(total_samples,))
+    else:
+        samples = np.empty(0, dtype=np.int16)
+    return PcmBuffer(
+        samples=samples,
+        sample_rate=rate,
+        frame_energy=np.concatenate(energies) if energies else np.empty(0),
+        frame_samples=np.concatenate(counts) if counts else np.empty(0, dtype=np.int64),
+        spool_path=spool_path,
+    )
+
+
+def _probe_sample_rate(source_path: Path | str) -> int:
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "a:0",
+        "-show_entries", "stream=sample_rate",
+        "-of", "json",
+        str(source_path),
+    ]
+    output = subprocess.run(cmd, capture_output=True, check=True).stdout
+    streams = json.loads(output or b"{}").get("streams") or []
+    if not streams:
+        raise RuntimeError(f"No audio stream found in {source_path}")
+    return int(streams[0]["sample_rate"])
+
+
+# ---------------------------------------------------------------- analysis
+def frame_energies(samples: np.ndarray, sample_rate: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce PCM samples to per-millisecond (sum of squares, sample count).
+
+    ``samples`` must start on a millisecond boundary; blocks produced by
+    ``decode_pcm`` are whole seconds so consecutive calls stay aligned.
+    """
+    n = int(samples.shape[0])
+    if n == 0:
+        return np.empty(0), np.empty(0, dtype=np.int64)
+    n_frames = -(-n * 1000 // sample_rate)
+    starts = (np.arange(n_frames, dtype=np.int64) * sample_rate) // 1000
+    starts = starts[starts < n]
+    squared = np.square(samples, dtype=np.float64)
+    energy = np.add.reduceat(squared, starts)
+    count = np.diff(np.append(starts, n))
+    return energy, count
+
+
+def energy_dbfs(frame_energy: np.ndarray, frame_samples: np.ndarray) -> float:
+    total = float(np.sum(frame_samples))
+    if total <= 0:
+        return float("-inf")
+    rms = np.sqrt(float(np.sum(frame_energy)) / total)
+    if rms <= 0:
+        return float("-inf")
+    return float(20 * np.log10(rms / FULL_SCALE))
+
+
+def normalize_to_dbfs(samples: np.ndarray, target_dbfs: float) -> np.ndarray:
+    """
+    Apply a constant gain so the clip's RMS sits at ``target_dbfs``.
+
+    Mirrors ``AudioSegment.apply_gain(target - dBFS)``: the result is clipped
+    back into int16. Digital silence is returned unchanged.
+    """
+    energy = np.square(samples, dtype=np.float64)
+    if energy.size == 0:
+        return np.asarray(samples, dtype=np.int16)
+    current = energy_dbfs(np.array([energy.sum()]), np.array([energy.size]))
+    if current == float("-inf"):
+        return np.asarray(samples, dtype=np.int16)
+    gain = 10 ** ((float(target_dbfs) - current) / 20.0)
+    scaled = np.asarray(samples, dtype=np.float64) * gain
+    return np.clip(np.round(scaled), -FULL_SCALE, FULL_SCALE - 1).astype(np.int16)
+
+
+def detect_silence(
+    frame_energy: np.ndarray,
+    frame_samples: np.ndarray,
+    min_silence_len: int,
+    silence_thresh: float,
+) -> List[Range]:
+    """
+    Vectorised equivalent of ``pydub.silence.detect_silence`` with ``seek_step=1``.
+
+    Every ``min_silence_len`` ms window is scored via prefix sums over the frame
+    energies; windows whose RMS is at or below ``silence_thresh`` (dBFS) are
+    silent, and silent window starts closer than ``min_silence_len`` merge into
+    one range.
+    """
+    n = int(frame_energy.shape[0])
+    window = int(min_silence_len)
+    if window <= 0 or n < window:
+        return []
+
+    energy_cs = np.concatenate(([0.0], np.cumsum(frame_energy)))
+    count_cs = np.concatenate(([0], np.cumsum(frame_samples)))
+    window_energy = energy_cs[window:] - energy_cs[:-window]
+    window_count = np.maximum(count_cs[window:] - count_cs[:-window], 1)
+    window_rms = np.sqrt(np.maximum(window_energy, 0.0) / window_count)
+
+    thresh_amp = 0.0 if silence_thresh == float("-inf") else (10 ** (silence_thresh / 20.0)) * FULL_SCALE
+    silent_starts = np.flatnonzero(window_rms <= thresh_amp)
+    if silent_starts.size == 0:
+        return []
+
+    breaks = np.flatnonzero(np.diff(silent_starts) > window)
+    range_starts = silent_starts[np.concatenate(([0], breaks + 1))]
+    range_ends = silent_starts[np.concatenate((breaks, [silent_starts.size - 1]))] + window
+    return [(int(start), int(end)) for start, end in zip(range_starts, range_ends)]
+
+
+def detect_nonsilent(
+    frame_energy: np.ndarray,
+    frame_samples: np.ndarray,
+    min_silence_len: int,
+    silence_thresh: float,
+) -> List[Range]:
+    """Invert ``detect_silence`` the same way pydub does."""
+    total = int(frame_energy.shape[0])
+    silent = detect_silence(frame_energy, frame_samples, min_silence_len, silence_thresh)
+    if not silent:
+        return [(0, total)]
+    if silent[0] == (0, total):
+        return []
+
+    nonsilent: List[Range] = []
+    prev_end = 0
+    for start, end in silent:
+        nonsilent.append((prev_end, start))
+        prev_end = end
+    if silent[-1][1] != total:
+        nonsilent.append((prev_end, total))
+    if nonsilent and nonsilent[0] == (0, 0):
+        nonsilent.pop(0)
+    return nonsilent
+
+
+def split_ranges(
+    frame_energy: np.ndarray,
+    frame_samples: np.ndarray,
+    *,
+    min_silence_len: int,
+    silence_thresh: float,
+    keep_silence: int | bool = 100,
+) -> List[Range]:
+    """
+    Chunk boundaries (ms) matching ``pydub.silence.split_on_silence``.
+
+    Each non-silent range is padded by ``keep_silence`` ms on both sides; when
+    neighbouring paddings overlap the split point moves to their midpoint.
+    """
+    total = int(frame_energy.shape[0])
+    if isinstance(keep_silence, bool):
+        keep_silence = total if keep_silence else 0
+
+    ranges = [
+        [start - keep_silence, end + keep_silence]
+        for start, end in detect_nonsilent(frame_energy, frame_samples, min_silence_len, silence_thresh)
+    ]
+    for current, following in zip(ranges, ranges[1:]):
+        if following[0] < current[1]:
+            current[1] = (current[1] + following[0]) // 2
+            following[0] = current[1]
+    return [(max(start, 0), min(end, total)) for start, end in ranges]
+
+
+__all__ = [
+    "PcmBuffer",
+    "decode_pcm",
+    "frame_energies",
+    "energy_dbfs",
+    "normalize_to_dbfs",
+    "detect_silence",
+    "detect_nonsilent",
+    "split_ranges",
+]
@@ -1,27 +1,38 @@
 import os
+import queue
 import sys
-sys.path.append("D:/voice/")
-sys.path.append("D:/voice/VITStuning")
+import threading
+import time
+from dataclasses import dataclass
 from logger import logger
-import torch
 import re
 import numpy as np
-from torch import no_grad, LongTensor
-import VITStuning.commons
-import VITStuning.utils
-from VITStuning.models import SynthesizerTrn
-from VITStuning.text import text_to_sequence
-from audio_utils import write_audio, play_audio, format_folder_name
-from pydub import AudioSegment
-import sounddevice as sd
-import gradio
-import librosa
-
-vits_net_g = None
-vits_hps = None
-vits_speaker_ids = None
-tts_fn = None
-device = "cuda:0" if torch.cuda.is_available() else "cpu"
+from tts_cache import TTSCache
+
+# torch / VITStuning / librosa / sounddevice / soundfile 均在首次使用时才导入，
+# 仅导入本模块（例如 services.defaults）不会加载 torch
+VITS_ROOT = os.environ.get("VITS_ROOT", "D:/voice")
+VITS_MODEL_DIR = os.environ.get("VITS_MODEL_DIR", os.path.join(VITS_ROOT, "VITStuning", "OUTPUT_MODEL_SJL"))
+VITS_IDLE_SECONDS = float(os.environ.get("VITS_IDLE_SECONDS", "900"))  # 超过该时间未使用的模型会被释放
+
+# 合成结果缓存：同一段文本、音色、语言与语速只推理一次
+tts_cache = TTSCache(os.path.join(os.path.dirname(__file__), "speaking_files"))
+TTS_BATCH_SIZE = int(os.environ.get("TTS_BATCH_SIZE", "8"))  # <=1 时逐段推理
+
+
+@dataclass(frozen=True)
+class VoiceSpec:
+    speaker: str
+    speed: float = 0.9
+    config_path: str = os.path.join(VITS_MODEL_DIR, "config.json")
+    checkpoint_path: str = os.path.join(VITS_MODEL_DIR, "G_latest.pth")
+
+
+# role_id -> 音色；同一 checkpoint 的不同说话人共享一份已加载的模型
+VOICES = {
+    0: VoiceSpec(speaker="QD"),
+    1: VoiceSpec(speaker="shen"),
+}
 
 language_marks = {
     "Japanese": "",
@@ -31,15 +42,42 @@ language_marks = {
     "Mix": "",
 }
 lang = ['日本語', '简体中文', 'English', 'Mix']
+
+
+def _import_vits():
+    if VITS_ROOT not in sys.path:
+        sys.path.append(VITS_ROOT)
+        sys.path.append(os.path.join(VITS_ROOT, "VITStuning"))
+    import VITStuning.commons
+    import VITStuning.utils
+    return VITStuning
+
+
+_device = None
+
+
+def get_device():
+    global _device
+    if _device is None:
+        import torch
+        _device = "cuda:0" if torch.cuda.is_available() else "cpu"
+    return _device
+
+
 def get_text(text, hps, is_symbol):
+    from torch import LongTensor
+    from VITStuning.text import text_to_sequence
     text_norm = text_to_sequence(text, hps.symbols, [] if is_symbol else hps.data.text_cleaners)
     if hps.data.add_blank:
-        text_norm = VITStuning.commons.intersperse(text_norm, 0)
+        text_norm = _import_vits().commons.intersperse(text_norm, 0)
     text_norm = LongTensor(text_norm)
     return text_norm
 
 
 def create_tts_fn(model, hps, speaker_id, speed = 0.8):
+    from torch import no_grad, LongTensor
+    device = get_device()
+
     def tts_fn(text, language = "简体中文"):
         """
         :param text: 输入的文本
@@ -60,43 +98,150 @@ def create_tts_fn(model, hps, speaker_id, speed = 0.8):
         del stn_tst, x_tst, x_tst_lengths, sid
         return "Success", (hps.data.sampling_rate, audio)
 
+    tts_fn.batch = create_batch_tts_fn(model, hps, speaker_id, speed)
     return tts_fn
 
 
+def create_batch_tts_fn(model, hps, speaker_id, speed = 0.8, batch_size = TTS_BATCH_SIZE):
+    import torch
+    from torch import no_grad, LongTensor
+    device = get_device()
+
+    def tts_batch_fn(texts, language = "简体中文"):
+        """
+        批量合成：多段文本补齐后一次 model.infer，再按每条预测的帧数切回各自的音频。
+        :param texts: 文本列表
+        :param language: 语言名称
+        :return: 与 texts 一一对应的 ("Success", (sr, audio)) 列表
+        """
+        mark = language_marks[language] if language is not None else ""
+        sequences = [get_text(mark + text + mark, hps, False) for text in texts]
+        results = [None] * len(sequences)
+        # 按长度排序后分批，减少补齐带来的无效计算
+        order = sorted(range(len(sequences)), key=lambda i: sequences[i].size(0))
+        hop_length = hps.data.hop_length
+        for start in range(0, len(order), max(1, int(batch_size))):
+            batch = order[start:start + max(1, int(batch_size))]
+            lengths = LongTensor([sequences[i].size(0) for i in batch])
+            x = torch.zeros((len(batch), int(lengths.max())), dtype=torch.long)
+            for row, i in enumerate(batch):
+                x[row, :sequences[i].size(0)] = sequences[i]
+            with no_grad():
+                sid = LongTensor([speaker_id] * len(batch)).to(device)
+                o, _, y_mask, _ = model.infer(x.to(device), lengths.to(device), sid=sid, noise_scale=.667,
+                                              noise_scale_w=0.8, length_scale=1.0 / speed)
+                frames = y_mask.sum(dim=(1, 2)).long().cpu().tolist()
+                audio = o[:, 0].data.cpu().float().numpy()
+            for row, i in enumerate(batch):
+                n_samples = min(int(frames[row]) * hop_length, audio.shape[1])
+                results[i] = ("Success", (hps.data.sampling_rate, audio[row, :n_samples].copy()))
+            del x, lengths, sid, o, y_mask
+        return results
+
+    return tts_batch_fn
+
+
+def load_vits_model(config_path, checkpoint_path):
+    """加载一个 VITS checkpoint，返回 (net_g, hps)。"""
+    vits = _import_vits()
+    from VITStuning.models import SynthesizerTrn
+    hps = vits.utils.get_hparams_from_file(config_path = config_path)
+
+    net_g = SynthesizerTrn(
+        len(hps.symbols),
+        hps.data.filter_length // 2 + 1,
+        hps.train.segment_size // hps.data.hop_length,
+        n_speakers=hps.data.n_speakers,
+        **hps.model).to(get_device())
+    _ = net_g.eval()
+
+    _ = vits.utils.load_checkpoint(checkpoint_path, net_g, None)
+    logger.info("Loaded VITS checkpoint %s (speakers: %s)", checkpoint_path, list(hps.speakers.keys()))
+    return net_g, hps
+
+
+class VoicePool:
+    """
+    按 checkpoint 缓存已加载的 VITS 模型，按 role_id 缓存绑定了说话人与语速的 tts_fn。
+
+    同一 checkpoint 的多个音色共用一份模型，切换音色无需重新加载；超过
+    ``idle_seconds`` 未使用的模型在下次取用时被释放。
+    """
+
+    def __init__(self, voices, idle_seconds = VITS_IDLE_SECONDS, loader = load_vits_model):
+        self.voices = voices
+        self.idle_seconds = float(idle_seconds)
+        self._loader = loader
+        self._lock = threading.RLock()
+        self._models = {}      # (config_path, checkpoint_path) -> (net_g, hps)
+        self._fns = {}         # role_id -> tts_fn
+        self._last_used = {}   # (config_path, checkpoint_path) -> time.monotonic()
+
+    def spec(self, role_id):
+        try:
+            return self.voices[role_id]
+        except KeyError:
+            raise ValueError("No voice configured for role_id {}".format(role_id))
+
+    def get(self, role_id = 0):
+        spec = self.spec(role_id)
+        model_key = (spec.config_path, spec.checkpoint_path)
+        with self._lock:
+            self.evict_idle(keep = model_key)
+            self._last_used[model_key] = time.monotonic()
+            tts_fn = self._fns.get(role_id)
+            if tts_fn is not None:
+                return tts_fn
+            if model_key not in self._models:
+                self._models[model_key] = self._loader(spec.config_path, spec.checkpoint_path)
+            net_g, hps = self._models[model_key]
+            tts_fn = create_tts_fn(net_g, hps, hps.speakers[spec.speaker], spec.speed)
+            self._fns[role_id] = tts_fn
+            return tts_fn
+
+    def warm_up(self, role_ids = None, synthesize = False):
+        """提前加载指定音色（默认全部）；synthesize=True 时再跑一次短句推理预热计算图。"""
+        for role_id in (self.voices.keys() if role_ids is None else role_ids):
+            tts_fn = self.get(role_id)
+            if synthesize:
+                tts_fn("你好。")
+
+    def loaded(self):
+        with self._lock:
+            return list(self._models.keys())
+
+    def evict_idle(self, keep = None):
+        """释放超过 idle_seconds 未使用的模型，返回释放数量。"""
+        if self.idle_seconds <= 0:
+            return 0
+        now = time.monotonic()
+        with self._lock:
+            stale = [key for key, used in self._last_used.items()
+                     if key != keep and key in self._models and now - used > self.idle_seconds]
+            for key in stale:
+                self._release(key)
+            return len(stale)
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._models.keys()):
+                self._release(key)
+
+    def _release(self, model_key):
+        self._models.pop(model_key, None)
+        self._last_used.pop(model_key, None)
+        for role_id in [r for r in self._fns if (self.voices[r].config_path, self.voices[r].checkpoint_path) == model_key]:
+            self._fns.pop(role_id, None)
+        logger.info("Released idle VITS model %s", model_key[1])
+        if "torch" in sys.modules and sys.modules["torch"].cuda.is_available():
+            sys.modules["torch"].cuda.empty_cache()
+
+
+voice_pool = VoicePool(VOICES)
+
+
 def create_model(role_id = 0):
-    roles = ["QD", "shen"]
-    speeds = [0.9, 0.9, 1.0]
-    rint = role_id#randint(100)
-    # if rint == 0:
-        # config_dir = "D:/voice/VITStuning/OUTPUT_MODEL/config.json"
-        # model_dir = "D:/voice/VITStuning/OUTPUT_MODEL/G_latest.pth"
-    config_dir = "D:/voice/VITStuning/OUTPUT_MODEL_SJL/config.json"
-    model_dir = "D:/voice/VITStuning/OUTPUT_MODEL_SJL/G_latest.pth"
-    # elif rint == 1:
-    #     config_dir = "D:/voice/VITStuning/OUTPUT_MODEL-M/config.json"
-    #     model_dir = "D:/voice/VITStuning/OUTPUT_MODEL-M/G_latest.pth"
-    # else:
-    #     raise ValueError("No model found")
-
-    global vits_net_g, vits_hps, vits_speaker_ids
-    vits_hps = VITStuning.utils.get_hparams_from_file(config_path = config_dir)
-
-    vits_net_g = SynthesizerTrn(
-        len(vits_hps.symbols),
-        vits_hps.data.filter_length // 2 + 1,
-        vits_hps.train.segment_size // vits_hps.data.hop_length,
-        n_speakers=vits_hps.data.n_speakers,
-        **vits_hps.model).to(device)
-    _ = vits_net_g.eval()
-
-    _ = VITStuning.utils.load_checkpoint(model_dir, vits_net_g, None)
-    vits_speaker_ids = vits_hps.speakers
-    speakers = list(vits_hps.speakers.keys())
-    speaker_id = vits_speaker_ids[roles[rint]]
-    print("speakers: ", speakers, speaker_id)
-    speed = speeds[rint]
-    tts_fn = create_tts_fn(vits_net_g, vits_hps, speaker_id, speed)
-    return tts_fn
+    return voice_pool.get(role_id)
 
 
 def api_text_to_speech(text, speech_file_path):
@@ -164,86 +309,211 @@ def split_text_by_period(text, length=200):
 
 
 # ===== 工具函数 =====
-def _bytes_wav_to_segment(wav_bytes: bytes) -> AudioSegment:
-    return AudioSegment.from_file(io.BytesIO(wav_bytes), format="wav")
-
-def _ndarray_to_segment(y: np.ndarray, sr: int) -> AudioSegment:
-    """假设 y 为 float32 [-1,1] 或 int16，单声道或多声道均可。"""
-    if y.dtype != np.int16:
-        y16 = np.clip(y, -1.0, 1.0)
-        y16 = (y16 * 32767.0).astype(np.int16)
-    else:
-        y16 = y
-    channels = 1 if y16.ndim == 1 else y16.shape[1]
-    raw = y16.tobytes(order="C")
-    return AudioSegment(
-        data=raw,
-        sample_width=2,
-        frame_rate=sr,
-        channels=channels,
-    )
+def _load_wav(path):
+    """wav 文件 -> (sr, float32[-1,1] 单声道 ndarray)"""
+    import soundfile as sf
+    y, sr = sf.read(path, dtype="float32", always_2d=True)
+    return sr, y.mean(axis=1) if y.shape[1] > 1 else y[:, 0]
+
+
+def _concat_audio(parts):
+    """
+    把多段 (sr, ndarray) 一次性写入预分配的缓冲区，避免 AudioSegment += 的反复拷贝。
+    采样率以第一段为准，个别不一致的段落先重采样。
+    """
+    if not parts:
+        return None, np.zeros(0, dtype=np.float32)
+    sr = int(parts[0][0])
+    arrays = []
+    for part_sr, y in parts:
+        y = np.asarray(y, dtype=np.float32).reshape(-1)
+        if int(part_sr) != sr:
+            import librosa
+            y = librosa.resample(y, orig_sr=int(part_sr), target_sr=sr)
+        arrays.append(y)
+    combined = np.empty(sum(a.shape[0] for a in arrays), dtype=np.float32)
+    offset = 0
+    for y in arrays:
+        combined[offset:offset + y.shape[0]] = y
+        offset += y.shape[0]
+    return sr, combined
 
-def _segment_to_array(seg: AudioSegment):
-    """AudioSegment -> (sr, float32[-1,1] ndarray)"""
-    samples = np.array(seg.get_array_of_samples())
-    if seg.channels > 1:
-        samples = samples.reshape((-1, seg.channels))
-    y = samples.astype(np.float32) / (2 ** (8 * seg.sample_width - 1))
-    return seg.frame_rate, y
 
 def _play_array(y: np.ndarray, sr: int, speed: float = 1.0, gain: float = 1.0):
+    import sounddevice as sd
     y = (y.astype(np.float32) * float(gain))
     y = np.clip(y, -1.0, 1.0)
     sd.play(y, int(sr * float(speed)), blocking=True)
 
 
+def _chunk_key(chunk, language, role_id, use_api):
+    backend = "api" if use_api else "vits"
+    speed = 1.0 if use_api else voice_pool.spec(role_id).speed
+    return tts_cache.make_key(chunk, role_id, language, speed, backend=backend)
+
 
-def speak_text(text,  language = "简体中文", role_id = 0, save_file = "file_trim_5s.wav", play_audio_flag = True, use_api = False):
-    global tts_fn
-    if not tts_fn:
-        tts_fn = create_model(role_id = role_id)
+def prerender_texts(texts, language = "简体中文", role_id = 0, batch_size = TTS_BATCH_SIZE):
+    """
+    批量预渲染：把 texts 中尚未缓存的段落分批合成写入 tts_cache，返回 (sr, ndarray) 列表。
+    合成失败的段落对应位置为 None。
+    """
+    tts_fn = voice_pool.get(role_id)
+    keys = [_chunk_key(text, language, role_id, False) for text in texts]
+    parts = [None] * len(texts)
+    missing = []
+    for idx, key in enumerate(keys):
+        chunk_path = tts_cache.lookup(key)
+        if chunk_path is not None:
+            parts[idx] = _load_wav(chunk_path)
+        else:
+            missing.append(idx)
+    if not missing:
+        return parts
+
+    batch_fn = getattr(tts_fn, "batch", None)
+    if batch_fn is not None and batch_size > 1 and len(missing) > 1:
+        results = batch_fn([texts[idx] for idx in missing], language)
+    else:
+        results = [tts_fn(texts[idx], language) for idx in missing]
+    for idx, (result, audio) in zip(missing, results):
+        if result != "Success":
+            logger.info("生成语音失败: {}".format(result))
+            continue
+        tts_cache.store(keys[idx], audio)
+        parts[idx] = audio
+    logger.info("prerender_texts synthesised %s/%s chunks", len(missing), len(texts))
+    return parts
+
+
+def _synthesize_chunks(text, language = "简体中文", role_id = 0, use_api = False):
+    """
+    逐段合成（优先命中 tts_cache），返回每段的 (sr, float32 ndarray)，全程不经过临时 wav。
+    VITS 未命中的段落走批量推理。
+    """
+    if use_api or TTS_BATCH_SIZE <= 1:
+        return list(_iter_synthesized_chunks(text, language, role_id, use_api))
+    parts = prerender_texts(split_text_by_period(text), language, role_id)
+    return [part for part in parts if part is not None]
+
+
+def _iter_synthesized_chunks(text, language = "简体中文", role_id = 0, use_api = False):
+    """按段落顺序逐个产出 (sr, ndarray)，供流式播放边合成边消费。"""
+    tts_fn = None if use_api else voice_pool.get(role_id)
 
     # 分割文本为200字左右的段落
     text_chunks = split_text_by_period(text)
 
-    # 生成临时音频文件
-    temp_files = []
-    base_dir = os.path.join(os.path.dirname(__file__), "speaking_files")
-    os.makedirs(base_dir, exist_ok=True)
     for idx, chunk in enumerate(text_chunks):
-        chunk_path = os.path.join(base_dir, f"{format_folder_name(chunk)}.wav")
-        print("speak_text:", chunk_path)
-        # 根据需要设置输入参数的值
-        # text, speaker, language, speed = "你好，世界！", "rosalia", '简体中文', 1.0
-        if not use_api:
-            fs_multi = 1.1
-            gain = 1.5
-            if not os.path.exists(chunk_path):
-                result, audio = tts_fn(chunk, language)
-                if result == "Success":
-                    write_audio(chunk_path, audio)
-                else:
-                    logger.info("生成语音失败: {}".format(result))
+        key = _chunk_key(chunk, language, role_id, use_api)
+        chunk_path = tts_cache.lookup(key)
+        if chunk_path is not None:
+            part = _load_wav(chunk_path)
+        elif not use_api:
+            result, audio = tts_fn(chunk, language)
+            if result != "Success":
+                logger.info("生成语音失败: {}".format(result))
+                continue
+            tts_cache.store(key, audio)
+            part = audio
         else:
-            fs_multi = 1.1
-            gain=1.5
-            if not os.path.exists(chunk_path):
-                api_text_to_speech(chunk, chunk_path)
-        temp_files.append(chunk_path)
-
-    # 合并音频文件
-    combined_audio = AudioSegment.empty()
-    for tf in temp_files:
-        combined_audio += AudioSegment.from_wav(tf)
-    combined_audio.export(save_file, format="wav")
-
-    # # 清理临时文件
-    for tf in temp_files:
-        os.remove(tf)
-
-    # 根据参数决定是否播放最终音频
+            api_path = str(tts_cache.path_for(key)) + ".api.tmp"
+            api_text_to_speech(chunk, api_path)
+            part = _load_wav(tts_cache.store_file(key, api_path))
+        logger.info("speak_text chunk %s/%s ready", idx + 1, len(text_chunks))
+        yield part
+
+
+def speak_text(text,  language = "简体中文", role_id = 0, save_file = "file_trim_5s.wav", play_audio_flag = True, use_api = False, stream = False):
+    fs_multi = 1.1
+    gain = 1.5
+    if stream and play_audio_flag:
+        # 长文本：第一段合成完即开始播放
+        return speak_text_stream(text, language, role_id, save_file=save_file, use_api=use_api,
+                                 fs_multi=fs_multi, gain=gain)
+    sr, audio = _concat_audio(_synthesize_chunks(text, language, role_id, use_api))
+    if sr is None:
+        logger.info("没有可播放的语音: {}".format(text[:50]))
+        return None, audio
+
+    # 拼接结果只写一次；播放直接使用内存中的数组
+    if save_file:
+        import soundfile as sf
+        sf.write(save_file, audio, sr)
     if play_audio_flag:
-        play_audio(save_file, fs_multi=fs_multi, gain=gain)
+        _play_array(audio, sr, speed=fs_multi, gain=gain)
+    return sr, audio
+
+
+def speak_text_stream(
+    text,
+    language="简体中文",
+    role_id=0,
+    save_file=None,
+    use_api=False,
+    fs_multi=1.1,
+    gain=1.5,
+    lookahead=2,
+):
+    """
+    流式朗读：后台线程合成第 N+1 段的同时，前台用 sounddevice 播放第 N 段。
+    队列最多预存 lookahead 段，段间停顿至多为下一段尚未完成的合成时间；
+    save_file 不为空时，全部播放完后把已播放的音频一次性写出。
+    返回 (sr, float32 ndarray)。
+    """
+    done = object()
+    pending = queue.Queue(maxsize=max(1, int(lookahead)))
+    stop = threading.Event()
+    errors = []
+
+    def _put(item):
+        while not stop.is_set():
+            try:
+                pending.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce():
+        try:
+            for part in _iter_synthesized_chunks(text, language, role_id, use_api):
+                if not _put(part):
+                    return
+        except Exception as exc:  # pragma: no cover
+            errors.append(exc)
+        finally:
+            _put(done)
+
+    worker = threading.Thread(target=_produce, name="tts-stream", daemon=True)
+    worker.start()
+
+    played = []
+    max_gap = 0.0
+    started = time.monotonic()
+    try:
+        while True:
+            waited_from = time.monotonic()
+            part = pending.get()
+            if part is done:
+                break
+            if played:
+                max_gap = max(max_gap, time.monotonic() - waited_from)
+            else:
+                logger.info("speak_text_stream first audio after %.2fs", time.monotonic() - started)
+            played.append(part)
+            _play_array(np.asarray(part[1]), int(part[0]), speed=fs_multi, gain=gain)
+    finally:
+        stop.set()
+        worker.join()
+    if errors:
+        raise errors[0]
+    logger.info("speak_text_stream played %s chunks, max gap %.2fs", len(played), max_gap)
+
+    sr, audio = _concat_audio(played)
+    if save_file and sr is not None:
+        import soundfile as sf
+        sf.write(save_file, audio, sr)
+    return sr, audio
 
 
 # ===== 主函数：纯内存拼接 & 播放 =====
@@ -257,51 +527,12 @@ def speak_text_nofile(
     gain=1.0,      # 音量倍数
 ):
     """
-    纯内存：不写入任何临时 wav 文件。目前转文本有问题
-    需要：
-      - tts_fn(chunk, language) -> ("Success", <numpy 或 wav bytes 或 (sr, np.ndarray)>)
-      - 若 use_api=True，建议提供 api_text_to_speech_bytes(text) -> wav bytes
+    纯内存：不写出拼接后的 wav，返回 (sr, float32 ndarray) 以便后续处理。
     """
-    global tts_fn
-    if not tts_fn:
-        tts_fn = create_model(role_id=role_id)
-
-    chunks = split_text_by_period(text)
-    combined = AudioSegment.silent(duration=0)
-
-    for chunk in chunks:
-        # === 生成分段音频到内存 ===
-        if not use_api:
-            result, audio = tts_fn(chunk, language)
-            if result != "Success":
-                logger.info(f"生成语音失败: {result}")
-                continue
-
-            # 统一转为 AudioSegment
-            if isinstance(audio, (bytes, bytearray)):
-                seg = _bytes_wav_to_segment(bytes(audio))
-            elif isinstance(audio, tuple) and len(audio) == 2 and isinstance(audio[0], int):
-                # (sr, ndarray)
-                sr, y = audio
-                seg = _ndarray_to_segment(np.asarray(y), sr)
-            elif isinstance(audio, np.ndarray):
-                # 需要你在 tts_fn 中同时返回 sr，若没有，可设一个默认 sr
-                raise ValueError("tts_fn 返回 ndarray 需要同时提供采样率 sr")
-            else:
-                raise TypeError("无法识别 tts_fn 的返回音频类型")
-        else:
-            # 建议提供返回 bytes 的 API
-            wav_bytes = api_text_to_speech_bytes(chunk)  # 需要你实现：返回 WAV bytes
-            seg = _bytes_wav_to_segment(wav_bytes)
-
-        # === 拼接分段 ===
-        combined += seg
-
-    if play_audio_flag and len(combined) > 0:
-        sr, y = _segment_to_array(combined)
-        _play_array(y, sr, speed=fs_multi, gain=gain)
-
-    return combined  # 如需后续再处理，可把合成后的 AudioSegment 返回
+    sr, audio = _concat_audio(_synthesize_chunks(text, language, role_id, use_api))
+    if play_audio_flag and sr is not None and audio.size > 0:
+        _play_array(audio, sr, speed=fs_multi, gain=gain)
+    return sr, audio
 
 if __name__=="__main__":
     base_dir = "D:\\story_pictures\\kehuanshijie\\precessed_txt"
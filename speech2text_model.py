@@ -1,14 +1,27 @@
 from __future__ import annotations
 
 import os
+import sys
+import threading
 import time
-from typing import Dict, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
-import whisper
+import numpy as np
 from logger import logger
 
+if TYPE_CHECKING:  # whisper 会拉起 torch，仅在首次识别时导入
+    import whisper
+
+DEFAULT_PROMPT = "以下为简单的英文句子"
+WHISPER_MEMORY_MB = float(os.environ.get("WHISPER_MEMORY_MB", "2048"))  # 常驻 Whisper 模型的内存上限
+WHISPER_IDLE_SECONDS = float(os.environ.get("WHISPER_IDLE_SECONDS", "900"))  # 超过该时间未使用的模型会被释放
+
+# 加载前用于腾挪空间的 fp32 权重估算（MB），加载后以实际参数大小为准
+_ESTIMATED_MB = {"tiny": 150, "base": 290, "small": 970, "medium": 3060, "large": 6170, "turbo": 3240}
+
 asr = None
-_whisper_cache: Dict[Tuple[str, str], whisper.Whisper] = {}
 
 
 def speech_to_text_old(audio_file: str):
@@ -26,12 +39,125 @@ def speech_to_text_old(audio_file: str):
     return result
 
 
-def speech_to_text(audio_file: str, model_size: str = "small", device: str | None = None) -> str:
-    model = _get_whisper_model(model_size, device)
-    result = model.transcribe(audio_file, initial_prompt="以下为简单的英文句子")
-    text = (
-        "".join([segment["text"] for segment in result["segments"] if segment is not None])
-        .strip()
+def speech_to_text(
+    audio_file: str,
+    model_size: str = "small",
+    device: str | None = None,
+    initial_prompt: str | None = DEFAULT_PROMPT,
+    backend: str = "whisper",
+) -> str:
+    engine = get_backend(backend)
+    model = _get_whisper_model(model_size, device, engine.name)
+    with _model_lock(model_size, device, engine.name):
+        text = clean_text(engine.transcribe(model, audio_file, initial_prompt))
+    logger.info("speech_to_text(%s, %s): %s", engine.name, model_size, text)
+    return text
+
+
+def speech_to_text_segments(
+    audio_file: str,
+    model_size: str = "small",
+    device: str | None = None,
+    initial_prompt: str | None = DEFAULT_PROMPT,
+    backend: str = "whisper",
+    word_timestamps: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    整段识别并返回带时间戳的片段 ``{"start", "end", "text"[, "words"]}``（单位秒）。
+
+    长音频一次解码，前后文连贯，也省去逐个切片加载与补齐 30s 窗口的开销；
+    ``word_timestamps=True`` 时每个片段附带词级时间戳。文本未做清洗。
+    """
+    engine = get_backend(backend)
+    model = _get_whisper_model(model_size, device, engine.name)
+    t1 = time.time()
+    with _model_lock(model_size, device, engine.name):
+        segments = engine.transcribe_segments(model, audio_file, initial_prompt, word_timestamps)
+    logger.info(
+        "speech_to_text_segments(%s, %s): %d segments in %.2fs", engine.name, model_size, len(segments), time.time() - t1
+    )
+    return segments
+
+
+def speech_to_text_batch(
+    audio_files: Sequence[str],
+    model_size: str = "small",
+    device: str | None = None,
+    batch_size: int = 16,
+    initial_prompt: str | None = DEFAULT_PROMPT,
+    backend: str = "whisper",
+) -> List[str]:
+    """
+    批量识别多个短音频：按批次加载波形、逐条补齐到 30s 窗口并计算 log-mel，
+    堆叠后用一次 ``whisper.decode`` 前向完成整批解码。
+
+    超过 Whisper 单窗口长度或加载失败的音频单独回退到 ``speech_to_text``，
+    不影响同批其他文件。
+    返回的文本顺序与 ``audio_files`` 一致，清洗规则与单条识别相同。
+    不支持整批解码的后端（如 faster-whisper）逐条识别。
+    """
+    engine = get_backend(backend)
+    if not engine.supports_batch:
+        return [
+            speech_to_text(path, model_size=model_size, device=device, initial_prompt=initial_prompt, backend=engine.name)
+            for path in audio_files
+        ]
+
+    import torch
+    import whisper
+
+    model = _get_whisper_model(model_size, device, engine.name)
+    texts: List[str] = [""] * len(audio_files)
+    options = whisper.DecodingOptions(
+        task="transcribe",
+        prompt=initial_prompt,
+        without_timestamps=True,
+        fp16=model.device.type != "cpu",
+    )
+    n_mels = getattr(model.dims, "n_mels", 80)
+    batch_size = max(1, int(batch_size))
+
+    pending: List[Tuple[int, np.ndarray]] = []
+
+    def _decode_pending() -> None:
+        if not pending:
+            return
+        # log-mel 要逐条计算：整批计算时动态范围按全批最大值截断（max - 8），结果会与单条识别不同
+        mel = torch.stack(
+            [
+                whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), n_mels=n_mels, device=model.device)
+                for _, audio in pending
+            ]
+        )
+        with _model_lock(model_size, device, engine.name):
+            results = whisper.decode(model, mel, options)
+        for (idx, _), result in zip(pending, results):
+            texts[idx] = clean_text(result.text)
+        pending.clear()
+
+    for idx, path in enumerate(audio_files):
+        try:
+            audio = whisper.load_audio(path)
+        except Exception as exc:  # pragma: no cover
+            logger.warning("Batch load failed for %s, transcribing it alone: %s", path, exc)
+            audio = None
+        if audio is None or audio.shape[0] > whisper.audio.N_SAMPLES:
+            texts[idx] = speech_to_text(
+                path, model_size=model_size, device=device, initial_prompt=initial_prompt, backend=engine.name
+            )
+            continue
+        pending.append((idx, audio))
+        if len(pending) >= batch_size:
+            _decode_pending()
+    _decode_pending()
+
+    logger.info("speech_to_text_batch(%s, %s): %d files", engine.name, model_size, len(audio_files))
+    return texts
+
+
+def clean_text(text: str) -> str:
+    return (
+        text.strip()
         .replace("?", "")
         .replace("!", "")
         .replace(".", "")
@@ -39,22 +165,350 @@ def speech_to_text(audio_file: str, model_size: str = "small", device: str | Non
         .replace(";", "")
         .replace(":", "")
     )
-    logger.info("speech_to_text(%s): %s", model_size, text)
-    return text
 
 
-def _get_whisper_model(model_size: str, device: str | None) -> whisper.Whisper:
-    resolved_device = device or _default_device()
-    cache_key = (model_size, resolved_device)
-    if cache_key in _whisper_cache:
-        return _whisper_cache[cache_key]
+class WhisperBackend:
+    """openai-whisper 原始模型：GPU 上 fp16 解码，CPU 上 fp32。"""
 
-    t1 = time.time()
-    model = whisper.load_model(model_size, device=resolved_device)
-    duration = time.time() - t1
-    print(f"Whisper模型({model_size}, device={resolved_device})加载耗时：{duration:.2f}s")
-    _whisper_cache[cache_key] = model
-    return model
+    name = "whisper"
+    supports_batch = True  # 可用 whisper.decode 整批解码
+    size_ratio = 1.0  # 相对 fp32 权重的内存占用
+
+    def default_device(self) -> str:
+        return _default_device()
+
+    def load(self, model_size: str, device: str) -> Any:
+        import whisper
+
+        return whisper.load_model(model_size, device=device)
+
+    def transcribe(self, model: Any, audio_file: str, initial_prompt: Optional[str]) -> str:
+        result = model.transcribe(audio_file, initial_prompt=initial_prompt, fp16=model.device.type != "cpu")
+        return "".join(segment["text"] for segment in result["segments"] if segment is not None)
+
+    def transcribe_segments(
+        self, model: Any, audio_file: str, initial_prompt: Optional[str], word_timestamps: bool
+    ) -> List[Dict[str, Any]]:
+        result = model.transcribe(
+            audio_file,
+            initial_prompt=initial_prompt,
+            fp16=model.device.type != "cpu",
+            word_timestamps=word_timestamps,
+        )
+        segments: List[Dict[str, Any]] = []
+        for segment in result["segments"]:
+            item = {"start": segment["start"], "end": segment["end"], "text": segment["text"]}
+            if word_timestamps:
+                item["words"] = [
+                    {"start": word["start"], "end": word["end"], "word": word["word"]} for word in segment.get("words", [])
+                ]
+            segments.append(item)
+        return segments
+
+    def estimate_bytes(self, model_size: str) -> int:
+        return int(_ESTIMATED_MB.get(model_size, 0) * 1024 * 1024 * self.size_ratio)
+
+    def model_bytes(self, model: Any) -> int:
+        return _model_bytes(model)
+
+
+class QuantizedWhisperBackend(WhisperBackend):
+    """
+    对 Whisper 的全部 Linear 层做 int8 动态量化，只在 CPU 上运行。
+
+    解码流程与 ``WhisperBackend`` 完全相同（包括整批解码），只是矩阵乘法走
+    int8 kernel，CPU 上明显快于 fp32 且内存约为原来的三分之一。
+    """
+
+    name = "whisper-int8"
+    size_ratio = 0.35  # 词嵌入与卷积层仍为 fp32
+
+    def default_device(self) -> str:
+        return "cpu"
+
+    def load(self, model_size: str, device: str) -> Any:
+        import torch
+
+        if device != "cpu":
+            logger.warning("%s only runs on CPU; ignoring device=%s", self.name, device)
+        model = super().load(model_size, "cpu")
+        _use_plain_linear(model)
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8).eval()
+
+    def model_bytes(self, model: Any) -> int:
+        packed = 0
+        for module in model.modules():
+            weight = getattr(module, "weight", None)
+            if callable(weight):  # 动态量化后的 Linear 以 weight() 返回打包的 int8 权重
+                packed += weight().numel()
+        return _model_bytes(model) + packed
+
+
+class FasterWhisperBackend:
+    """CTranslate2 运行时（faster-whisper），CPU 默认 int8、GPU 默认 float16。"""
+
+    name = "faster-whisper"
+    supports_batch = False
+    size_ratio = 0.3
+
+    def __init__(self, compute_type: Optional[str] = None) -> None:
+        self.compute_type = compute_type or os.environ.get("FASTER_WHISPER_COMPUTE_TYPE")
+
+    def default_device(self) -> str:
+        return _default_device()
+
+    def load(self, model_size: str, device: str) -> Any:
+        from faster_whisper import WhisperModel
+
+        compute_type = self.compute_type or ("int8" if device == "cpu" else "float16")
+        return WhisperModel(model_size, device=device, compute_type=compute_type)
+
+    def transcribe(self, model: Any, audio_file: str, initial_prompt: Optional[str]) -> str:
+        # beam_size=1 与 openai-whisper transcribe 的默认贪心解码保持一致
+        segments, _ = model.transcribe(audio_file, initial_prompt=initial_prompt, beam_size=1)
+        return "".join(segment.text for segment in segments)
+
+    def transcribe_segments(
+        self, model: Any, audio_file: str, initial_prompt: Optional[str], word_timestamps: bool
+    ) -> List[Dict[str, Any]]:
+        segments, _ = model.transcribe(
+            audio_file, initial_prompt=initial_prompt, beam_size=1, word_timestamps=word_timestamps
+        )
+        items: List[Dict[str, Any]] = []
+        for segment in segments:
+            item: Dict[str, Any] = {"start": segment.start, "end": segment.end, "text": segment.text}
+            if word_timestamps:
+                item["words"] = [{"start": word.start, "end": word.end, "word": word.word} for word in segment.words or []]
+            items.append(item)
+        return items
+
+    def estimate_bytes(self, model_size: str) -> int:
+        return int(_ESTIMATED_MB.get(model_size, 0) * 1024 * 1024 * self.size_ratio)
+
+    def model_bytes(self, model: Any) -> int:
+        return 0  # 权重在 CTranslate2 内部，无法统计，沿用估算值
+
+
+STT_BACKENDS: Dict[str, Any] = {
+    backend.name: backend for backend in (WhisperBackend(), QuantizedWhisperBackend(), FasterWhisperBackend())
+}
+
+
+def get_backend(name: str) -> Any:
+    try:
+        return STT_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown STT backend '{name}'. Available: {', '.join(STT_BACKENDS)}") from None
+
+
+def _use_plain_linear(model: Any) -> None:
+    """Whisper 自带的 Linear 子类无法被 quantize_dynamic 识别，换成共享权重的 nn.Linear。"""
+    import torch
+
+    for parent in list(model.modules()):
+        for child_name, child in list(parent.named_children()):
+            if isinstance(child, torch.nn.Linear) and type(child) is not torch.nn.Linear:
+                plain = torch.nn.Linear(child.in_features, child.out_features, bias=child.bias is not None)
+                plain.weight = child.weight
+                plain.bias = child.bias
+                setattr(parent, child_name, plain)
+
+
+@dataclass
+class _Resident:
+    model: Any
+    bytes: int
+    load_seconds: float
+    last_used: float
+    hits: int = 0
+
+
+class WhisperPool:
+    """
+    按 (model_size, device, backend) 缓存已加载的 Whisper 模型。
+
+    所有常驻模型的参数内存合计不超过 ``memory_bytes``，超出时按最近最少使用
+    顺序释放；超过 ``idle_seconds`` 未使用的模型在下次取用时释放。``warm_up``
+    可在后台提前加载，首次识别不必再等待模型加载。
+    """
+
+    def __init__(
+        self,
+        memory_bytes: float = WHISPER_MEMORY_MB * 1024 * 1024,
+        idle_seconds: float = WHISPER_IDLE_SECONDS,
+        loader: Optional[Callable[[str, str, str], Any]] = None,
+    ) -> None:
+        self.memory_bytes = int(memory_bytes)
+        self.idle_seconds = float(idle_seconds)
+        self._loader = loader or _load_whisper
+        self._lock = threading.RLock()
+        self._models: "OrderedDict[Tuple[str, str, str], _Resident]" = OrderedDict()
+        # Whisper 解码会在模型上挂 kv-cache hook，同一模型不能被多个线程同时使用
+        self._use_locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+        self._load_locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+        self._counters = {"loads": 0, "hits": 0, "evictions": 0, "load_seconds": 0.0}
+
+    def get(self, model_size: str, device: Optional[str] = None, backend: str = "whisper") -> Any:
+        engine = get_backend(backend)
+        key = (model_size, device or engine.default_device(), engine.name)
+        with self._lock:
+            self.evict_idle(keep=key)
+            resident = self._touch(key)
+            if resident is not None:
+                return resident.model
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # 同一模型只加载一次：并发请求者在 load_lock 上等待首个加载完成
+        with load_lock:
+            with self._lock:
+                resident = self._touch(key)
+                if resident is not None:
+                    return resident.model
+                self._make_room(engine.estimate_bytes(model_size), keep=key)
+
+            t1 = time.perf_counter()
+            model = self._loader(*key)
+            duration = time.perf_counter() - t1
+            size = engine.model_bytes(model) or engine.estimate_bytes(model_size)
+            logger.info("Loaded %s %s on %s in %.2fs (%.0f MB)", key[2], key[0], key[1], duration, size / 1024 / 1024)
+
+            with self._lock:
+                self._models[key] = _Resident(model, size, duration, time.monotonic())
+                self._counters["loads"] += 1
+                self._counters["load_seconds"] += duration
+                self._make_room(0, keep=key)
+        return model
+
+    def lock(self, model_size: str, device: Optional[str] = None, backend: str = "whisper") -> threading.Lock:
+        engine = get_backend(backend)
+        key = (model_size, device or engine.default_device(), engine.name)
+        with self._lock:
+            return self._use_locks.setdefault(key, threading.Lock())
+
+    def warm_up(
+        self,
+        model_sizes: Iterable[str],
+        device: Optional[str] = None,
+        *,
+        backend: str = "whisper",
+        background: bool = True,
+    ) -> Optional[threading.Thread]:
+        """提前加载指定模型；background=True 时在守护线程中加载并返回该线程。"""
+        sizes = list(model_sizes)
+
+        def _load() -> None:
+            for model_size in sizes:
+                try:
+                    self.get(model_size, device, backend)
+                except Exception as exc:  # pragma: no cover
+                    logger.warning("Whisper warm-up for %s (%s) failed: %s", model_size, backend, exc)
+
+        if not background:
+            _load()
+            return None
+        thread = threading.Thread(target=_load, name="whisper-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def loaded(self) -> List[Tuple[str, str, str]]:
+        with self._lock:
+            return list(self._models.keys())
+
+    def metrics(self) -> Dict[str, Any]:
+        """加载耗时与常驻情况，供日志与界面展示。"""
+        now = time.monotonic()
+        with self._lock:
+            models = [
+                {
+                    "model_size": key[0],
+                    "device": key[1],
+                    "backend": key[2],
+                    "bytes": resident.bytes,
+                    "load_seconds": round(resident.load_seconds, 3),
+                    "hits": resident.hits,
+                    "idle_seconds": round(now - resident.last_used, 1),
+                }
+                for key, resident in self._models.items()
+            ]
+            return {
+                "resident_bytes": sum(item["bytes"] for item in models),
+                "budget_bytes": self.memory_bytes,
+                "models": models,
+                "loads": self._counters["loads"],
+                "hits": self._counters["hits"],
+                "evictions": self._counters["evictions"],
+                "load_seconds": round(self._counters["load_seconds"], 3),
+            }
+
+    def evict_idle(self, keep: Optional[Tuple[str, str, str]] = None) -> int:
+        """释放超过 idle_seconds 未使用的模型，返回释放数量。"""
+        if self.idle_seconds <= 0:
+            return 0
+        now = time.monotonic()
+        with self._lock:
+            stale = [key for key, resident in self._models.items()
+                     if key != keep and now - resident.last_used > self.idle_seconds]
+            for key in stale:
+                self._release(key, "idle")
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._models.keys()):
+                self._release(key, "clear")
+
+    def _touch(self, key: Tuple[str, str, str]) -> Optional[_Resident]:
+        resident = self._models.get(key)
+        if resident is not None:
+            resident.last_used = time.monotonic()
+            resident.hits += 1
+            self._counters["hits"] += 1
+            self._models.move_to_end(key)
+        return resident
+
+    def _make_room(self, incoming: int, keep: Tuple[str, str, str]) -> None:
+        """按 LRU 顺序释放模型，直到常驻内存加上 incoming 不超过预算（keep 始终保留）。"""
+        if self.memory_bytes <= 0:
+            return
+        for key in list(self._models.keys()):
+            resident_bytes = sum(resident.bytes for resident in self._models.values())
+            if resident_bytes + incoming <= self.memory_bytes:
+                break
+            if key != keep:
+                self._release(key, "memory budget")
+
+    def _release(self, key: Tuple[str, str, str], reason: str) -> None:
+        resident = self._models.pop(key, None)
+        if resident is None:
+            return
+        self._counters["evictions"] += 1
+        logger.info("Released %s %s on %s (%s, %.0f MB)", key[2], key[0], key[1], reason, resident.bytes / 1024 / 1024)
+        # 正在识别的线程仍持有模型引用，识别结束后才真正回收
+        if key[1].startswith("cuda") and "torch" in sys.modules:
+            sys.modules["torch"].cuda.empty_cache()
+
+
+def _load_whisper(model_size: str, device: str, backend: str) -> Any:
+    return get_backend(backend).load(model_size, device)
+
+
+def _model_bytes(model: Any) -> int:
+    try:
+        tensors = list(model.parameters()) + list(model.buffers())
+        return int(sum(tensor.numel() * tensor.element_size() for tensor in tensors))
+    except Exception:  # pragma: no cover
+        return 0
+
+
+whisper_pool = WhisperPool()
+
+
+def _get_whisper_model(model_size: str, device: str | None, backend: str = "whisper") -> whisper.Whisper:
+    return whisper_pool.get(model_size, device, backend)
+
+
+def _model_lock(model_size: str, device: str | None, backend: str = "whisper") -> threading.Lock:
+    return whisper_pool.lock(model_size, device, backend)
 
 
 def _default_device() -> str:
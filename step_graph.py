@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Sequence, Set
+
+from models.workflow import StepConfig
+
+
+class StepGraph:
+    """
+    Dependency graph between workflow steps built from ``inputs``/``outputs``.
+
+    Rules:
+        - A step that reads key ``k`` depends on the closest earlier step that
+          writes ``k``; a key with no earlier writer is read as external
+          (e.g. prefetched artifacts), even if a later step writes it.
+        - A step that writes ``k`` depends on every earlier step that reads or
+          writes ``k``, so it cannot overwrite a value still being consumed
+          or reorder with another writer.
+        - A step without declarations is a barrier: it waits for every earlier
+          step and every later step waits for it, which keeps legacy configs
+          strictly sequential.
+    """
+
+    def __init__(self, steps: Sequence[StepConfig]) -> None:
+        self.steps: List[StepConfig] = list(steps)
+        self._by_id: Dict[str, StepConfig] = {step.id: step for step in self.steps}
+        self.dependencies: Dict[str, Set[str]] = {step.id: set() for step in self.steps}
+        self._build()
+        self.order = self._topological_order()
+
+    @property
+    def declared(self) -> bool:
+        """True if any step opts into dependency scheduling."""
+        return any(step.declares_io() for step in self.steps)
+
+    def ready(self, done: Iterable[str], started: Iterable[str]) -> List[StepConfig]:
+        """Steps whose dependencies are all done and that have not started yet."""
+        done_set = set(done)
+        started_set = set(started)
+        return [
+            step
+            for step in self.order
+            if step.id not in started_set and self.dependencies[step.id] <= done_set
+        ]
+
+    def _build(self) -> None:
+        readers: Dict[str, List[int]] = {}
+        writers: Dict[str, List[int]] = {}
+        last_barrier: int | None = None
+        for idx, step in enumerate(self.steps):
+            deps = self.dependencies[step.id]
+            if not step.declares_io():
+                deps.update(prev.id for prev in self.steps[:idx])
+                last_barrier = idx
+                continue
+            if last_barrier is not None:
+                deps.add(self.steps[last_barrier].id)
+            for key in step.inputs:
+                if writers.get(key):
+                    deps.add(self.steps[writers[key][-1]].id)
+            for key in step.outputs:
+                # 写后读、写后写：覆盖 key 前要等之前所有读写过它的步骤完成
+                deps.update(self.steps[pos].id for pos in readers.get(key, []) + writers.get(key, []))
+            for key in step.inputs:
+                readers.setdefault(key, []).append(idx)
+            for key in step.outputs:
+                writers.setdefault(key, []).append(idx)
+        # 屏障步骤之后的所有步骤都需要等待屏障完成
+        for idx, step in enumerate(self.steps):
+            if step.declares_io():
+                continue
+            for later in self.steps[idx + 1:]:
+                self.dependencies[later.id].add(step.id)
+
+    def _topological_order(self) -> List[StepConfig]:
+        remaining = {step_id: set(deps) for step_id, deps in self.dependencies.items()}
+        order: List[StepConfig] = []
+        while remaining:
+            ready = [step.id for step in self.steps if step.id in remaining and not remaining[step.id]]
+            if not ready:
+                raise ValueError(f"Cyclic step dependencies detected: {sorted(remaining)}")
+            for step_id in ready:
+                order.append(self._by_id[step_id])
+                del remaining[step_id]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
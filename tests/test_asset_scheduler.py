@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from asset_scheduler import AssetScheduler
+
+
+class AssetSchedulerTestCase(unittest.TestCase):
+    def test_pops_lowest_priority_then_config_order(self) -> None:
+        counts = {"a": 1, "b": 0, "c": 0}
+        assets = [SimpleNamespace(id=asset_id) for asset_id in ("a", "b", "c")]
+        scheduler = AssetScheduler(assets, priority=lambda item: (counts[item.id],))
+
+        self.assertEqual([scheduler.pop().id for _ in range(3)], ["b", "c", "a"])
+        self.assertIsNone(scheduler.pop())
+        self.assertFalse(scheduler)
+
+    def test_push_reprioritises_and_balances_play_counts(self) -> None:
+        counts = {"a": 0, "b": 0, "c": 0}
+        assets = [SimpleNamespace(id=asset_id) for asset_id in counts]
+        scheduler = AssetScheduler(assets, priority=lambda item: (counts[item.id],))
+
+        played = []
+        for _ in range(7):
+            asset = scheduler.pop()
+            played.append(asset.id)
+            counts[asset.id] += 1
+            scheduler.push(asset)
+
+        self.assertEqual(played, ["a", "b", "c", "a", "b", "c", "a"])
+        self.assertEqual(len(scheduler), 3)
+        # 重复 push 只保留最新的优先级
+        counts["c"] = -1
+        scheduler.push(assets[2])
+        self.assertEqual(len(scheduler), 3)
+        self.assertEqual(scheduler.pop().id, "c")
+        self.assertEqual(len(scheduler), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from chunk_gate import classify
+
+
+SAMPLE_RATE = 16000
+
+
+def _tone(ms: int, freq: float = 220.0, amplitude: int = 8000) -> np.ndarray:
+    t = np.arange(SAMPLE_RATE * ms // 1000) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.int16)
+
+
+def _silence(ms: int) -> np.ndarray:
+    return np.zeros(SAMPLE_RATE * ms // 1000, dtype=np.int16)
+
+
+class ChunkGateTestCase(unittest.TestCase):
+    def test_routes_by_duration(self) -> None:
+        short = classify(np.concatenate([_silence(200), _tone(400), _silence(200)]), SAMPLE_RATE)
+        full = classify(np.concatenate([_silence(200), _tone(1500), _silence(200)]), SAMPLE_RATE)
+
+        self.assertEqual(short.route, "short")
+        self.assertEqual(short.duration_ms, 800)
+        self.assertEqual(short.speech_ms, 400)
+        self.assertEqual(full.route, "full")
+
+    def test_drops_silence_and_broadband_noise(self) -> None:
+        # 切分后的切片已做响度归一，噪声与语音电平相近，只能靠过零率区分
+        noise = np.random.default_rng(3).normal(0, 3000, SAMPLE_RATE).astype(np.int16)
+        click = np.concatenate([_silence(200), np.tile(np.int16([30000, -30000]), 40), _silence(200)])
+
+        self.assertEqual(classify(_silence(1000), SAMPLE_RATE).reason, "silent")
+        self.assertEqual(classify(noise, SAMPLE_RATE).route, "drop")
+        self.assertEqual(classify(click, SAMPLE_RATE).route, "drop")
+        self.assertIsNone(classify(_silence(1000), SAMPLE_RATE).as_dict()["rms_dbfs"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from chunk_manifest import ChunkEntry, ChunkManifest, canonical_chunk_name
+from services.base import ServiceError
+
+try:
+    from services.defaults import SplitterService
+except (ImportError, ServiceError):  # pydub/soundfile 等运行时依赖未安装
+    SplitterService = None
+
+
+class ChunkManifestTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.directory = Path(self._tmp.name)
+
+    def test_round_trip_and_transcripts(self) -> None:
+        entries = [
+            ChunkEntry(index=0, file="chunk0000.wav", start_ms=0, end_ms=800, duration_ms=800, sha1="a"),
+            ChunkEntry(index=1, file="chunk0001.wav", start_ms=800, end_ms=2000, duration_ms=1200, sha1="b"),
+        ]
+        ChunkManifest(self.directory, entries, source="x.mp3").save()
+
+        manifest = ChunkManifest.load(self.directory)
+        self.assertEqual(manifest.ranges(), [[0, 800], [800, 2000]])
+        self.assertIsNone(manifest.transcripts())
+        self.assertFalse(manifest.complete())
+
+        manifest.set_transcripts(
+            [
+                {"file": str(self.directory / "chunk0000.wav"), "text": "hello world"},
+                {"file": str(self.directory / "chunk0001.wav"), "text": "", "gate": {"route": "drop"}},
+            ]
+        )
+        manifest.save()
+        reloaded = ChunkManifest.load(self.directory)
+        self.assertEqual([item["text"] for item in reloaded.transcripts()], ["hello world", ""])
+        self.assertEqual(reloaded.digests()[str(self.directory / "chunk0001.wav")], "b")
+
+    def test_migrates_renamed_chunks(self) -> None:
+        for name in ("chunk0000.wav", "0001_hello_world.wav", "0002_bye.wav", "notes.wav", "20240101_intro.wav"):
+            (self.directory / name).write_bytes(b"RIFF")
+
+        manifest = ChunkManifest.migrate(self.directory)
+
+        self.assertEqual(manifest.names(), ["chunk0000.wav", "chunk0001.wav", "chunk0002.wav"])
+        self.assertTrue(manifest.complete())
+        self.assertFalse((self.directory / "0001_hello_world.wav").exists())
+        self.assertEqual(manifest.entry("0001_hello_world.wav").file, "chunk0001.wav")
+        # 只有四位序号的旧命名才会被迁移，其他带数字前缀的文件保持不动
+        self.assertTrue((self.directory / "20240101_intro.wav").exists())
+        self.assertIsNone(manifest.ranges())
+        self.assertEqual(ChunkManifest.load(self.directory).names(), manifest.names())
+
+    def test_canonical_name_matches_migration_alias(self) -> None:
+        self.assertEqual(canonical_chunk_name("0003_hello_world.wav"), "chunk0003.wav")
+        self.assertEqual(canonical_chunk_name("/old/dir/0012_bye.wav"), "chunk0012.wav")
+        self.assertEqual(canonical_chunk_name("chunk0003.wav"), "chunk0003.wav")
+        self.assertEqual(canonical_chunk_name("20240101_intro.wav"), "20240101_intro.wav")
+
+
+@unittest.skipIf(SplitterService is None, "Splitter runtime dependencies are not installed")
+class SplitterReuseTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.directory = Path(self._tmp.name)
+        self.source = self.directory / "talk.mp3"
+        self.source.write_bytes(b"ID3")
+        self.target = self.directory / "chunks"
+        self.target.mkdir()
+        entries = []
+        for idx in range(2):
+            (self.target / f"chunk{idx:04d}.wav").write_bytes(b"RIFF")
+            entries.append(ChunkEntry(index=idx, file=f"chunk{idx:04d}.wav", start_ms=idx * 1000, end_ms=(idx + 1) * 1000))
+        self.manifest = ChunkManifest(self.target, entries)
+
+    def _reuse(self) -> dict:
+        self.manifest.save()
+        context = SimpleNamespace(
+            asset=SimpleNamespace(resolved_path=lambda: self.source),
+            settings={"target_dir": str(self.target)},
+            artifacts={},
+        )
+        result = SplitterService().run(context)
+        self.assertTrue(result["reused"])
+        return context.artifacts
+
+    def test_reuse_seeds_transcripts_from_manifest(self) -> None:
+        self.manifest.set_transcripts(
+            [
+                {"file": str(self.target / "chunk0000.wav"), "text": "hello"},
+                {"file": str(self.target / "chunk0001.wav"), "text": "", "gate": {"route": "drop"}},
+            ]
+        )
+
+        artifacts = self._reuse()
+        self.assertEqual(
+            artifacts["transcripts"],
+            [
+                {"file": str(self.target / "chunk0000.wav"), "text": "hello"},
+                {"file": str(self.target / "chunk0001.wav"), "text": "", "gate": {"route": "drop"}},
+            ],
+        )
+        self.assertEqual(artifacts["split"]["transcripts"], artifacts["transcripts"])
+
+    def test_partial_manifest_leaves_transcription_to_stt(self) -> None:
+        self.manifest.set_transcripts([{"file": str(self.target / "chunk0000.wav"), "text": "hello"}])
+
+        self.assertEqual(self._reuse()["transcripts"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import config_cache
+from config_cache import clear_memory_cache, load_workflow_config
+
+
+class ConfigCacheTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(clear_memory_cache)
+        base = Path(self.tmp.name)
+        self.cache_dir = base / "cache"
+        self.config_path = base / "wf.json"
+        self._write({"id": "wf", "assets": [{"id": "a", "source_uri": "X:/a", "lang": "en"}]})
+
+    def _write(self, payload: dict) -> None:
+        self.config_path.write_text(json.dumps(payload), encoding="utf-8")
+
+    def test_unchanged_file_skips_validation(self) -> None:
+        first = load_workflow_config(self.config_path, cache_dir=self.cache_dir)
+        self.assertTrue(first.assets[0].steps["play"]["translate"])
+
+        clear_memory_cache()  # 模拟新进程：只剩磁盘缓存
+        with mock.patch.object(config_cache, "_validate_data", side_effect=AssertionError("validated")):
+            second = load_workflow_config(self.config_path, cache_dir=self.cache_dir)
+            # 仅 mtime 变化、内容不变时也命中
+            os.utime(self.config_path, ns=(1, 1))
+            third = load_workflow_config(self.config_path, cache_dir=self.cache_dir)
+
+        self.assertEqual(second.model_dump(), first.model_dump())
+        self.assertEqual(third.assets[0].id, "a")
+        self.assertIsNot(second, third)
+
+    def test_changed_content_is_revalidated(self) -> None:
+        load_workflow_config(self.config_path, cache_dir=self.cache_dir)
+        self._write({"id": "wf", "assets": [{"id": "b", "source_uri": "X:/b", "lang": "zh"}, {"id": "c", "source_uri": "X:/c"}]})
+
+        config = load_workflow_config(self.config_path, cache_dir=self.cache_dir)
+
+        self.assertEqual([asset.id for asset in config.assets], ["b", "c"])
+
+    def test_progress_only_changes_keep_the_cache(self) -> None:
+        load_workflow_config(self.config_path, cache_dir=self.cache_dir)
+        # 配置兼作进度文件：ProgressStore 只改写素材上的进度字段
+        self._write(
+            {
+                "id": "wf",
+                "assets": [
+                    {"id": "a", "source_uri": "X:/a", "lang": "en", "progress_played": 2, "progress_total": 5, "last_item": "chunk0001.wav"}
+                ],
+            }
+        )
+        clear_memory_cache()
+        with mock.patch.object(config_cache, "_validate_data", side_effect=AssertionError("validated")):
+            config = load_workflow_config(self.config_path, cache_dir=self.cache_dir)
+            again = load_workflow_config(self.config_path, cache_dir=self.cache_dir)
+
+        for loaded in (config, again):
+            asset = loaded.assets[0]
+            self.assertEqual((asset.progress_played, asset.progress_total, asset.last_item), (2, 5, "chunk0001.wav"))
+
+        # 类型不对的进度值（手工编辑）仍交给 pydantic 转换
+        self._write({"id": "wf", "assets": [{"id": "a", "source_uri": "X:/a", "lang": "en", "progress_played": "3"}]})
+        asset = load_workflow_config(self.config_path, cache_dir=self.cache_dir).assets[0]
+        self.assertEqual((asset.progress_played, asset.progress_total, asset.last_item), (3, 0, None))
+
+    @unittest.skipUnless(hasattr(os, "getuid"), "ownership check is POSIX-only")
+    def test_cache_outside_private_directory_is_not_loaded(self) -> None:
+        load_workflow_config(self.config_path, cache_dir=self.cache_dir)
+        self.assertEqual(self.cache_dir.stat().st_mode & 0o777, 0o700)
+
+        clear_memory_cache()
+        os.chmod(self.cache_dir, 0o777)  # 其他用户可以替换其中的 pickle
+        with mock.patch.object(config_cache, "_validate_data", wraps=config_cache._validate_data) as validate:
+            config = load_workflow_config(self.config_path, cache_dir=self.cache_dir)
+
+        self.assertEqual(validate.call_count, 1)
+        self.assertEqual(config.assets[0].id, "a")
+
+
+if __name__ == "__main__":
+    unittest.main()
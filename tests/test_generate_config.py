@@ -36,6 +36,7 @@ class GenerateConfigTestCase(unittest.TestCase):
 
         data = json.loads(output_path.read_text(encoding="utf-8"))
         self.assertEqual(data["id"], "en_plan")
+        self.assertTrue(data["warm_up_services"])
         self.assertEqual(len(data["assets"]), 2)
         for asset in data["assets"]:
             self.assertEqual(asset["lang"], "en")
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import sys
+import threading
+import unittest
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from models.workflow import AssetConfig, ServiceConfig, StepConfig, WorkflowConfig
+from orchestrator import Orchestrator
+from services.base import StepContext
+
+
+class RecordingService:
+    def __init__(self, name: str, log: List[tuple]) -> None:
+        self.name = name
+        self.log = log
+
+    def run(self, context: StepContext) -> Dict[str, Any]:
+        self.log.append((self.name, context.asset.id, threading.current_thread().name))
+        context.artifacts.setdefault("seen", []).append(self.name)
+        return {"service": self.name}
+
+
+class FakeRegistry:
+    def __init__(self, log: List[tuple]) -> None:
+        self.log = log
+
+    def get(self, config: ServiceConfig) -> RecordingService:
+        return RecordingService(config.name, self.log)
+
+
+def _workflow(assets: List[AssetConfig]) -> WorkflowConfig:
+    return WorkflowConfig(
+        id="wf",
+        services=[
+            ServiceConfig(name="splitter", impl="fake.split"),
+            ServiceConfig(name="stt", impl="fake.stt"),
+            ServiceConfig(name="playback", impl="fake.play"),
+        ],
+        steps=[
+            StepConfig(id="split", type="split", service="splitter"),
+            StepConfig(id="transcribe", type="transcribe", service="stt"),
+            StepConfig(id="play", type="speak", service="playback"),
+        ],
+        assets=assets,
+    )
+
+
+class OrchestratorTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.assets = [
+            AssetConfig(id=f"asset_{idx}", source_uri=f"X:/a{idx}.mp3", lang="en") for idx in range(4)
+        ]
+        self.log: List[tuple] = []
+        self.orchestrator = Orchestrator(_workflow(self.assets), FakeRegistry(self.log))
+
+    def test_prepare_steps_are_leading_split_and_transcribe(self) -> None:
+        self.assertEqual([step.id for step in self.orchestrator.prepare_steps()], ["split", "transcribe"])
+
+    def test_run_all_with_workers_prefetches_and_plays_serially(self) -> None:
+        results = list(self.orchestrator.run_all(workers=3))
+
+        self.assertEqual([item["asset"].id for item in results], [asset.id for asset in self.assets])
+        for item in results:
+            self.assertEqual(item["artifacts"]["seen"], ["splitter", "stt", "playback"])
+        play_threads = {thread for name, _, thread in self.log if name == "playback"}
+        prepare_threads = {thread for name, _, thread in self.log if name != "playback"}
+        self.assertEqual(play_threads, {threading.current_thread().name})
+        self.assertTrue(all(thread.startswith("asset-prepare") for thread in prepare_threads))
+
+    def test_prefetch_only_runs_ahead_by_the_lookahead(self) -> None:
+        window = self.orchestrator.prefetch(self.assets, workers=2)
+        self.addCleanup(self.orchestrator.shutdown)
+        self.assertEqual(len(window), 2)
+
+        first = window.pop("asset_0")
+        self.assertEqual(first.result()["seen"], ["splitter", "stt"])
+        # 取走正在播放的素材后补上下一个，始终只领先 2 个
+        self.assertEqual(len(window), 2)
+        self.assertIsNone(window.pop("asset_3"))  # 尚未提交的素材不再预处理，交给 run_asset
+        self.assertEqual(len(window), 2)
+        window.pop("asset_1").result()
+        window.pop("asset_2").result()
+        self.assertEqual(len(window), 0)
+        prepared = [asset_id for name, asset_id, _ in self.log if name == "splitter"]
+        self.assertEqual(sorted(prepared), ["asset_0", "asset_1", "asset_2"])
+
+    def test_declared_steps_run_in_parallel(self) -> None:
+        barrier = threading.Barrier(2, timeout=5)
+
+        class BarrierService:
+            def run(self, context: StepContext) -> str:
+                # Both steps must be in flight at once for the barrier to release.
+                barrier.wait()
+                context.artifacts[context.step.outputs[0]] = context.step.id
+                return context.step.id
+
+        class BarrierRegistry:
+            def get(self, config: ServiceConfig) -> BarrierService:
+                return BarrierService()
+
+        workflow = WorkflowConfig(
+            id="wf_dag",
+            services=[ServiceConfig(name="svc", impl="fake.svc")],
+            steps=[
+                StepConfig(id="translate", type="translate", service="svc", outputs=["translations"]),
+                StepConfig(id="prerender", type="prerender", service="svc", outputs=["tts"]),
+            ],
+            assets=self.assets[:1],
+        )
+        result = Orchestrator(workflow, BarrierRegistry()).run_asset(self.assets[0])
+
+        self.assertEqual(result["artifacts"], {"translations": "translate", "tts": "prerender"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,6 +10,9 @@ import sys
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
+import config_cache
+from config_cache import clear_memory_cache, load_workflow_config
+from models.taskmeta import TaskMeta
 from models.workflow import AssetConfig, StepConfig, WorkflowConfig
 from progress_store import ProgressStore
 from workflow_runner import run_workflow
@@ -207,6 +210,169 @@ class ProgressStoreTestCase(unittest.TestCase):
         self.assertTrue(refreshed.is_completed("asset_done"))
         self.assertFalse(refreshed.is_completed("asset_new"))
 
+    def test_journal_mode_appends_deltas_and_compacts(self) -> None:
+        asset = AssetConfig(id="asset_a", source_uri="X:/path/to", file_name="file.mp3", lang="zh")
+        original = self.config_path.read_text(encoding="utf-8")
+
+        store = ProgressStore.from_config_path(self.config_path, workflow_id="wf1", journal=True, compact_every=3)
+        store.mark_started(asset)
+        store.update_checkpoint(asset, last_item="chunk0002.wav", progress_played=2, progress_total=5)
+        store.flush()
+
+        # 配置文件本身未被重写，增量只写入日志
+        self.assertEqual(self.config_path.read_text(encoding="utf-8"), original)
+        self.assertEqual(len(store.journal_path.read_text(encoding="utf-8").splitlines()), 1)
+
+        reloaded = ProgressStore.from_config_path(self.config_path, workflow_id="wf1", journal=True)
+        record = reloaded.get_record("asset_a")
+        self.assertEqual(record.last_item, "chunk0002.wav")
+        self.assertEqual(record.progress_played, 2)
+
+        for played in (3, 4):
+            store.update_checkpoint(asset, progress_played=played, progress_total=5)
+            store.flush()
+        self.assertFalse(store.journal_path.exists())
+        entry = next(item for item in self._load_progress_json(store)["assets"] if item["id"] == "asset_a")
+        self.assertEqual(entry["progress_played"], 4)
+        self.assertFalse(self.config_path.with_name("sample.json.tmp").exists())
+
+    def test_cached_config_store_skips_record_validation(self) -> None:
+        with mock.patch.object(config_cache, "DEFAULT_CACHE_DIR", self.base / "cache"):
+            # 第一次写回会补全素材的默认步骤参数（结构变化），之后的写回只改进度字段
+            for played in (0, 1):
+                workflow = load_workflow_config(self.config_path)
+                store = ProgressStore(self.config_path, workflow_id=workflow.id, assets=workflow.assets)
+                store.update_checkpoint(workflow.assets[0], last_item="chunk0001.wav", progress_played=played, progress_total=3)
+                store.flush()
+                clear_memory_cache()
+
+            with mock.patch.object(TaskMeta, "from_raw", side_effect=AssertionError("validated")), mock.patch.object(
+                config_cache, "_validate_data", side_effect=AssertionError("validated")
+            ):
+                workflow = load_workflow_config(self.config_path)
+                store = ProgressStore(self.config_path, workflow_id=workflow.id, assets=workflow.assets)
+                for played in (2, 3):
+                    store.update_checkpoint(workflow.assets[0], progress_played=played)
+                store.mark_completed(workflow.assets[0])
+                store.flush()
+
+        record = store.get_record("asset_a")
+        self.assertEqual((record.last_item, record.progress_played, record.play_count), ("chunk0001.wav", 3, 1))
+        entry = next(item for item in self._load_progress_json(store)["assets"] if item["id"] == "asset_a")
+        self.assertTrue(entry["completed"])
+        self.assertEqual(entry["steps"]["play"], {"repeats": 1, "translate": False, "skip_first": False})
+        self.assertEqual(self._load_progress_json(store)["title"], "Test Workflow")
+
+    def test_run_workflow_checkpoints_segments_and_resumes(self) -> None:
+        asset = AssetConfig(id="asset_a", source_uri="X:/path/to", file_name="file.mp3", lang="zh")
+        cfg = WorkflowConfig(
+            id="wf1",
+            services=[],
+            steps=[StepConfig(id="play", type="speak", service="playback")],
+            assets=[asset],
+            checkpoint_every_segments=2,
+        )
+        store = ProgressStore(self.config_path, workflow_id=cfg.id, assets=cfg.assets)
+        store.update_checkpoint(asset, last_item="chunk0003.wav", progress_played=3)
+        store.flush()
+
+        seen: dict = {}
+
+        def fake_run_asset(run_asset, extra_context=None, **_):
+            seen["overrides"] = extra_context.get("step_overrides")
+            on_progress = extra_context["callbacks"]["on_progress"]
+            on_progress("chunk0003.wav", 3)
+            on_progress("chunk0004.wav", 4)
+            saved = ProgressStore.from_config_path(self.config_path, workflow_id=cfg.id).get_record("asset_a")
+            seen["saved"] = (saved.last_item, saved.progress_played)
+            raise KeyboardInterrupt
+
+        with mock.patch("workflow_runner.Orchestrator") as MockOrchestrator:
+            MockOrchestrator.return_value.run_asset.side_effect = fake_run_asset
+            with self.assertRaises(KeyboardInterrupt):
+                run_workflow(cfg, progress_path=self.config_path)
+
+        self.assertEqual(seen["overrides"], {"play": {"start_file": "chunk0003.wav"}})
+        self.assertEqual(seen["saved"], ("chunk0004.wav", 4))
+        record = ProgressStore.from_config_path(self.config_path, workflow_id=cfg.id).get_record("asset_a")
+        self.assertEqual(record.last_item, "chunk0004.wav")
+        self.assertFalse(record.completed)
+
+    def _loop_workflow(self, asset: AssetConfig) -> WorkflowConfig:
+        return WorkflowConfig(
+            id="wf1",
+            services=[],
+            steps=[StepConfig(id="play", type="speak", service="playback")],
+            assets=[asset],
+            flag_loop_assets=True,
+        )
+
+    @staticmethod
+    def _fake_playback(chunks: list, plays: list, calls: list):
+        """Stub ``run_asset`` that plays ``plays[n]`` segments from ``start_file`` on the n-th call."""
+
+        def fake_run_asset(run_asset, extra_context=None, **_):
+            if len(calls) == len(plays):
+                raise KeyboardInterrupt
+            start_file = (extra_context.get("step_overrides") or {}).get("play", {}).get("start_file")
+            calls.append(start_file)
+            start = chunks.index(start_file) if start_file else 0
+            played = chunks[start : start + plays[len(calls) - 1]]
+            for offset, name in enumerate(played, start=start):
+                extra_context["callbacks"]["on_progress"](name, offset)
+            playback = {
+                "last_played": played[-1] if played else None,
+                "segments_total": len(chunks) - start,
+                "segments_played": len(played),
+                "start_index": start,
+            }
+            return {"artifacts": {"playback": playback}}
+
+        return fake_run_asset
+
+    def test_run_workflow_restarts_completed_asset_from_beginning(self) -> None:
+        asset = AssetConfig(id="asset_a", source_uri="X:/path/to", file_name="file.mp3", lang="zh")
+        cfg = self._loop_workflow(asset)
+        store = ProgressStore(self.config_path, workflow_id=cfg.id, assets=cfg.assets)
+        store.update_checkpoint(asset, last_item="chunk0003.wav", progress_played=4, progress_total=4)
+        store.mark_completed(asset)
+        store.flush()
+
+        chunks = [f"chunk{idx:04d}.wav" for idx in range(4)]
+        calls: list = []
+        with mock.patch("workflow_runner.Orchestrator") as MockOrchestrator:
+            MockOrchestrator.return_value.run_asset.side_effect = self._fake_playback(chunks, [2], calls)
+            with self.assertRaises(KeyboardInterrupt):
+                run_workflow(cfg, progress_path=self.config_path)
+
+        # 已播完的素材不应停在最后一个片段，而是从头开始；上一轮的位置被清空
+        self.assertEqual(calls, [None])
+        record = ProgressStore.from_config_path(self.config_path, workflow_id=cfg.id).get_record("asset_a")
+        self.assertEqual(record.last_item, "chunk0001.wav")
+        self.assertEqual(record.progress_played, 2)
+        self.assertEqual(record.progress_total, 4)
+        self.assertFalse(record.completed)
+        self.assertEqual(record.play_count, 1)
+
+    def test_loop_mode_resumes_partial_run_then_restarts(self) -> None:
+        asset = AssetConfig(id="asset_a", source_uri="X:/path/to", file_name="file.mp3", lang="zh")
+        cfg = self._loop_workflow(asset)
+        chunks = [f"chunk{idx:04d}.wav" for idx in range(4)]
+        calls: list = []
+
+        with mock.patch("workflow_runner.Orchestrator") as MockOrchestrator:
+            # 第一轮播到 chunk0001 中断，第二轮续播到结尾，第三轮重新从头开始
+            MockOrchestrator.return_value.run_asset.side_effect = self._fake_playback(chunks, [2, 3, 1], calls)
+            with self.assertRaises(KeyboardInterrupt):
+                run_workflow(cfg, progress_path=self.config_path)
+
+        self.assertEqual(calls, [None, "chunk0001.wav", None])
+        record = ProgressStore.from_config_path(self.config_path, workflow_id=cfg.id).get_record("asset_a")
+        self.assertEqual(record.play_count, 1)
+        self.assertEqual(record.progress_total, 4)
+        self.assertEqual(record.progress_played, 1)
+        self.assertEqual(record.last_item, "chunk0000.wav")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from silence_split import detect_silence, energy_dbfs, frame_energies, normalize_to_dbfs, split_ranges
+
+
+SAMPLE_RATE = 16000
+
+
+def _tone(ms: int, amplitude: int = 8000) -> np.ndarray:
+    n = SAMPLE_RATE * ms // 1000
+    t = np.arange(n) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * 440 * t)).astype(np.int16)
+
+
+def _silence(ms: int) -> np.ndarray:
+    return np.zeros(SAMPLE_RATE * ms // 1000, dtype=np.int16)
+
+
+def _reference_detect_silence(energy: np.ndarray, counts: np.ndarray, min_len: int, thresh_db: float) -> list:
+    """Straight port of pydub's loop, evaluated on the same 1 ms frames."""
+    total = len(energy)
+    if total < min_len:
+        return []
+    thresh = (10 ** (thresh_db / 20.0)) * 32768.0
+    starts = []
+    for i in range(0, total - min_len + 1):
+        rms = np.sqrt(energy[i : i + min_len].sum() / max(counts[i : i + min_len].sum(), 1))
+        if rms <= thresh:
+            starts.append(i)
+    if not starts:
+        return []
+    ranges = []
+    prev = starts.pop(0)
+    current = prev
+    for start in starts:
+        continuous = start == prev + 1
+        has_gap = start > prev + min_len
+        if not continuous and has_gap:
+            ranges.append((current, prev + min_len))
+            current = start
+        prev = start
+    ranges.append((current, prev + min_len))
+    return ranges
+
+
+class SilenceSplitTestCase(unittest.TestCase):
+    def test_frame_energies_cover_every_sample(self) -> None:
+        samples = _tone(1000)
+        energy, counts = frame_energies(samples, SAMPLE_RATE)
+        self.assertEqual(len(energy), 1000)
+        self.assertEqual(int(counts.sum()), samples.shape[0])
+        self.assertAlmostEqual(float(energy.sum()), float(np.square(samples, dtype=np.float64).sum()))
+
+    def test_splits_tones_separated_by_silence(self) -> None:
+        samples = np.concatenate([_silence(300), _tone(500), _silence(1000), _tone(400), _silence(200)])
+        energy, counts = frame_energies(samples, SAMPLE_RATE)
+        thresh = energy_dbfs(energy, counts) - 16
+
+        ranges = split_ranges(energy, counts, min_silence_len=700, silence_thresh=thresh, keep_silence=0)
+
+        # Windows that overlap a few ms of tone are still loud, so edges land near (not on) 800/1800 ms.
+        self.assertEqual(len(ranges), 2)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertAlmostEqual(ranges[0][1], 800, delta=10)
+        self.assertAlmostEqual(ranges[1][0], 1800, delta=10)
+        self.assertEqual(ranges[1][1], 2400)
+
+    def test_keep_silence_overlap_meets_at_midpoint(self) -> None:
+        samples = np.concatenate([_tone(500), _silence(800), _tone(500)])
+        energy, counts = frame_energies(samples, SAMPLE_RATE)
+        thresh = energy_dbfs(energy, counts) - 16
+
+        ranges = split_ranges(energy, counts, min_silence_len=700, silence_thresh=thresh, keep_silence=500)
+
+        self.assertEqual(len(ranges), 2)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[0][1], ranges[1][0])
+        self.assertEqual(ranges[1][1], 1800)
+
+    def test_all_silent_audio_yields_no_ranges(self) -> None:
+        energy, counts = frame_energies(_silence(2000), SAMPLE_RATE)
+        thresh = energy_dbfs(energy, counts) - 16
+        self.assertEqual(split_ranges(energy, counts, min_silence_len=700, silence_thresh=thresh), [])
+
+    def test_normalize_to_dbfs_hits_target_level(self) -> None:
+        normalized = normalize_to_dbfs(_tone(500, amplitude=1000), -25.0)
+        energy, counts = frame_energies(normalized, SAMPLE_RATE)
+        self.assertEqual(normalized.dtype, np.int16)
+        self.assertAlmostEqual(energy_dbfs(energy, counts), -25.0, places=1)
+        self.assertTrue(np.array_equal(normalize_to_dbfs(_silence(100), -25.0), _silence(100)))
+
+    def test_matches_reference_loop(self) -> None:
+        rng = np.random.default_rng(7)
+        pieces = []
+        for _ in range(12):
+            pieces.append(_tone(int(rng.integers(50, 600)), amplitude=int(rng.integers(500, 12000))))
+            pieces.append((rng.normal(0, 30, SAMPLE_RATE * int(rng.integers(100, 900)) // 1000)).astype(np.int16))
+        energy, counts = frame_energies(np.concatenate(pieces), SAMPLE_RATE)
+        thresh = energy_dbfs(energy, counts) - 16
+
+        for min_len in (100, 300, 500):
+            self.assertEqual(
+                detect_silence(energy, counts, min_len, thresh),
+                _reference_detect_silence(energy, counts, min_len, thresh),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+import unittest
+import wave
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from services.base import ServiceError
+from transcript_cache import TranscriptCache
+
+try:
+    from services.defaults import SplitterService
+except (ImportError, ServiceError):  # pydub/soundfile 等运行时依赖未安装
+    SplitterService = None
+
+
+class _Segment:
+    """The part of ``AudioSegment`` that ``_segment_writer`` touches, backed by int16 samples."""
+
+    def __init__(self, samples: np.ndarray, frame_rate: int) -> None:
+        self.raw_data = samples.astype(np.int16).tobytes()
+        self.sample_width = 2
+        self.channels = 1
+        self.frame_rate = frame_rate
+        self._duration_ms = samples.shape[0] * 1000 // frame_rate
+
+    def __len__(self) -> int:
+        return self._duration_ms
+
+    def export(self, path: Path, format: str) -> None:
+        with wave.open(str(path), "wb") as handle:
+            handle.setnchannels(self.channels)
+            handle.setsampwidth(self.sample_width)
+            handle.setframerate(self.frame_rate)
+            handle.writeframes(self.raw_data)
+
+
+@unittest.skipIf(SplitterService is None, "Splitter runtime dependencies are not installed")
+class ExportChunksTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.directory = Path(self._tmp.name)
+        self.service = SplitterService()
+
+    @staticmethod
+    def _writer(idx: int, delay: float = 0.0, started: list = None):
+        def _write(chunk_path: Path) -> dict:
+            if started is not None:
+                started.append(idx)
+            time.sleep(delay)
+            chunk_path.write_bytes(b"RIFF")
+            return {"duration_ms": idx}
+
+        return _write
+
+    def test_names_and_callbacks_follow_index_order(self) -> None:
+        # 前面的切片写得更慢，完成顺序与序号相反
+        writers = [self._writer(idx, delay=0.02 * (4 - idx)) for idx in range(5)]
+        seen: list = []
+
+        paths, failures, written, infos = self.service._export_chunks(
+            writers, self.directory, {"workers": 4}, on_chunk=lambda idx, path: seen.append((idx, Path(path).name))
+        )
+
+        names = [f"chunk{idx:04d}.wav" for idx in range(5)]
+        self.assertEqual([Path(path).name for path in paths], names)
+        self.assertEqual(seen, list(enumerate(names)))
+        self.assertEqual((failures, written), ([], [0, 1, 2, 3, 4]))
+        self.assertEqual([info["duration_ms"] for info in infos], [0, 1, 2, 3, 4])
+
+    def test_failed_chunk_is_reported_without_aborting(self) -> None:
+        def _broken(chunk_path: Path) -> dict:
+            raise OSError("disk full")
+
+        writers = [self._writer(0), _broken, self._writer(2)]
+
+        paths, failures, written, infos = self.service._export_chunks(writers, self.directory, {"workers": 2})
+
+        self.assertEqual([Path(path).name for path in paths], ["chunk0000.wav", "chunk0002.wav"])
+        self.assertEqual(written, [0, 2])
+        self.assertEqual([info["duration_ms"] for info in infos], [0, 2])
+        self.assertEqual(failures, [{"index": 1, "file": str(self.directory / "chunk0001.wav"), "error": "disk full"}])
+
+    def test_in_flight_writes_are_bounded(self) -> None:
+        started: list = []
+        started_at_first: list = []
+        # 第一个切片很慢；若不限制在途任务，另一个线程会在此期间把其余切片全部写完
+        writers = [self._writer(0, delay=0.2, started=started)]
+        writers += [self._writer(idx, started=started) for idx in range(1, 20)]
+
+        def _on_chunk(idx: int, path: str) -> None:
+            if idx == 0:
+                started_at_first.append(len(started))
+
+        paths, _, _, _ = self.service._export_chunks(writers, self.directory, {"workers": 2}, on_chunk=_on_chunk)
+
+        self.assertEqual(len(paths), 20)
+        self.assertLessEqual(started_at_first[0], 2 * 2)
+
+    def test_segment_writer_hashes_samples_in_memory(self) -> None:
+        rng = np.random.default_rng(0)
+        segment = _Segment(rng.integers(-8000, 8000, 1600), 16000)
+        chunk_path = self.directory / "chunk0000.wav"
+
+        with mock.patch.object(TranscriptCache, "audio_digest") as audio_digest:
+            info = self.service._segment_writer(segment, {"normalize": False})(chunk_path)
+
+        audio_digest.assert_not_called()
+        with wave.open(str(chunk_path), "rb") as handle:
+            on_disk = np.frombuffer(handle.readframes(handle.getnframes()), dtype=np.int16).reshape(-1, 1)
+        self.assertEqual(info, {"duration_ms": 100, "sha1": TranscriptCache.samples_digest(on_disk, 16000)})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from models.workflow import StepConfig
+from step_graph import StepGraph
+
+
+def _step(step_id: str, inputs=None, outputs=None) -> StepConfig:
+    return StepConfig(id=step_id, type=step_id, service="svc", inputs=inputs or [], outputs=outputs or [])
+
+
+class StepGraphTestCase(unittest.TestCase):
+    def test_undeclared_steps_stay_sequential(self) -> None:
+        graph = StepGraph([_step("split"), _step("transcribe"), _step("play")])
+        self.assertFalse(graph.declared)
+        self.assertEqual(graph.dependencies["play"], {"split", "transcribe"})
+        self.assertEqual([step.id for step in graph.ready(done=[], started=[])], ["split"])
+
+    def test_independent_consumers_become_ready_together(self) -> None:
+        graph = StepGraph(
+            [
+                _step("transcribe", outputs=["transcripts"]),
+                _step("translate", inputs=["transcripts"], outputs=["translations"]),
+                _step("prerender", inputs=["transcripts"], outputs=["tts"]),
+                _step("play", inputs=["translations", "tts"]),
+            ]
+        )
+        self.assertTrue(graph.declared)
+        ready = [step.id for step in graph.ready(done=["transcribe"], started=["transcribe"])]
+        self.assertEqual(ready, ["translate", "prerender"])
+        self.assertEqual(graph.dependencies["play"], {"translate", "prerender"})
+
+    def test_unknown_inputs_are_external(self) -> None:
+        graph = StepGraph([_step("play", inputs=["chunks"])])
+        self.assertEqual(graph.dependencies["play"], set())
+
+    def test_barrier_step_orders_declared_neighbours(self) -> None:
+        graph = StepGraph([_step("a", outputs=["x"]), _step("legacy"), _step("b", inputs=["y"])])
+        self.assertEqual(graph.dependencies["legacy"], {"a"})
+        self.assertEqual(graph.dependencies["b"], {"legacy"})
+
+    def test_reader_only_links_to_earlier_writers(self) -> None:
+        # 读在写之前的 key 视为外部输入，不会反向依赖后面的写者而成环
+        graph = StepGraph([_step("a", inputs=["y"], outputs=["x"]), _step("b", inputs=["x"], outputs=["y"])])
+        self.assertEqual(graph.dependencies["a"], set())
+        self.assertEqual(graph.dependencies["b"], {"a"})
+
+    def test_writer_waits_for_earlier_readers(self) -> None:
+        graph = StepGraph(
+            [
+                _step("transcribe", outputs=["transcripts"]),
+                _step("translate", inputs=["transcripts"], outputs=["translations"]),
+                _step("prerender", inputs=["transcripts"], outputs=["tts"]),
+                _step("retranscribe", outputs=["transcripts"]),
+                _step("play", inputs=["transcripts"]),
+            ]
+        )
+        self.assertEqual(graph.dependencies["retranscribe"], {"transcribe", "translate", "prerender"})
+        self.assertEqual(graph.dependencies["play"], {"retranscribe"})
+        ready = [step.id for step in graph.ready(done=["transcribe", "translate"], started=["transcribe", "translate"])]
+        self.assertEqual(ready, ["prerender"])
+
+    def test_writers_of_a_key_keep_declaration_order(self) -> None:
+        graph = StepGraph([_step("first", outputs=["tts"]), _step("second", outputs=["tts"]), _step("play", inputs=["tts"])])
+        self.assertEqual(graph.dependencies["second"], {"first"})
+        self.assertEqual(graph.dependencies["play"], {"second"})
+        self.assertEqual([step.id for step in graph.order], ["first", "second", "play"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from services.streaming import ArtifactStream
+
+
+class ArtifactStreamTestCase(unittest.TestCase):
+    def test_consumer_sees_items_while_producer_runs(self) -> None:
+        stream: ArtifactStream[int] = ArtifactStream(expected=3)
+        first_consumed = threading.Event()
+
+        def _produce() -> None:
+            stream.append(0)
+            # The consumer must get item 0 before the rest exists.
+            first_consumed.wait(timeout=5)
+            stream.append(1)
+            stream.append(2)
+            stream.close()
+
+        threading.Thread(target=_produce, daemon=True).start()
+        seen = []
+        for item in stream:
+            seen.append(item)
+            first_consumed.set()
+
+        self.assertEqual(seen, [0, 1, 2])
+        self.assertTrue(stream.closed)
+        self.assertEqual(stream.items(), [0, 1, 2])
+
+    def test_failure_propagates_to_consumers(self) -> None:
+        stream: ArtifactStream[str] = ArtifactStream()
+        stream.append("chunk0000.wav")
+        stream.fail(RuntimeError("decode failed"))
+
+        iterator = iter(stream)
+        self.assertEqual(next(iterator), "chunk0000.wav")
+        with self.assertRaises(RuntimeError):
+            next(iterator)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+from unittest import mock
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import speech2text_model
+from speech2text_model import speech_to_text_batch
+
+N_SAMPLES = 100
+
+
+def _fake_whisper(clips: dict, mel_inputs: list, batches: list) -> ModuleType:
+    """Minimal ``whisper`` stand-in: each clip's "mel" is its first sample, decoded back to ``text<value>``."""
+    whisper = ModuleType("whisper")
+    whisper.audio = SimpleNamespace(N_SAMPLES=N_SAMPLES)
+
+    def load_audio(path: str) -> np.ndarray:
+        if clips[path] is None:
+            raise RuntimeError("ffmpeg failed")
+        return clips[path]
+
+    def log_mel_spectrogram(audio, n_mels: int, device=None):
+        mel_inputs.append(audio)
+        return float(audio[0])
+
+    def decode(model, mel, options):
+        batches.append(list(mel))
+        return [SimpleNamespace(text=f"text{int(value)}.") for value in mel]
+
+    whisper.load_audio = load_audio
+    whisper.pad_or_trim = lambda audio: np.pad(audio, (0, max(0, N_SAMPLES - audio.shape[0])))[:N_SAMPLES]
+    whisper.log_mel_spectrogram = log_mel_spectrogram
+    whisper.decode = decode
+    whisper.DecodingOptions = lambda **kwargs: SimpleNamespace(**kwargs)
+    return whisper
+
+
+class SpeechToTextBatchTestCase(unittest.TestCase):
+    def test_batches_short_clips_in_order_and_routes_the_rest_alone(self) -> None:
+        clips = {
+            "a.wav": np.full(40, 1.0),
+            "long.wav": np.full(N_SAMPLES + 1, 2.0),
+            "b.wav": np.full(60, 3.0),
+            "broken.wav": None,
+            "c.wav": np.full(10, 4.0),
+        }
+        mel_inputs: list = []
+        batches: list = []
+        torch = ModuleType("torch")
+        torch.stack = list
+        model = SimpleNamespace(device=SimpleNamespace(type="cpu"), dims=SimpleNamespace(n_mels=80))
+
+        with mock.patch.dict(sys.modules, {"whisper": _fake_whisper(clips, mel_inputs, batches), "torch": torch}), \
+                mock.patch.object(speech2text_model, "_get_whisper_model", return_value=model), \
+                mock.patch.object(speech2text_model, "speech_to_text", side_effect=lambda path, **_: f"alone:{path}") as alone:
+            texts = speech_to_text_batch(list(clips), device="cpu", batch_size=2)
+
+        self.assertEqual(texts, ["text1", "alone:long.wav", "text3", "alone:broken.wav", "text4"])
+        self.assertEqual([call.args[0] for call in alone.call_args_list], ["long.wav", "broken.wav"])
+        self.assertEqual(batches, [[1.0, 3.0], [4.0]])
+        # log-mel 逐条计算，每条输入都已补齐到单窗口长度
+        self.assertEqual([audio.shape[0] for audio in mel_inputs], [N_SAMPLES] * 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
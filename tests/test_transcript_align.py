@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from transcript_align import assign_to_ranges, segment_words, texts_for_ranges
+
+
+class TranscriptAlignTestCase(unittest.TestCase):
+    def test_word_timestamps_map_onto_chunk_ranges(self) -> None:
+        segments = [
+            {
+                "start": 0.0,
+                "end": 3.0,
+                "text": " apple banana cherry",
+                "words": [
+                    {"start": 0.1, "end": 0.6, "word": " apple"},
+                    {"start": 1.3, "end": 1.8, "word": " banana"},
+                    # 中点落在两个切片之间被删掉的静音里，归到更近的切片
+                    {"start": 2.3, "end": 2.4, "word": " cherry"},
+                ],
+            }
+        ]
+        ranges = [[0, 900], [1200, 2000], [2500, 3000]]
+
+        self.assertEqual(texts_for_ranges(segments, ranges), ["apple", "banana", "cherry"])
+
+    def test_segment_text_is_spread_over_its_span(self) -> None:
+        segments = [{"start": 0.0, "end": 2.0, "text": " one two three four"}, {"start": 2.0, "end": 2.5, "text": "你好"}]
+        words = segment_words(segments)
+
+        self.assertEqual([round(word[0], 2) for word in words], [0.0, 0.5, 1.0, 1.5, 2.0])
+        self.assertEqual(assign_to_ranges(words, [[0, 1000], [1000, 3000]]), ["one two", "three four你好"])
+        self.assertEqual(assign_to_ranges(words, []), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
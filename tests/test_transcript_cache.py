@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import transcript_cache
+from services.base import ServiceError
+from transcript_cache import TranscriptCache
+
+try:
+    from services.defaults import STTService
+except (ImportError, ServiceError):  # whisper/soundfile/pydub 等运行时依赖未安装
+    STTService = None
+
+
+def _tone(seconds: float = 0.5, sample_rate: int = 16000) -> np.ndarray:
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    return (8000 * np.sin(2 * np.pi * 220 * t)).astype(np.int16).reshape(-1, 1)
+
+
+class TranscriptCacheTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.directory = Path(self.tmp.name)
+        self.digest = TranscriptCache.samples_digest(_tone(), 16000)
+
+    def test_key_depends_on_audio_model_and_prompt(self) -> None:
+        key = TranscriptCache.make_key(self.digest, "tiny", "prompt")
+
+        self.assertEqual(key, TranscriptCache.make_key(self.digest, "tiny", "prompt"))
+        self.assertNotEqual(key, TranscriptCache.make_key(self.digest, "small", "prompt"))
+        self.assertNotEqual(key, TranscriptCache.make_key(self.digest, "tiny", "other prompt"))
+        self.assertNotEqual(key, TranscriptCache.make_key(self.digest, "tiny", None))
+        other = TranscriptCache.samples_digest(_tone(0.6), 16000)
+        self.assertNotEqual(key, TranscriptCache.make_key(other, "tiny", "prompt"))
+        # 采样率不同，即使样本相同也视为不同音频
+        self.assertNotEqual(self.digest, TranscriptCache.samples_digest(_tone(), 8000))
+
+    def test_entries_survive_reload(self) -> None:
+        cache = TranscriptCache.for_directory(self.directory)
+        key = TranscriptCache.make_key(self.digest, "tiny", None)
+        cache.put(key, "hello world")
+        cache.save()
+
+        reloaded = TranscriptCache.for_directory(self.directory)
+        self.assertEqual(reloaded.get(key), "hello world")
+        self.assertIsNone(reloaded.get(TranscriptCache.make_key(self.digest, "small", None)))
+        self.assertEqual(reloaded.stats(), {"hits": 1, "misses": 1, "entries": 1})
+
+    def test_corrupt_or_other_version_file_is_ignored(self) -> None:
+        path = self.directory / TranscriptCache.FILE_NAME
+        key = TranscriptCache.make_key(self.digest, "tiny", None)
+
+        path.write_text("{not json", encoding="utf-8")
+        self.assertIsNone(TranscriptCache(path).get(key))
+
+        path.write_text(json.dumps({"version": TranscriptCache.VERSION + 1, "entries": {key: "stale"}}), encoding="utf-8")
+        cache = TranscriptCache(path)
+        self.assertIsNone(cache.get(key))
+
+        # 忽略旧文件后仍可正常写入新版本
+        cache.put(key, "fresh")
+        cache.save()
+        self.assertEqual(json.loads(path.read_text(encoding="utf-8"))["version"], TranscriptCache.VERSION)
+
+    def test_save_is_atomic_and_only_when_dirty(self) -> None:
+        cache = TranscriptCache.for_directory(self.directory)
+        key = TranscriptCache.make_key(self.digest, "tiny", None)
+
+        with mock.patch.object(transcript_cache.os, "replace", wraps=transcript_cache.os.replace) as replace:
+            cache.save()
+            self.assertFalse(cache.path.exists())
+
+            cache.put(key, "hello")
+            cache.save()
+            replace.assert_called_once_with(cache.path.with_name(cache.path.name + ".tmp"), cache.path)
+
+            cache.put(key, "hello")  # 内容未变，不算修改
+            cache.save()
+            self.assertEqual(replace.call_count, 1)
+
+        self.assertEqual([item.name for item in self.directory.iterdir()], [TranscriptCache.FILE_NAME])
+
+
+@unittest.skipIf(STTService is None, "STT runtime dependencies are not installed")
+class STTServiceCacheTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = TranscriptCache.for_directory(self.tmp.name)
+        self.service = STTService(model_size="tiny", vad="off")
+        self.digest = TranscriptCache.samples_digest(_tone(), 16000)
+
+    def _run(self, path: str, params: dict, texts: list, decisions: list = None, gate: bool = False):
+        fresh = (texts, decisions or [None] * len(texts))
+        with mock.patch.object(STTService, "_transcribe", return_value=fresh) as decode:
+            result = self.service._transcribe_cached([path], params, self.cache, gate=gate, digests={path: self.digest})
+        return result, decode.call_count
+
+    def test_same_audio_under_new_name_hits_cache(self) -> None:
+        (texts, _), decodes = self._run("chunk0001.wav", {}, ["hello"])
+        self.assertEqual((texts, decodes), (["hello"], 1))
+
+        (texts, decisions), decodes = self._run("0001_hello.wav", {}, ["unused"])
+        self.assertEqual((texts, decisions, decodes), (["hello"], [{"route": "cached"}], 0))
+        self.assertTrue(self.cache.path.exists())
+
+    def test_model_prompt_and_force_bypass_cache(self) -> None:
+        self._run("chunk0001.wav", {}, ["hello"])
+
+        self.assertEqual(self._run("chunk0001.wav", {"model_size": "small"}, ["small"])[1], 1)
+        self.assertEqual(self._run("chunk0001.wav", {"initial_prompt": "other"}, ["prompted"])[1], 1)
+        (texts, _), decodes = self._run("chunk0001.wav", {"force_transcribe": True}, ["forced"])
+        self.assertEqual((texts, decodes), (["forced"], 1))
+
+    def test_gated_results_are_cached_with_the_gate_settings(self) -> None:
+        gated = {"vad": "energy", "short_chunk_ms": 1000}
+        for route, text in (("drop", ""), ("short", "short")):
+            with self.subTest(route=route):
+                self.cache = TranscriptCache.for_directory(self.tmp.name + route)
+                self._run("chunk0001.wav", gated, [text], [{"route": route}], gate=True)
+
+                (texts, decisions), decodes = self._run("chunk0001.wav", gated, ["unused"], gate=True)
+                self.assertEqual((texts, decisions, decodes), ([text], [{"route": "cached"}], 0))
+                # 门控设置或短切片模型变化后，分流结果可能不同，需重新解码
+                self.assertEqual(self._run("chunk0001.wav", dict(gated, short_chunk_ms=500), [text], [{"route": route}], gate=True)[1], 1)
+                self.assertEqual(self._run("chunk0001.wav", dict(gated, vad="webrtc"), [text], [{"route": route}], gate=True)[1], 1)
+                self.assertEqual(self._run("chunk0001.wav", dict(gated, short_model_size="base"), [text], [{"route": route}], gate=True)[1], 1)
+                # 不走门控的转写也不会复用门控结果
+                self.assertEqual(self._run("chunk0001.wav", gated, ["full"])[1], 1)
+
+    def test_full_decodes_are_shared_with_ungated_runs(self) -> None:
+        self._run("chunk0001.wav", {"vad": "energy"}, ["full"], [{"route": "full"}], gate=True)
+
+        self.assertEqual(self._run("chunk0001.wav", {}, ["unused"])[0][0], ["full"])
+        self.assertEqual(self._run("chunk0001.wav", {"vad": "webrtc"}, ["unused"], gate=True)[0][0], ["full"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from translation_cache import TranslationCache
+
+
+class TranslationCacheTestCase(unittest.TestCase):
+    def test_entries_survive_reopen_and_count_hits(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = TranslationCache.for_directory(tmp)
+            key = cache.make_key("Hello,   world! ", "qwen3:8b", "1")
+            self.assertIsNone(cache.get(key))
+            cache.put(key, "Hello, world!", "你好，世界！")
+
+            reopened = TranslationCache.for_directory(tmp)
+            self.assertEqual(reopened.get(cache.make_key("Hello, world!", "qwen3:8b", "1")), "你好，世界！")
+            self.assertEqual(reopened.stats(), {"hits": 1, "misses": 0, "entries": 1})
+            self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_model_and_prompt_version_change_key(self) -> None:
+        base = TranslationCache.make_key("Good morning", "qwen3:8b", "1")
+        self.assertNotEqual(base, TranslationCache.make_key("Good morning", "qwen3:14b", "1"))
+        self.assertNotEqual(base, TranslationCache.make_key("Good morning", "qwen3:8b", "2"))
+
+    def test_truncated_line_is_ignored(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = TranslationCache.for_directory(tmp)
+            cache.put(cache.make_key("Yes", "m", "1"), "Yes", "是")
+            with cache.path.open("a", encoding="utf-8") as handle:
+                handle.write('{"key": "abc", "transl')
+            self.assertEqual(TranslationCache(cache.path).stats()["entries"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import tts_cache
+from tts_cache import TTSCache
+
+
+class TTSCacheTestCase(unittest.TestCase):
+    def _add(self, cache: TTSCache, key: str, size: int, mtime: float) -> None:
+        source = cache.directory / f"{key}.src"
+        source.write_bytes(b"\0" * size)
+        with mock.patch.object(tts_cache.time, "time", return_value=mtime):
+            cache.store_file(key, source)
+
+    def test_key_covers_voice_language_and_speed(self) -> None:
+        base = TTSCache.make_key("你好", 0, "简体中文", 0.9)
+        self.assertEqual(base, TTSCache.make_key(" 你好 ", 0, "简体中文", 0.9))
+        self.assertNotEqual(base, TTSCache.make_key("你好", 1, "简体中文", 0.9))
+        self.assertNotEqual(base, TTSCache.make_key("你好", 0, "English", 0.9))
+        self.assertNotEqual(base, TTSCache.make_key("你好", 0, "简体中文", 1.0))
+        self.assertNotEqual(base, TTSCache.make_key("你好", 0, "简体中文", 0.9, backend="api"))
+
+    def test_lookup_refreshes_entry_and_eviction_drops_oldest(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = TTSCache(tmp, max_bytes=250, min_age=0)
+            cache.directory.mkdir(exist_ok=True)
+            self._add(cache, "a", 100, 1000)
+            self._add(cache, "b", 100, 2000)
+            self.assertIsNotNone(cache.lookup("a"))  # a 变为最近使用
+            self.assertIsNone(cache.lookup("missing"))
+
+            self._add(cache, "c", 100, 3000)
+            cache.evict()
+
+            self.assertTrue(cache.path_for("a").exists())
+            self.assertFalse(cache.path_for("b").exists())
+            self.assertTrue(cache.path_for("c").exists())
+            self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "evicted": 1})
+
+    def test_index_is_loaded_once_and_kept_in_step(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            for key, mtime in (("old", 1000), ("new", 2000)):
+                path = directory / f"{key}{TTSCache.SUFFIX}"
+                path.write_bytes(b"\0" * 100)
+                os.utime(path, (mtime, mtime))
+            cache = TTSCache(directory, max_bytes=250, min_age=0)
+
+            self.assertEqual(cache.evict(), 0)
+            # 启动时扫描一次目录后，写入与淘汰只更新内存索引与累计字节数
+            with mock.patch.object(Path, "glob", side_effect=AssertionError("directory rescanned")):
+                self._add(cache, "c", 100, 3000)
+                self._add(cache, "d", 100, 4000)
+
+            self.assertEqual(sorted(path.stem for path in directory.glob("*.wav")), ["c", "d"])
+            self.assertEqual(list(cache._index), ["c", "d"])
+            self.assertEqual(cache._total, 200)
+            self.assertEqual(cache.stats()["evicted"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
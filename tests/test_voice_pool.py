@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import speaker_model
+from speaker_model import VoicePool, VoiceSpec
+
+
+class VoicePoolTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loads = []
+        patcher = mock.patch.object(
+            speaker_model,
+            "create_tts_fn",
+            side_effect=lambda model, hps, speaker_id, speed: ("fn", speaker_id, speed),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _loader(self, config_path: str, checkpoint_path: str):
+        self.loads.append(checkpoint_path)
+        return object(), SimpleNamespace(speakers={"QD": 0, "shen": 1})
+
+    def test_voices_sharing_a_checkpoint_load_it_once(self) -> None:
+        voices = {0: VoiceSpec("QD", 0.9, "c.json", "g.pth"), 1: VoiceSpec("shen", 1.0, "c.json", "g.pth")}
+        pool = VoicePool(voices, idle_seconds=0, loader=self._loader)
+
+        pool.warm_up()
+
+        self.assertEqual(pool.get(0), ("fn", 0, 0.9))
+        self.assertEqual(pool.get(1), ("fn", 1, 1.0))
+        self.assertEqual(self.loads, ["g.pth"])
+        with self.assertRaises(ValueError):
+            pool.get(5)
+
+    def test_idle_models_are_released(self) -> None:
+        voices = {0: VoiceSpec("QD", 0.9, "a.json", "a.pth"), 1: VoiceSpec("shen", 0.9, "b.json", "b.pth")}
+        pool = VoicePool(voices, idle_seconds=60, loader=self._loader)
+        pool.get(0)
+        pool.get(1)
+
+        with mock.patch.object(speaker_model.time, "monotonic", return_value=speaker_model.time.monotonic() + 120):
+            pool.get(1)
+
+        self.assertEqual(pool.loaded(), [("b.json", "b.pth")])
+        pool.get(0)
+        self.assertEqual(self.loads, ["a.pth", "b.pth", "a.pth"])
+
+
+if __name__ == "__main__":
+    unittest.main()
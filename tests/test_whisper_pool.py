@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import sys
+import threading
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from speech2text_model import WhisperPool
+
+MB = 1024 * 1024
+
+
+class WhisperPoolTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loads = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def _loader(self, model_size: str, device: str, backend: str):
+        self.release.wait(timeout=5)
+        self.loads.append(model_size)
+        return SimpleNamespace(name=model_size)
+
+    def test_memory_budget_evicts_least_recently_used(self) -> None:
+        # 无 parameters() 的假模型按估算大小计：tiny 150MB、base 290MB、small 970MB
+        pool = WhisperPool(memory_bytes=1200 * MB, idle_seconds=0, loader=self._loader)
+        pool.get("tiny", "cpu")
+        pool.get("base", "cpu")
+        pool.get("tiny", "cpu")
+
+        pool.get("small", "cpu")
+
+        self.assertEqual(pool.loaded(), [("tiny", "cpu", "whisper"), ("small", "cpu", "whisper")])
+        metrics = pool.metrics()
+        self.assertEqual(metrics["evictions"], 1)
+        self.assertEqual(metrics["loads"], 3)
+        self.assertEqual(metrics["resident_bytes"], (150 + 970) * MB)
+
+    def test_warm_up_in_background_loads_once(self) -> None:
+        pool = WhisperPool(memory_bytes=0, idle_seconds=0, loader=self._loader)
+        self.release.clear()
+        thread = pool.warm_up(["tiny"], "cpu")
+        waiter = threading.Thread(target=pool.get, args=("tiny", "cpu"))
+        waiter.start()
+
+        self.release.set()
+        thread.join(timeout=5)
+        waiter.join(timeout=5)
+
+        self.assertEqual(self.loads, ["tiny"])
+        self.assertEqual(pool.metrics()["hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+Word = Tuple[float, float, str]  # (start_s, end_s, text)
+
+
+def segment_words(segments: Iterable[Dict[str, Any]]) -> List[Word]:
+    """
+    Flatten timestamped segments into words.
+
+    Segments carrying ``words`` (``word_timestamps=True``) use them directly;
+    otherwise the segment span is divided evenly over its whitespace tokens,
+    which is accurate enough to place words on the correct side of a pause.
+    """
+    words: List[Word] = []
+    for segment in segments:
+        start = float(segment.get("start", 0.0))
+        end = float(segment.get("end", start))
+        if segment.get("words"):
+            for word in segment["words"]:
+                words.append((float(word["start"]), float(word["end"]), str(word["word"])))
+            continue
+        # 保留词后的空白，拼回时不改变原文的分词方式（中文整段无空格时视为一个词）
+        tokens = re.findall(r"\s*\S+", str(segment.get("text", "")))
+        if not tokens:
+            continue
+        span = max(end - start, 0.0) / len(tokens)
+        for idx, token in enumerate(tokens):
+            words.append((start + idx * span, start + (idx + 1) * span, token))
+    return words
+
+
+def assign_to_ranges(words: Sequence[Word], ranges: Sequence[Sequence[int]]) -> List[str]:
+    """
+    Map words onto chunk ``ranges`` (milliseconds, sorted, non-overlapping).
+
+    A word goes to the range containing its midpoint; words whose midpoint
+    falls in a removed silence gap go to the nearest range. Returns one text
+    per range.
+    """
+    if not ranges:
+        return []
+    starts = [int(start) for start, _ in ranges]
+    ends = [int(end) for _, end in ranges]
+    parts: List[List[str]] = [[] for _ in ranges]
+    for start_s, end_s, text in words:
+        mid = (start_s + end_s) * 500.0  # 秒 -> 毫秒中点
+        idx = bisect_right(starts, mid) - 1
+        if idx < 0:
+            idx = 0
+        elif mid >= ends[idx] and idx + 1 < len(ranges) and starts[idx + 1] - mid < mid - ends[idx]:
+            idx += 1
+        parts[idx].append(text)
+    return ["".join(part).strip() for part in parts]
+
+
+def texts_for_ranges(segments: Iterable[Dict[str, Any]], ranges: Sequence[Sequence[int]]) -> List[str]:
+    return assign_to_ranges(segment_words(segments), ranges)
+
+
+__all__ = ["assign_to_ranges", "segment_words", "texts_for_ranges"]
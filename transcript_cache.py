@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from logger import logger
+
+
+class TranscriptCache:
+    """
+    Persistent transcript cache keyed by chunk audio content.
+
+    Keys combine a SHA-1 of the decoded PCM samples with the Whisper model size
+    and the initial prompt, so renaming or re-exporting a chunk with identical
+    audio still hits, while switching model or prompt forces a fresh decode.
+    """
+
+    FILE_NAME = ".transcript_cache.json"
+    VERSION = 1
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self._entries: Dict[str, str] = {}
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        if self.path.exists():
+            self._load()
+
+    @classmethod
+    def for_directory(cls, directory: Path | str) -> "TranscriptCache":
+        return cls(Path(directory) / cls.FILE_NAME)
+
+    # ---------------------------------------------------------------- keys
+    @staticmethod
+    def audio_digest(audio_path: Path | str) -> str:
+        """Hash the PCM payload (not the container) of an audio file."""
+        import soundfile as sf
+
+        samples, sample_rate = sf.read(str(audio_path), dtype="int16", always_2d=True)
+        return TranscriptCache.samples_digest(samples, sample_rate)
+
+    @staticmethod
+    def samples_digest(samples: np.ndarray, sample_rate: int) -> str:
+        """Same digest as ``audio_digest`` for int16 samples already in memory."""
+        digest = hashlib.sha1()
+        digest.update(str(sample_rate).encode("ascii"))
+        digest.update(np.ascontiguousarray(samples, dtype=np.int16).tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_key(audio_digest: str, model_size: str, initial_prompt: Optional[str]) -> str:
+        raw = "|".join([audio_digest, model_size or "", initial_prompt or ""])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    # ---------------------------------------------------------------- access
+    def get(self, key: str) -> Optional[str]:
+        text = self._entries.get(key)
+        if text is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        if self._entries.get(key) == text:
+            return
+        self._entries[key] = text
+        self._dirty = True
+
+    def save(self) -> None:
+        """Atomically write the cache back to disk if it changed."""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": self.VERSION, "entries": self._entries}
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+    def _load(self) -> None:
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable transcript cache %s: %s", self.path, exc)
+            return
+        if raw.get("version") != self.VERSION:
+            return
+        self._entries = dict(raw.get("entries") or {})
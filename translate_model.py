@@ -1,11 +1,20 @@
 import os
-import langchain_community
+from typing import Optional
+
 from logger import logger
+from translation_cache import TranslationCache, shared_cache
 
 llm = None
 clinet = None
 
-def traslate_text(text):
+OLLAMA_HOST = "http://192.168.1.2:11434"
+MODEL_NAME = "qwen3:8b"
+# 修改提示词后请递增版本号，旧的缓存译文会自动失效
+PROMPT_VERSION = "1"
+PROMPT_TEMPLATE = "请将这句英文翻译成中文{}。直接给出翻译结果，不需要多余的开场白和解释。"
+DEFAULT_CACHE_PATH = os.environ.get("TRANSLATION_CACHE", os.path.join("cache", TranslationCache.FILE_NAME))
+
+def traslate_text_langchain(text):
     from langchain_community.llms import Ollama
     global llm
     if not llm:
@@ -15,19 +24,35 @@ def traslate_text(text):
     response = llm.invoke("以下是小学一年级课本中的教学课文的英文语句，请将这句英文翻译成中文{}, 请通顺翻译，并且只需要翻译结果，不需要额外解释。".format(text))
     logger.info(response)
 
-def traslate_text(text):
+def traslate_text(text, cache: Optional[TranslationCache] = None, use_cache: bool = True):
+    """
+    Translate ``text`` with the Ollama chat model.
+
+    Results are looked up in / appended to ``cache`` (default: the shared cache at
+    ``DEFAULT_CACHE_PATH``) so repeated sentences make no LLM call.
+    """
+    key = None
+    if use_cache:
+        cache = cache or shared_cache(DEFAULT_CACHE_PATH)
+        key = cache.make_key(text, MODEL_NAME, PROMPT_VERSION)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
     global clinet
     if not clinet:
         from ollama import Client
-        client = Client(host='http://192.168.1.2:11434')
-    response = client.chat(model='qwen3:8b', messages=[
+        clinet = Client(host=OLLAMA_HOST)
+    response = clinet.chat(model=MODEL_NAME, messages=[
         {
             'role': 'user',
-            'content': "请将这句英文翻译成中文{}。直接给出翻译结果，不需要多余的开场白和解释。".format(text),
+            'content': PROMPT_TEMPLATE.format(text),
         },
     ])
     ctx = response["message"]["content"]
     logger.info("traslate_text：{}".format(ctx))
+    if cache is not None and key is not None and ctx:
+        cache.put(key, text, ctx)
     return ctx
 
 if __name__ == "__main__":
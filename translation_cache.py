@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from logger import logger
+
+
+class TranslationCache:
+    """
+    Persistent translation cache stored as an append-only JSON-lines file.
+
+    Keys combine the normalised source text with the LLM model name and prompt
+    version, so replaying the same sentence never reaches Ollama again, while
+    switching model or editing the prompt forces a fresh translation. Each miss
+    is appended as one line, so an interrupted session keeps earlier entries.
+    """
+
+    FILE_NAME = ".translation_cache.jsonl"
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self._entries: Dict[str, str] = {}
+        # 预取线程与播放线程可能同时读写
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if self.path.exists():
+            self._load()
+
+    @classmethod
+    def for_directory(cls, directory: Path | str) -> "TranslationCache":
+        return cls(Path(directory) / cls.FILE_NAME)
+
+    # ---------------------------------------------------------------- keys
+    @staticmethod
+    def normalize(text: str) -> str:
+        return re.sub(r"\s+", " ", text or "").strip()
+
+    @classmethod
+    def make_key(cls, text: str, model: str, prompt_version: str) -> str:
+        raw = "|".join([model or "", prompt_version or "", cls.normalize(text)])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    # ---------------------------------------------------------------- access
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            text = self._entries.get(key)
+            if text is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return text
+
+    def put(self, key: str, source: str, translation: str) -> None:
+        with self._lock:
+            if self._entries.get(key) == translation:
+                return
+            self._entries[key] = translation
+            record = {"key": key, "source": self.normalize(source), "translation": translation}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+    def _load(self) -> None:
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except OSError as exc:
+            logger.warning("Ignoring unreadable translation cache %s: %s", self.path, exc)
+            return
+        for line in lines:
+            try:
+                record = json.loads(line)
+                self._entries[record["key"]] = record["translation"]
+            except (ValueError, KeyError, TypeError):
+                # 进程中断时最后一行可能不完整，跳过即可
+                continue
+
+
+_shared: Dict[Path, TranslationCache] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_cache(path: Path | str) -> TranslationCache:
+    """Return one process-wide instance per cache file so counters accumulate."""
+    resolved = Path(path).resolve()
+    with _shared_lock:
+        cache = _shared.get(resolved)
+        if cache is None:
+            cache = _shared[resolved] = TranslationCache(resolved)
+        return cache
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from logger import logger
+
+DEFAULT_MAX_BYTES = int(float(os.environ.get("TTS_CACHE_MAX_MB", "512")) * 1024 * 1024)
+
+
+class TTSCache:
+    """
+    Size-bounded, content-addressed cache of synthesised speech.
+
+    Each paragraph is stored as ``<sha1>.wav`` where the key covers the text,
+    voice role, language mark, speaking speed and backend, so the same
+    translation is synthesised once and replayed from disk afterwards. Entries
+    are touched on every hit; when the directory grows past ``max_bytes`` the
+    least recently used files are removed (files used within ``min_age``
+    seconds are kept so a concurrent playback never loses its input).
+
+    Sizes and last-use times live in an in-memory LRU index with a running
+    byte total, built from one directory scan on first use (file mtimes give
+    the initial order), so a store never rescans the directory.
+    """
+
+    SUFFIX = ".wav"
+
+    def __init__(self, directory: Path | str, max_bytes: int = DEFAULT_MAX_BYTES, min_age: float = 60.0) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = int(max_bytes)
+        self.min_age = float(min_age)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._index: Optional["OrderedDict[str, Tuple[float, int]]"] = None  # key -> (最近使用时间, 字节数)，最久未用在前
+        self._total = 0
+
+    # ---------------------------------------------------------------- keys
+    @staticmethod
+    def make_key(text: str, role_id: int, language: Optional[str], speed: float, backend: str = "vits") -> str:
+        raw = "|".join([backend, str(role_id), language or "", f"{float(speed):.3f}", text.strip()])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / f"{key}{self.SUFFIX}"
+
+    # ---------------------------------------------------------------- access
+    def lookup(self, key: str) -> Optional[str]:
+        """Return the cached wav path for ``key`` (refreshing its LRU stamp) or None."""
+        path = self.path_for(key)
+        with self._lock:
+            try:
+                os.utime(path)
+            except OSError:
+                self.misses += 1
+                self._forget(key)
+                return None
+            self.hits += 1
+            self._touch(key, path)
+            return str(path)
+
+    def store(self, key: str, audio: Tuple[int, np.ndarray]) -> str:
+        """Write ``(sample_rate, samples)`` for ``key`` atomically and return its path."""
+        from audio_utils import write_audio
+
+        path = self.path_for(key)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + f".{threading.get_ident()}.tmp")
+        write_audio(str(tmp_path), audio)
+        return self._commit(key, tmp_path, path)
+
+    def store_file(self, key: str, source_path: Path | str) -> str:
+        """Move an already rendered wav (e.g. from a TTS API) into the cache."""
+        path = self.path_for(key)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return self._commit(key, Path(source_path), path)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evicted": self.evicted}
+
+    # ---------------------------------------------------------------- index
+    def _entries(self) -> "OrderedDict[str, Tuple[float, int]]":
+        """LRU index, scanned from disk once; callers hold ``_lock``."""
+        if self._index is None:
+            found = []
+            for entry in self.directory.glob(f"*{self.SUFFIX}"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                found.append((stat.st_mtime, entry.name[: -len(self.SUFFIX)], stat.st_size))
+            self._index = OrderedDict((key, (mtime, size)) for mtime, key, size in sorted(found))
+            self._total = sum(size for _, _, size in found)
+        return self._index
+
+    def _touch(self, key: str, path: Path, size: Optional[int] = None) -> None:
+        index = self._entries()
+        previous = index.pop(key, None)
+        if size is None:
+            if previous is not None:
+                size = previous[1]
+            else:
+                # 其他进程写入的文件，首次命中时补进索引
+                try:
+                    size = path.stat().st_size
+                except OSError:  # pragma: no cover
+                    size = 0
+        self._total += size - (previous[1] if previous is not None else 0)
+        index[key] = (time.time(), size)
+
+    def _forget(self, key: str) -> None:
+        previous = self._entries().pop(key, None)
+        if previous is not None:
+            self._total -= previous[1]
+
+    # ---------------------------------------------------------------- eviction
+    def _commit(self, key: str, tmp_path: Path, path: Path) -> str:
+        os.replace(tmp_path, path)
+        size = path.stat().st_size
+        with self._lock:
+            self._touch(key, path, size)
+        self.evict()
+        return str(path)
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache fits ``max_bytes``."""
+        with self._lock:
+            index = self._entries()
+            if self._total <= self.max_bytes:
+                return 0
+
+            removed = 0
+            cutoff = time.time() - self.min_age
+            for key, (used, size) in list(index.items()):
+                if self._total <= self.max_bytes or used >= cutoff:
+                    break
+                entry = self.path_for(key)
+                try:
+                    entry.unlink()
+                except FileNotFoundError:
+                    pass
+                except OSError:  # pragma: no cover
+                    logger.warning("Failed to evict TTS cache entry %s", entry)
+                    continue
+                del index[key]
+                self._total -= size
+                removed += 1
+            self.evicted += removed
+            if removed:
+                logger.info("Evicted %s TTS cache entries from %s", removed, self.directory)
+            return removed
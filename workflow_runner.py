@@ -1,21 +1,23 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 import time
+from asset_scheduler import AssetScheduler
+from config_cache import load_workflow_config
 from logger import logger
 from models.workflow import AssetConfig, WorkflowConfig
-from orchestrator import Orchestrator
+from orchestrator import Orchestrator, PrefetchWindow
 from progress_store import ProgressStore
 from services.registry import ServiceRegistry
 
+# 播放步骤的类型，用于断点续播时注入 start_file
+PLAYBACK_STEP_TYPES = frozenset({"speak", "play", "playback"})
 
-def load_workflow(path: Path | str) -> WorkflowConfig:
-    path_obj = Path(path)
-    raw = path_obj.read_text(encoding="utf-8")
-    if hasattr(WorkflowConfig, "model_validate_json"):
-        return WorkflowConfig.model_validate_json(raw)  # type: ignore[attr-defined]
-    return WorkflowConfig.parse_raw(raw)
+
+def load_workflow(path: Path | str, *, use_cache: bool = True) -> WorkflowConfig:
+    """Load a workflow config; unchanged files come from the validated-config cache."""
+    return load_workflow_config(path, use_cache=use_cache)
 
 
 def run_workflow(
@@ -25,11 +27,25 @@ def run_workflow(
     asset_id: str | None = None,
     registry: ServiceRegistry | None = None,
     extra_context: Optional[Dict[str, Any]] = None,
+    workers: int | None = None,
 ) -> List[Dict[str, Any]]:
-    """Execute the workflow against configured assets."""
+    """Execute the workflow against configured assets.
+
+    ``workers`` (defaulting to ``workflow.prepare_workers``) > 1 prefetches the
+    split/transcribe steps of the next ``workers`` assets on a thread pool;
+    playback and progress updates still happen one asset at a time.
+    """
 
     store_path = progress_path or Path(f"logs/{workflow.id}_progress.json")
-    store = ProgressStore(store_path, workflow_id=workflow.id, assets=workflow.assets)
+    # 已有的进度文件经配置缓存加载（记录不再逐条校验）；attach 只合并一次素材的结构字段。
+    # 循环播放逻辑要在真正播放前就能读到每个素材对应的 TaskMeta，以保持播放次数均衡
+    store = ProgressStore(
+        store_path,
+        workflow_id=workflow.id,
+        assets=workflow.assets,
+        journal=bool(getattr(workflow, "progress_journal", False)),
+        compact_every=int(getattr(workflow, "progress_compact_every", 200) or 200),
+    )
 
     service_registry = registry or ServiceRegistry()
     orchestrator = Orchestrator(workflow, service_registry)
@@ -38,87 +54,188 @@ def run_workflow(
     if not filtered_assets:
         store.flush()
         return []
-    # 循环播放逻辑要在真正播放前就能读到每个素材对应的 TaskMeta
-    # 记录当前所有素材的播放次数，便于循环模式下保持均衡
-    store.attach_assets(filtered_assets)
-    play_counts: List[int] = []
-    for asset in filtered_assets:
-        record = store.get_record(asset.id)
-        if record is not None:
-            play_counts.append(int(record.play_count or 0))
-        else:
-            play_counts.append(int(getattr(asset, "play_count", 0) or 0))
-    # 当前的最小播放次数
-    min_play_count = min(play_counts) if play_counts else 0
 
     flag_loop_assets = bool(getattr(workflow, "flag_loop_assets", False)) #是否启用循环播放
-    flag_stop_due_to_time = False # 播放时间是否已经超时
-    flag_cycle_played = False # 是否播放过任何素材
+    prepare_workers = int(workers or getattr(workflow, "prepare_workers", 1) or 1)
+    prepared: Optional[PrefetchWindow] = None
+    if prepare_workers > 1:
+        pending_assets = [
+            asset for asset in filtered_assets if flag_loop_assets or not store.is_completed(asset.id)
+        ]
+        prepared = orchestrator.prefetch(
+            pending_assets, workers=prepare_workers, extra_context=dict(extra_context or {})
+        )
     results: List[Dict[str, Any]] = []
     t1 = time.time()
     session_limit = workflow.max_session_seconds or 30 * 60
 
-    while True:
-        for asset in filtered_assets:
-            if not flag_loop_assets:
-                if store.is_completed(asset.id):
-                    logger.info("Skipping completed asset %s", asset.id)
-                    continue
-            else:
-                # 仅当该文件与最小播放次数持平或存在未完成进度时才进入本轮
-                record = store.get_record(asset.id)
-                record_play_count = int(
-                    (record.play_count if record is not None else getattr(asset, "play_count", 0)) or 0
-                )
-                has_partial_progress = bool(
-                    record
-                    and record.progress_total
-                    and record.progress_played < record.progress_total
-                )
-                if not has_partial_progress and record_play_count > min_play_count:
-                    continue
-
-            t2 = time.time()
-            if t2 - t1 > session_limit * 0.95:
-                logger.info("Session limit %s seconds reached, stopping", session_limit)
-                flag_stop_due_to_time = True
-                break
+    def _time_exceeded() -> bool:
+        if time.time() - t1 > session_limit * 0.95:
+            logger.info("Session limit %s seconds reached, stopping", session_limit)
+            return True
+        return False
 
-            store.attach_assets([asset])
-            store.mark_started(asset)
+    def _play_asset(asset: AssetConfig) -> Dict[str, Any]:
+        # 必须在 mark_started 之前读取断点：mark_started 会把 completed 置为 False
+        context_overrides, resume_from = _resume_overrides(workflow, store, asset, extra_context)
+        store.mark_started(asset, restart=resume_from is None)
 
-            context_overrides = dict(extra_context or {})
+        checkpointer = _PlaybackCheckpointer(
+            store,
+            asset,
+            every_segments=int(getattr(workflow, "checkpoint_every_segments", 5) or 0),
+            every_seconds=float(getattr(workflow, "checkpoint_every_seconds", 30.0) or 0),
+            forward=((extra_context or {}).get("callbacks") or {}).get("on_progress"),
+        )
+        callbacks = dict(context_overrides.get("callbacks") or {})
+        callbacks["on_progress"] = checkpointer
+        context_overrides["callbacks"] = callbacks
 
-            result = orchestrator.run_asset(asset, extra_context=context_overrides)
-            results.append(result)
-
-            artifacts = result.get("artifacts", {})
-            playback = artifacts.get("playback", {})
-            last_item = playback.get("last_played")
-            if last_item:
-                last_item = Path(last_item).name
-
-            store.update_checkpoint(
-                asset,
-                last_item=last_item,
-                progress_played=playback.get("segments_played"),
-                progress_total=playback.get("segments_total"),
+        prepared_artifacts = prepared.pop(asset.id) if prepared is not None else None
+        if prepared_artifacts is not None:
+            result = orchestrator.run_asset(
+                asset, extra_context=context_overrides, prepared=prepared_artifacts
             )
-            store.mark_completed(asset)
-            store.flush()
-            flag_cycle_played = True
+        else:
+            result = orchestrator.run_asset(asset, extra_context=context_overrides)
+        results.append(result)
 
-        if flag_stop_due_to_time or not flag_loop_assets:
-            break
-        if not flag_cycle_played:
-            # 未播放任何素材，说明进度已同步，结束循环
-            break
+        artifacts = result.get("artifacts", {})
+        playback = artifacts.get("playback", {})
+        last_item = playback.get("last_played")
+        if last_item:
+            last_item = Path(last_item).name
+
+        # segments_* 只统计从 start_file 起的片段，加上起始序号换算成整个素材的绝对进度
+        start_index = int(playback.get("start_index") or 0)
+        played = playback.get("segments_played")
+        total = playback.get("segments_total")
+        store.update_checkpoint(
+            asset,
+            last_item=last_item,
+            progress_played=None if played is None else start_index + int(played),
+            progress_total=None if total is None else start_index + int(total),
+        )
+        store.mark_completed(asset)
+        store.flush()
+        return playback
+
+    try:
+        if flag_loop_assets:
+            # 循环模式：每次取播放次数最少（其次是有未完成进度、最久未更新）的素材，
+            # 播完后按新的播放次数重新入队，O(log n) 完成调度
+            scheduler = AssetScheduler(filtered_assets, priority=lambda item: _loop_priority(store, item))
+            idle_picks = 0
+            while scheduler and not _time_exceeded():
+                asset = scheduler.pop()
+                playback = _play_asset(asset)
+                scheduler.push(asset)
+                idle_picks = 0 if playback.get("segments_played") else idle_picks + 1
+                if idle_picks >= len(scheduler):
+                    # 整整一轮都没有播放任何片段，继续循环没有意义
+                    logger.info("No asset produced playback in a full round; stopping loop")
+                    break
+        else:
+            for asset in filtered_assets:
+                if store.is_completed(asset.id):
+                    logger.info("Skipping completed asset %s", asset.id)
+                    continue
+                if _time_exceeded():
+                    break
+                _play_asset(asset)
+    finally:
+        if prepare_workers > 1:
+            orchestrator.shutdown()
+        # 会话结束（包括异常退出）时写回进度，并把追加日志并回进度文件
+        store.close()
 
     if not results:
         store.flush()
     return results
 
 
+def _loop_priority(store: ProgressStore, asset: AssetConfig) -> tuple:
+    """Loop-mode order: fewest plays, then unfinished progress, then least recently updated."""
+    record = store.get_record(asset.id)
+    if record is None:
+        return (int(getattr(asset, "play_count", 0) or 0), 1, "")
+    has_partial_progress = bool(record.progress_total and record.progress_played < record.progress_total)
+    return (int(record.play_count or 0), 0 if has_partial_progress else 1, record.update_time or "")
+
+
+class _PlaybackCheckpointer:
+    """
+    ``on_progress`` callback that records the segment about to play.
+
+    Every call updates the in-memory record (so ``store.close`` on an abort keeps
+    it); the store is only flushed every ``every_segments`` segments or
+    ``every_seconds`` seconds, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        store: ProgressStore,
+        asset: AssetConfig,
+        *,
+        every_segments: int = 5,
+        every_seconds: float = 30.0,
+        forward: Optional[Callable[..., Any]] = None,
+    ) -> None:
+        self.store = store
+        self.asset = asset
+        self.every_segments = max(0, int(every_segments))
+        self.every_seconds = max(0.0, float(every_seconds))
+        self.forward = forward
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def __call__(self, file_name: str, index: int, *args: Any, **kwargs: Any) -> None:
+        # index 为片段在整个素材中的序号，即之前已播完的片段数
+        self.store.update_checkpoint(self.asset, last_item=Path(file_name).name, progress_played=index)
+        self._pending += 1
+        now = time.monotonic()
+        if (self.every_segments and self._pending >= self.every_segments) or (
+            self.every_seconds and now - self._last_flush >= self.every_seconds
+        ):
+            self.store.flush()
+            self._pending = 0
+            self._last_flush = now
+        if self.forward is not None:
+            self.forward(file_name, index, *args, **kwargs)
+
+
+def _resume_overrides(
+    workflow: WorkflowConfig,
+    store: ProgressStore,
+    asset: AssetConfig,
+    extra_context: Optional[Dict[str, Any]],
+) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Copy ``extra_context`` and point playback steps at the checkpointed ``last_item``.
+
+    Only a run that stopped early is resumed: the record is not completed and
+    fewer segments were played than the asset has (an unknown total, as left by
+    an interrupted first run, also counts as unfinished). Returns the context
+    and the item resumed from, or None when playback starts from the beginning.
+    """
+    context = dict(extra_context or {})
+    record = store.get_record(asset.id)
+    if record is None or record.completed or not record.last_item:
+        return context, None
+    if record.progress_total and record.progress_played >= record.progress_total:
+        return context, None
+    step_overrides = {key: dict(value) for key, value in (context.get("step_overrides") or {}).items()}
+    for step in workflow.steps:
+        if step.type not in PLAYBACK_STEP_TYPES:
+            continue
+        overrides = step_overrides.setdefault(step.id, {})
+        if overrides.get("start_file") is None:
+            overrides["start_file"] = record.last_item
+            logger.info("Resuming asset %s from %s", asset.id, record.last_item)
+    context["step_overrides"] = step_overrides
+    return context, record.last_item
+
+
 def _select_assets(
     assets: Iterable[AssetConfig],
     *,